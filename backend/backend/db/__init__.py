@@ -0,0 +1,4 @@
+"""
+SQLite database backend tuned for concurrent use (``ENGINE: "backend.db"``),
+and the router that splits reads from writes.
+"""
@@ -0,0 +1,29 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_DB_ALIAS = "replica"
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to the read-only ``replica`` alias and writes to ``default``.
+
+    Both aliases open the same SQLite file; in WAL mode readers never wait
+    on the writer. Reads made inside a transaction on ``default`` stay on
+    it, so a write path sees its own uncommitted rows.
+    """
+
+    def db_for_read(self, model, **hints):
+        if READ_DB_ALIAS not in connections.settings:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return READ_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
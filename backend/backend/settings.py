@@ -59,6 +59,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "employees.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -124,13 +125,36 @@ WSGI_APPLICATION = "backend.wsgi.application"
 #     }
 # }
 
+# SQLite tuned for concurrent use (see backend/db): WAL, busy timeout and
+# BEGIN IMMEDIATE on "default"; "replica" is a read-only connection to the
+# same file that PrimaryReplicaRouter sends reads to.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "backend.db",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": 20,
+        },
+    },
+    "replica": {
+        "ENGINE": "backend.db",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": 20,
+            "read_only": True,
+        },
+        "TEST": {
+            "MIRROR": "default",
+        },
+    },
 }
 
+DATABASE_ROUTERS = ["backend.db.routers.PrimaryReplicaRouter"]
+
 # MONGO_CLIENT = MongoClient("mongodb://localhost:27017/")
 # MONGO_DB = MONGO_CLIENT["employee-tracker-app-db"]
 
@@ -183,13 +207,72 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "employees.renderers.TimedJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
     ],
 }
 
+# In-process LRU cache of rendered GET /api/employees/ pages
+EMPLOYEE_LIST_CACHE = {
+    "MAX_ENTRIES": 256,
+    "MAX_BYTES": 16 * 1024 * 1024,
+}
+
+# Background job pool (import jobs). A running job that records no progress
+# for STALE_MINUTES is failed by manage.py fail_stale_import_jobs
+EMPLOYEE_JOBS = {
+    "WORKERS": 1,
+    "STALE_MINUTES": 30,
+}
+
+# Service-layer writes run one at a time on a dedicated writer thread per
+# process (see employees/services/write_queue.py)
+EMPLOYEE_WRITE_QUEUE = {
+    "ENABLED": True,
+}
+
+# Delta sync (GET /api/employees/changes/): page sizes and how long deletion
+# tombstones are kept (see manage.py prune_employee_tombstones)
+EMPLOYEE_SYNC = {
+    "PAGE_SIZE": 500,
+    "MAX_PAGE_SIZE": 5000,
+    "TOMBSTONE_RETENTION_DAYS": 30,
+}
+
+# How long Idempotency-Key results are replayed for retried writes
+# (see manage.py prune_idempotency_keys)
+EMPLOYEE_IDEMPOTENCY = {
+    "RETENTION_HOURS": 24,
+}
+
+# In-memory department/position autocomplete: how often a process checks
+# for writes made by other processes
+EMPLOYEE_AUTOCOMPLETE = {
+    "REFRESH_SECONDS": 30,
+}
+
+# Employee history (GET /api/employees/headcount/?asOf=, /<id>/history/):
+# rows are queued in memory and written in batches of BATCH_SIZE, or
+# FLUSH_SECONDS after the oldest queued row
+EMPLOYEE_HISTORY = {
+    "BATCH_SIZE": 500,
+    "FLUSH_SECONDS": 2,
+}
+
+# Pre-rendered gzipped snapshot of the whole directory
+# (GET /api/employees/snapshot/), shared by the worker processes on a host
+EMPLOYEE_SNAPSHOT = {
+    "PATH": os.environ.get("EMPLOYEE_SNAPSHOT_PATH", BASE_DIR / "snapshots"),
+    "COMPRESSLEVEL": 6,
+}
+
+# Token-bucket throttle state, shared by all worker processes on the host
+EMPLOYEE_THROTTLE = {
+    "PATH": os.environ.get("EMPLOYEE_THROTTLE_PATH", BASE_DIR / "throttle.sqlite3"),
+}
+
 # CORS configuration for frontend access
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
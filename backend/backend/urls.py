@@ -18,6 +18,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
+from employees.views import metrics
 
 
 # def home(request):
@@ -27,6 +28,7 @@ from django.views.generic import RedirectView
 urlpatterns = [
     # path("admin/", admin.site.urls),
     path("api/employees/", include("employees.urls")),
+    path("metrics", metrics, name="metrics"),  # Prometheus scrape endpoint
     # path("", home),
     path("", RedirectView.as_view(url="/api/employees/", permanent=False)),
 ]
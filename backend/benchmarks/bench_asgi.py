@@ -0,0 +1,278 @@
+"""
+Compare the WSGI path (sync DRF views under gunicorn's threaded worker)
+with the ASGI path (async views under uvicorn), one process each, on the
+same seeded SQLite file.
+
+Scenarios:
+
+- ``list``: fast clients paging through GET /api/employees/.
+- ``slow-export``: hundreds of slow clients downloading the CSV export
+  (small receive buffer, reading a little at a time) while fast clients
+  keep paging the list. The slow downloads hold a WSGI thread each for
+  their whole duration; under ASGI they wait on the event loop.
+
+    python -m benchmarks.bench_asgi [--rows 20000] [--duration 10]
+    python -m benchmarks.bench_asgi --slow-clients 300 --threads 8
+
+Needs gunicorn and uvicorn (both in requirements.txt).
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from employees.tests.fixtures import seed_employees
+
+from .common import BACKEND_DIR, print_table, setup_django
+
+_addresses = itertools.count(1)
+
+
+def client_address():
+    # A distinct X-Forwarded-For per request gives every request its own
+    # throttle bucket, so the rate limits do not cap the load.
+    n = next(_addresses)
+    return f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path, slow=False):
+    """
+    GET ``path`` over a fresh connection and read the whole response.
+    A slow client has a small receive buffer and reads 4KB every 20ms.
+    Returns (status, bytes read, seconds).
+    """
+    started = time.perf_counter()
+    sock = socket.socket()
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=2**20)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        f"X-Forwarded-For: {client_address()}\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    received = len(status_line)
+    while True:
+        chunk = await reader.read(4096 if slow else 2**16)
+        if not chunk:
+            break
+        received += len(chunk)
+        if slow:
+            await asyncio.sleep(0.02)
+    writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, received, time.perf_counter() - started
+
+
+async def fast_clients(port, clients, duration, pages, results):
+    deadline = time.perf_counter() + duration
+    prefix = f"/api/employees/{results['prefix']}"
+
+    async def client(index):
+        for n in itertools.count(index * 7919):
+            if time.perf_counter() >= deadline:
+                return
+            page = n % pages + 1
+            try:
+                status, _, elapsed = await fetch(
+                    port, f"{prefix}?page={page}&page_size=25"
+                )
+            except OSError:
+                results["errors"] += 1
+                continue
+            if status != 200:
+                results["errors"] += 1
+            results["latencies"].append(elapsed)
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+
+
+async def slow_clients(port, clients, results):
+    async def client():
+        try:
+            status, received, elapsed = await fetch(
+                port, f"/api/employees/{results['prefix']}export/csv/", slow=True
+            )
+        except OSError:
+            results["slow_errors"] += 1
+            return
+        if status != 200:
+            results["slow_errors"] += 1
+        results["slow_seconds"].append(elapsed)
+        results["slow_bytes"] = received
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+
+
+async def run_scenario(port, prefix, args, slow):
+    results = {
+        "prefix": prefix,
+        "latencies": [],
+        "errors": 0,
+        "slow_seconds": [],
+        "slow_errors": 0,
+        "slow_bytes": 0,
+    }
+    pages = max(1, args.rows // 25)
+    started = time.perf_counter()
+    tasks = [fast_clients(port, args.clients, args.duration, pages, results)]
+    if slow:
+        tasks.append(slow_clients(port, args.slow_clients, results))
+    await asyncio.gather(*tasks)
+    results["elapsed"] = time.perf_counter() - started
+    return results
+
+
+def start_server(kind, port, env, args):
+    if kind == "wsgi":
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "backend.wsgi:application",
+            "--worker-class",
+            "gthread",
+            "--workers",
+            "1",
+            "--threads",
+            str(args.threads),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--backlog",
+            "2048",
+            "--timeout",
+            "120",
+            "--log-level",
+            "warning",
+        ]
+    else:
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.asgi:application",
+            "--workers",
+            "1",
+            "--port",
+            str(port),
+            "--lifespan",
+            "off",
+            "--backlog",
+            "2048",
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ]
+    server = subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def summarize(kind, scenario, results):
+    latencies = sorted(results["latencies"])
+    count = len(latencies)
+    row = {
+        "server": kind,
+        "scenario": scenario,
+        "list_requests": count,
+        "list_req_per_s": round(count / results["elapsed"], 1),
+        "list_p50_ms": round(latencies[count // 2] * 1000, 1) if count else "-",
+        "list_p99_ms": (
+            round(latencies[min(count - 1, int(count * 0.99))] * 1000, 1)
+            if count
+            else "-"
+        ),
+        "errors": results["errors"] + results["slow_errors"],
+    }
+    slow = sorted(results["slow_seconds"])
+    if slow:
+        row["slow_done"] = len(slow)
+        row["slow_p99_s"] = round(slow[min(len(slow) - 1, int(len(slow) * 0.99))], 1)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--slow-clients", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-asgi-")
+    db_path = os.path.join(workdir, "bench.sqlite3")
+    setup_django(test_db_name=db_path)
+    seed_employees(args.rows)
+
+    from django.db import connections
+
+    connections.close_all()
+
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.bench_settings",
+        "BENCH_DB_PATH": db_path,
+        "BENCH_THROTTLE_PATH": os.path.join(workdir, "throttle.sqlite3"),
+        "PYTHONPATH": str(BACKEND_DIR),
+    }
+    rows = []
+    for kind, prefix in (("wsgi", ""), ("asgi", "async/")):
+        port = free_port()
+        server = start_server(kind, port, env, args)
+        try:
+            # Warm up imports, connections and caches.
+            asyncio.run(fetch(port, f"/api/employees/{prefix}"))
+            for scenario, slow in (("list", False), ("slow-export", True)):
+                results = asyncio.run(run_scenario(port, prefix, args, slow))
+                rows.append(summarize(kind, scenario, results))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    print(
+        f"{args.rows} rows, {args.clients} fast clients, {args.slow_clients} slow "
+        f"export clients, gunicorn gthread x{args.threads} vs uvicorn, 1 process each"
+    )
+    print_table(
+        rows,
+        [
+            "server",
+            "scenario",
+            "list_requests",
+            "list_req_per_s",
+            "list_p50_ms",
+            "list_p99_ms",
+            "errors",
+            "slow_done",
+            "slow_p99_s",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
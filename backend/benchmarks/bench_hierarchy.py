@@ -0,0 +1,241 @@
+"""
+Reporting-hierarchy reads on a seeded org chart: the EmployeeHierarchy
+closure table against walking manager_id (one query per level, as the
+code would without the table) and a recursive CTE over manager_id.
+Also times the writes that maintain the table: adding a report, moving a
+manager with their whole subtree, and rebuilding it from scratch.
+
+The chart is a complete tree with ``--fanout`` reports per manager, so
+100k employees are 7 levels deep.
+
+    python -m benchmarks.bench_hierarchy [--rows 100000] [--fanout 8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from employees.tests.fixtures import seed_employees
+
+from .common import measure, print_table, setup_django
+
+PAGE_SIZE = 25
+
+
+def build_tree(fanout):
+    """
+    Point every employee but the first at a manager, in id order, so
+    employee k (0-based) reports to employee (k - 1) // fanout. Returns
+    the ids grouped by level.
+    """
+    from django.db import connection, transaction
+
+    from employees.models import Employee
+
+    ids = list(Employee.objects.order_by("id").values_list("id", flat=True))
+    sql = "UPDATE {} SET manager_id = %s WHERE id = %s".format(
+        connection.ops.quote_name(Employee._meta.db_table)
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            sql, [(ids[(k - 1) // fanout], ids[k]) for k in range(1, len(ids))]
+        )
+    levels = []
+    start, width = 0, 1
+    while start < len(ids):
+        levels.append(ids[start : start + width])
+        start += width
+        width *= fanout
+    return levels
+
+
+def walk_reports(employee_id):
+    """
+    Every id below ``employee_id``, one query per level: the baseline.
+    """
+    from employees.models import Employee
+
+    found = []
+    frontier = [employee_id]
+    while frontier:
+        frontier = list(
+            Employee.objects.filter(manager_id__in=frontier)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        found.extend(frontier)
+    return found
+
+
+def walk_chain(employee_id):
+    """
+    Managers above ``employee_id``, one query per level: the baseline.
+    """
+    from employees.models import Employee
+
+    chain = []
+    manager_id = (
+        Employee.objects.filter(id=employee_id)
+        .values_list("manager_id", flat=True)
+        .first()
+    )
+    while manager_id is not None:
+        chain.append(manager_id)
+        manager_id = (
+            Employee.objects.filter(id=manager_id)
+            .values_list("manager_id", flat=True)
+            .first()
+        )
+    return chain
+
+
+def cte_count(employee_id):
+    """
+    Size of the subtree below ``employee_id`` from a recursive CTE.
+    """
+    from django.db import connection
+
+    from employees.models import Employee
+
+    table = connection.ops.quote_name(Employee._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "WITH RECURSIVE subtree (id) AS ("
+            "SELECT %s "
+            f"UNION ALL SELECT report.id FROM {table} AS report "
+            "JOIN subtree ON report.manager_id = subtree.id"
+            ") SELECT COUNT(*) - 1 FROM subtree",
+            [employee_id],
+        )
+        return cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-hierarchy-")
+    setup_django(test_db_name=os.path.join(workdir, "bench.sqlite3"))
+
+    from employees.models import Employee, EmployeeHierarchy
+    from employees.serializers import EmployeeRowSerializer
+    from employees.services.employee_service import EmployeeService
+    from employees.services.hierarchy_service import HierarchyService
+    from employees.services.summary_service import SummaryService
+
+    seed_employees(args.rows)
+    SummaryService.rebuild()
+    levels = build_tree(args.fanout)
+    started = time.perf_counter()
+    HierarchyService.rebuild()
+    rebuild_ms = round((time.perf_counter() - started) * 1000, 1)
+    assert HierarchyService.find_drift() == {"missing": 0, "extra": 0}
+    print(
+        f"{args.rows} employees, {len(levels)} levels, "
+        f"{EmployeeHierarchy.objects.count()} closure rows, "
+        f"rebuilt in {rebuild_ms} ms"
+    )
+
+    serializer = EmployeeRowSerializer()
+    results = []
+
+    def record(case, path, fn, baseline=None, repeat=args.repeat, **extra):
+        stats = measure(fn, repeat=repeat, warmup=1)
+        row = {"case": case, "path": path, **extra, **stats}
+        if baseline is not None:
+            row["speedup"] = f"{baseline['mean_ms'] / stats['mean_ms']:.1f}x"
+        results.append(row)
+        return stats
+
+    # Subtree reads for the first manager on each level above the leaves.
+    for level, ids in enumerate(levels[:-1]):
+        manager = ids[0]
+        size = HierarchyService.get_report_counts(manager)["total"]
+        assert size == len(walk_reports(manager)) == cte_count(manager)
+        case = f"level {level} ({size} below)"
+        repeat = max(3, args.repeat // 4) if level < 2 else args.repeat
+
+        walked = record(
+            case,
+            "count: walk manager_id",
+            lambda: len(walk_reports(manager)),
+            repeat=repeat,
+        )
+        record(
+            case,
+            "count: recursive CTE",
+            lambda: cte_count(manager),
+            walked,
+            repeat=repeat,
+        )
+        record(
+            case,
+            "count: closure table",
+            lambda: HierarchyService.get_report_counts(manager),
+            walked,
+        )
+
+        def walk_page():
+            ids = walk_reports(manager)[:PAGE_SIZE]
+            return serializer.to_representation(
+                serializer.values(Employee.objects.filter(id__in=ids).order_by("id"))
+            )
+
+        def closure_page():
+            reports = HierarchyService.get_reports(manager)
+            return serializer.to_representation(serializer.values(reports)[:PAGE_SIZE])
+
+        walked = record(case, "first page: walk manager_id", walk_page, repeat=repeat)
+        record(case, "first page: closure table", closure_page, walked)
+
+    leaf = levels[-1][-1]
+    walked = record(
+        f"chain of a leaf ({len(levels) - 1} up)",
+        "walk manager_id",
+        lambda: walk_chain(leaf),
+    )
+    record(
+        f"chain of a leaf ({len(levels) - 1} up)",
+        "closure table",
+        lambda: list(serializer.values(HierarchyService.get_chain(leaf))),
+        walked,
+    )
+
+    # Writes, through the service layer so the table is maintained.
+    manager = levels[-2][0]
+    runs = iter(range(10**6))
+    record(
+        "create a report",
+        "closure table",
+        lambda: EmployeeService.create_employee(
+            {
+                "firstName": "Bench",
+                "lastName": "Report",
+                "email": f"bench-report-{next(runs)}@example.com",
+                "department": "Engineering",
+                "position": "Engineer",
+                "managerId": manager,
+            }
+        ),
+    )
+    for level in (2, 3):
+        mover, old_boss = levels[level][0], levels[level - 1][0]
+        new_boss = levels[level - 1][-1]
+        size = HierarchyService.get_report_counts(mover)["total"]
+        bosses = iter([new_boss, old_boss] * args.repeat * 2)
+        record(
+            f"move a level {level} manager ({size} below)",
+            "closure table",
+            lambda: EmployeeService.update_employee(mover, {"managerId": next(bosses)}),
+        )
+    assert HierarchyService.find_drift() == {"missing": 0, "extra": 0}
+
+    print_table(results, ["case", "path", "mean_ms", "p50_ms", "p99_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Point-in-time reads from the EmployeeHistory log, and the cost of
+writing it.
+
+Seeds the table, gives every employee a "created" entry at the start of
+a ``--days`` window and spreads ``--changes`` department, position,
+status and salary changes (and some deletes) over it. Then times:
+
+- headcount as of 1 to ``--days`` days ago, replayed forward (the
+  latest entry per employee up to the date) and worked back from the
+  summary through the employees changed since; HistoryService picks the
+  second for dates in the newer half of the history;
+- one employee's state as of a date;
+- an update through the service with its history row queued, against
+  the same update followed by its own history INSERT, and writing a full
+  batch of queued rows.
+
+    python -m benchmarks.bench_history [--rows 100000] [--changes 300000]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+from decimal import Decimal
+
+from employees.tests.fixtures import DEPARTMENTS, POSITIONS, seed_employees
+
+from .common import measure, print_table, setup_django
+
+STATUSES = ["active", "inactive", "on_leave"]
+
+
+def seed_history(changes, days, seed=0):
+    """
+    Date every employee's creation ``days`` ago, record it, then write
+    ``changes`` random changes spread evenly up to now, through
+    HistoryRepository, and leave the employee table (and summary) in the
+    final state.
+    """
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    from employees.models import Employee, EmployeeHistory
+    from employees.repositories.history_repo import HistoryRepository
+    from employees.services.history_service import HistoryService
+    from employees.services.summary_service import SummaryService
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    start = now - datetime.timedelta(days=days)
+    Employee.objects.update(created_at=start)
+    HistoryService.record_missing()
+
+    state = {
+        row[0]: list(row[1:])
+        for row in Employee.objects.values_list(
+            "id", "department", "position", "status", "salary"
+        )
+    }
+    live = list(state)
+    step = (now - start) / (changes + 1)
+    rows = []
+    deleted = []
+    for k in range(changes):
+        at = start + step * (k + 1)
+        index = rng.randrange(len(live))
+        employee_id = live[index]
+        values = state[employee_id]
+        if rng.random() < 0.02:
+            live[index] = live[-1]
+            live.pop()
+            deleted.append(employee_id)
+            rows.append((employee_id, at, EmployeeHistory.Kind.DELETED, *values))
+            continue
+        field = rng.randrange(4)
+        if field == 0:
+            values[0] = rng.choice(DEPARTMENTS)
+        elif field == 1:
+            values[1] = rng.choice(POSITIONS)
+        elif field == 2:
+            values[2] = rng.choice(STATUSES)
+        else:
+            values[3] = Decimal(rng.randint(40_000_00, 250_000_00)) / 100
+        rows.append((employee_id, at, EmployeeHistory.Kind.UPDATED, *values))
+
+    table = connection.ops.quote_name(Employee._meta.db_table)
+    with transaction.atomic():
+        HistoryRepository.insert(
+            [(row[0], row[1], int(row[2]), *row[3:]) for row in rows]
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET department = %s, position = %s, status = %s, "
+                "salary = %s WHERE id = %s",
+                [(*values, employee_id) for employee_id, values in state.items()],
+            )
+        Employee.objects.filter(id__in=deleted).delete()
+    SummaryService.rebuild()
+    return now, live
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--changes", type=int, default=300_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-history-")
+
+    def configure(settings):
+        # Queued rows are written by the benchmark, not a timer thread.
+        settings.EMPLOYEE_HISTORY = {"BATCH_SIZE": 10**9, "FLUSH_SECONDS": None}
+
+    setup_django(
+        test_db_name=os.path.join(workdir, "bench.sqlite3"), configure=configure
+    )
+
+    from employees.models import EmployeeHistory
+    from employees.repositories.history_repo import HistoryRepository
+    from employees.services.employee_service import EmployeeService
+    from employees.services.history_service import HistoryService, history_buffer
+
+    seed_employees(args.rows)
+    now, live = seed_history(args.changes, args.days)
+    print(
+        f"{args.rows} employees, {EmployeeHistory.objects.count()} history rows "
+        f"over {args.days} days"
+    )
+
+    results = []
+
+    def record(case, path, fn, baseline=None, repeat=args.repeat):
+        stats = measure(fn, repeat=repeat, warmup=1)
+        row = {"case": case, "path": path, **stats}
+        if baseline is not None:
+            row["speedup"] = f"{baseline['mean_ms'] / stats['mean_ms']:.1f}x"
+        results.append(row)
+        return stats
+
+    for days in sorted({1, 7, 30, 180, args.days}):
+        if days > args.days:
+            continue
+        at = now - datetime.timedelta(days=days)
+        replayed = HistoryRepository.get_headcount_replayed(at)
+        assert HistoryRepository.get_headcount_back_from(at) == replayed
+        case = f"headcount {days} days ago"
+        replayed = record(
+            case,
+            "replay the log",
+            lambda: HistoryRepository.get_headcount_replayed(at),
+            repeat=5,
+        )
+        record(
+            case,
+            "back from the summary",
+            lambda: HistoryRepository.get_headcount_back_from(at),
+            replayed,
+            repeat=5 if days > args.days // 2 else args.repeat,
+        )
+
+    employee_id = live[0]
+    record(
+        "one employee's state",
+        "employee_id index",
+        lambda: HistoryService.get_state_at(
+            employee_id, now - datetime.timedelta(days=args.days // 2)
+        ),
+    )
+
+    runs = iter(range(10**6))
+    queued = record(
+        "update salary",
+        "history queued",
+        lambda: EmployeeService.update_employee(
+            employee_id, {"salary": 300000 + next(runs)}
+        ),
+    )
+    history_buffer.take()
+
+    def update_and_insert():
+        EmployeeService.update_employee(employee_id, {"salary": 300000 + next(runs)})
+        HistoryService.flush()
+
+    record("update salary", "history INSERT per write", update_and_insert, queued)
+
+    for _ in range(500):
+        EmployeeService.update_employee(employee_id, {"salary": 300000 + next(runs)})
+    pending = history_buffer.take()
+    record(
+        "write a batch of 500",
+        "one executemany",
+        lambda: HistoryService._insert(pending),
+        repeat=5,
+    )
+
+    print_table(results, ["case", "path", "mean_ms", "p50_ms", "p99_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare EmployeeSerializer + JSONRenderer with the EmployeeRowSerializer +
+render_json fast path used by GET /api/employees/.
+
+    python -m benchmarks.bench_serialization [--rows 20000]
+"""
+
+import argparse
+
+from employees.tests.fixtures import seed_employees
+
+from .common import measure, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from employees.models import Employee
+    from employees.renderers import orjson, render_json
+    from employees.serializers import EmployeeRowSerializer, EmployeeSerializer
+
+    seed_employees(args.rows)
+    renderer = JSONRenderer()
+    fast = EmployeeRowSerializer()
+
+    def drf(queryset):
+        return renderer.render(EmployeeSerializer(queryset, many=True).data)
+
+    def fast_path(queryset):
+        return render_json(fast.to_representation(fast.values(queryset)))
+
+    cases = [
+        ("page_size=100", Employee.objects.all()[:100], args.repeat),
+        (f"full table ({args.rows})", Employee.objects.all(), max(3, args.repeat // 5)),
+    ]
+    results = []
+    for label, queryset, repeat in cases:
+        assert drf(queryset) == fast_path(queryset), "outputs differ"
+        slow = measure(lambda: drf(queryset), repeat=repeat, warmup=1)
+        quick = measure(lambda: fast_path(queryset), repeat=repeat, warmup=1)
+        results.append({"case": label, "path": "EmployeeSerializer", **slow})
+        results.append(
+            {
+                "case": label,
+                "path": "EmployeeRowSerializer",
+                **quick,
+                "speedup": f"{slow['mean_ms'] / quick['mean_ms']:.1f}x",
+            }
+        )
+
+    print(f"orjson: {'yes' if orjson else 'no (stdlib json fallback)'}")
+    print_table(results, ["case", "path", "mean_ms", "p50_ms", "p99_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
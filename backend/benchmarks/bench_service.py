@@ -0,0 +1,209 @@
+"""
+Service-layer benchmark and SQL query-count regression suite.
+
+Grows the employee table to each size in turn and times the paths the API
+is built on: list pagination (page number and cursor, first and deep
+pages), full-text search, create, update, delete, import and export, all
+through EmployeeService and the list paginators.
+
+The operations and the exact number of SQL statements each run must
+issue (``EXPECTED_QUERIES``) live in employees.tests.fixtures, and
+``manage.py test`` checks the same counts on a small table. Writes run
+through the write queue as they do in production, and their queries are
+counted as well. A mismatch, typically an N+1 creeping in, is reported
+and the script exits 1.
+
+    python -m benchmarks.bench_service                  # 10k, 100k and 1M rows
+    python -m benchmarks.bench_service --sizes 10000 --repeat 5
+    python -m benchmarks.bench_service --output run.json --compare last.json
+
+Results are written as JSON, one record per size and operation, so runs
+can be compared over time (``--compare`` prints the change in mean time).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from employees.tests.fixtures import (
+    OPERATIONS,
+    PAGE_SIZE,
+    Suite,
+    count_queries,
+    seed_employees,
+)
+
+from .common import BACKEND_DIR, print_table, setup_django
+
+
+def run_operation(suite, op, repeat, warmup=1):
+    """
+    Time ``repeat`` runs of ``op`` after ``warmup`` untimed ones. Returns
+    timing stats and the query count of each run.
+    """
+    for _ in range(warmup):
+        count_queries(lambda: op.run(suite))
+    samples = []
+    counts = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, queries = count_queries(lambda: op.run(suite))
+        samples.append((time.perf_counter() - started) * 1000)
+        counts.append(queries)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        "min_ms": round(samples[0], 3),
+        "queries": counts,
+    }
+
+
+def environment():
+    import sqlite3
+
+    import django
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=list(OPERATIONS),
+        default=list(OPERATIONS),
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="result file (default: bench_service-<timestamp>.json in the cwd)",
+    )
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    workdir = tempfile.mkdtemp(prefix="bench-service-")
+    setup_django(test_db_name=os.path.join(workdir, "bench.sqlite3"))
+
+    from employees.services.hierarchy_service import HierarchyService
+    from employees.services.history_service import HistoryService
+    from employees.services.summary_service import SummaryService
+
+    # The views print debug lines on every write; keep the report readable.
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    heavy_repeat = max(2, args.repeat // 10)
+    operations = [OPERATIONS[name] for name in args.operations]
+    suite = Suite()
+    seeded = 0
+    records = []
+    seed_seconds = {}
+    try:
+        for size in sorted(args.sizes):
+            seed_started = time.perf_counter()
+            seed_employees(size - seeded, start=seeded)
+            SummaryService.rebuild()
+            HierarchyService.rebuild()
+            HistoryService.record_missing()
+            seed_seconds[size] = round(time.perf_counter() - seed_started, 2)
+            seeded = size
+            suite.prepare(deletes=args.repeat + 1)
+            for op in operations:
+                result = run_operation(
+                    suite, op, heavy_repeat if op.heavy else args.repeat
+                )
+                counts = result.pop("queries")
+                records.append(
+                    {
+                        "size": size,
+                        "operation": op.name,
+                        **result,
+                        # The first run that missed the budget, if any.
+                        "queries": next(
+                            (c for c in counts if c != op.queries), op.queries
+                        ),
+                        "expected_queries": op.queries,
+                        "query_counts_ok": all(c == op.queries for c in counts),
+                    }
+                )
+    finally:
+        sys.stdout = stdout
+
+    mismatches = [r for r in records if not r["query_counts_ok"]]
+    report = {
+        "suite": "bench_service",
+        "started_at": started_at.isoformat(timespec="seconds"),
+        **environment(),
+        "page_size": PAGE_SIZE,
+        "repeat": args.repeat,
+        "seed_seconds": seed_seconds,
+        "results": records,
+        "query_mismatches": len(mismatches),
+    }
+    output = args.output or f"bench_service-{started_at:%Y%m%dT%H%M%SZ}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+    columns = [
+        "size",
+        "operation",
+        "runs",
+        "mean_ms",
+        "p50_ms",
+        "p99_ms",
+        "queries",
+        "expected_queries",
+    ]
+    if args.compare:
+        with open(args.compare) as f:
+            previous = {(r["size"], r["operation"]): r for r in json.load(f)["results"]}
+        for record in records:
+            before = previous.get((record["size"], record["operation"]))
+            if before and before["mean_ms"]:
+                change = record["mean_ms"] / before["mean_ms"] - 1
+                record["vs_previous"] = f"{change:+.0%}"
+        columns.append("vs_previous")
+
+    print_table(records, columns)
+    print(f"seeding (s): {seed_seconds}")
+    print(f"results written to {output}")
+    for record in mismatches:
+        print(
+            f"QUERY COUNT MISMATCH: {record['operation']} at {record['size']} rows "
+            f"issued {record['queries']} queries, expected {record['expected_queries']}"
+        )
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
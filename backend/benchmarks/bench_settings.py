@@ -0,0 +1,18 @@
+"""
+Settings for benchmark servers started by the benchmark scripts: the
+project settings pointed at a benchmark database and throttle store, with
+DEBUG off so query logging does not skew timings.
+"""
+
+import os
+
+from backend.settings import *  # noqa: F401,F403
+from backend.settings import DATABASES
+
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+
+for alias in ("default", "replica"):
+    DATABASES[alias]["NAME"] = os.environ["BENCH_DB_PATH"]
+
+EMPLOYEE_THROTTLE = {"PATH": os.environ["BENCH_THROTTLE_PATH"]}
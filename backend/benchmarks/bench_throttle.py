@@ -0,0 +1,170 @@
+"""
+Per-request overhead of the throttles: DRF's UserRateThrottle (timestamp
+history in the local-memory cache) against TokenBucketThrottle (one row
+per client in the shared SQLite store). Also checks that the token bucket
+holds its limit when several processes draw from one bucket.
+
+    python -m benchmarks.bench_throttle [--calls 2000] [--processes 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+from types import SimpleNamespace
+
+from .common import measure, print_table, setup_django
+
+
+def fake_request(ip):
+    from django.contrib.auth.models import AnonymousUser
+
+    return SimpleNamespace(
+        META={"REMOTE_ADDR": ip}, user=AnonymousUser(), _request=None
+    )
+
+
+def drain(path, key, capacity, attempts, queue):
+    from employees.ratelimit import TokenBucketStore
+
+    store = TokenBucketStore(path)
+    allowed = 0
+    for _ in range(attempts):
+        # A refill rate this low adds no tokens during the run.
+        allowed += store.take(key, capacity, rate=1e-9)
+    queue.put(allowed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.cache import cache
+    from rest_framework.throttling import UserRateThrottle
+
+    from employees.ratelimit import TokenBucketStore
+    from employees.throttles import TokenBucketThrottle
+
+    workdir = tempfile.mkdtemp(prefix="bench-throttle-")
+    store = TokenBucketStore(os.path.join(workdir, "throttle.sqlite3"))
+    request = fake_request("10.0.0.1")
+    requests = [fake_request(f"10.1.{i // 256}.{i % 256}") for i in range(args.calls)]
+
+    results = []
+
+    def record(case, name, stats):
+        results.append(
+            {
+                "case": case,
+                "throttle": name,
+                "us_per_request": round(stats["mean_ms"] * 1000 / args.calls, 2),
+                "p99_batch_ms": stats["p99_ms"],
+            }
+        )
+
+    # Steady state at the limit: a simulated clock advances one slot per
+    # call, so one timestamp expires and one is added, and the history
+    # list always holds a full window.
+    for window in (100, 1000, 10000):
+        # A hair over one slot, so float rounding never keeps an extra entry.
+        step = 60 / window * (1 + 1e-6)
+
+        class History(UserRateThrottle):
+            rate = f"{window}/min"
+            now = 0.0
+
+            def timer(self):
+                History.now += step
+                return History.now
+
+        cache.clear()
+        History.now = 0.0
+        key = History().get_cache_key(request, None)
+        cache.set(key, [History.now - k * step for k in range(window - 1)], 60)
+        throttle = History()
+
+        def run_history():
+            for _ in range(args.calls):
+                assert throttle.allow_request(request, None)
+
+        record(
+            f"1 client, window {window}",
+            "UserRateThrottle",
+            measure(run_history, repeat=args.repeat, warmup=1),
+        )
+
+    # The bucket's cost does not depend on its rate or fill level.
+    class Bucket(TokenBucketThrottle):
+        scope = "bench.one"
+        rate = f"{10**9}/min"
+
+    Bucket.store = store
+    bucket = Bucket()
+
+    def run_bucket():
+        for _ in range(args.calls):
+            bucket.allow_request(request, None)
+
+    record(
+        "1 client, any rate",
+        "TokenBucketThrottle",
+        measure(run_bucket, repeat=args.repeat, warmup=1),
+    )
+
+    class ManyHistory(UserRateThrottle):
+        rate = "100/min"
+
+    class ManyBucket(TokenBucketThrottle):
+        scope = "bench.many"
+        rate = "100/min"
+
+    ManyBucket.store = store
+    for name, throttle_class in (
+        ("UserRateThrottle", ManyHistory),
+        ("TokenBucketThrottle", ManyBucket),
+    ):
+        many = throttle_class()
+
+        def run_many():
+            for client in requests:
+                many.allow_request(client, None)
+
+        record(
+            f"{args.calls} distinct clients",
+            name,
+            measure(run_many, repeat=args.repeat, warmup=1),
+        )
+
+    print_table(results, ["case", "throttle", "us_per_request", "p99_batch_ms"])
+
+    # Cross-process check: P processes race for one bucket of C tokens.
+    capacity = 500
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [
+        context.Process(
+            target=drain,
+            args=(store.path, "bench.shared", capacity, capacity, queue),
+        )
+        for _ in range(args.processes)
+    ]
+    store.clear()
+    for worker in workers:
+        worker.start()
+    allowed = sum(queue.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    print(
+        f"\n{args.processes} processes x {capacity} attempts on one bucket of "
+        f"{capacity}: {allowed} allowed "
+        f"({'OK' if allowed == capacity else 'LIMIT NOT HELD'})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Shared setup for the benchmark scripts in this package.
+
+Run them from ``backend/`` as modules, e.g.::
+
+    python -m benchmarks.bench_serialization
+
+Every script runs against a throwaway test database (never ``db.sqlite3``).
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(test_db_name=None, configure=None):
+    """
+    Configure Django and create a fresh test database.
+
+    ``test_db_name`` puts the test database in a file instead of SQLite's
+    shared in-memory database, which multi-connection benchmarks need.
+    ``configure(settings)`` may adjust settings before Django is set up.
+    """
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+    import django
+    from django.conf import settings
+
+    if configure is not None:
+        configure(settings)
+    if test_db_name:
+        settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = test_db_name
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = ["*"]
+    # Also points the read-only "replica" alias at the test database.
+    setup_databases(verbosity=0, interactive=False)
+
+
+def measure(fn, repeat=20, warmup=2):
+    """
+    Call ``fn`` repeatedly and return timing stats in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        "min_ms": round(samples[0], 3),
+    }
+
+
+def print_table(rows, columns):
+    widths = [
+        max(len(str(column)), *(len(str(row.get(column, ""))) for row in rows))
+        for column in columns
+    ]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
@@ -0,0 +1,272 @@
+"""
+Concurrent write load test: several worker processes, each with several
+threads, send PATCH, DELETE, create and CSV import requests through the
+full Django stack against one SQLite file, and every "database is locked"
+error is counted.
+
+    python -m benchmarks.load_concurrent_writes [--processes 4] [--threads 8]
+    python -m benchmarks.load_concurrent_writes --baseline
+
+``--baseline`` runs the same load on Django's stock sqlite3 backend (default
+journal, 5s timeout, deferred BEGIN, no write queue) for comparison.
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from employees.tests.fixtures import seed_employees
+
+from .common import print_table, setup_django
+
+
+def client_request(client, method, path, counter, **kwargs):
+    # Every request gets its own client address so the per-client
+    # throttles do not cap the load.
+    counter[0] += 1
+    kwargs["REMOTE_ADDR"] = (
+        f"10.{os.getpid() % 250}.{counter[0] // 250 % 250}.{counter[0] % 250}"
+    )
+    return getattr(client, method)(path, **kwargs)
+
+
+def worker_thread(process_index, thread_index, ids, operations, stats):
+    from django.db import connections
+    from django.test import Client
+
+    client = Client(raise_request_exception=False)
+    rng = random.Random(process_index * 1000 + thread_index)
+    counter = [0]
+    alive = list(ids)
+    try:
+        for i in range(operations):
+            roll = rng.random()
+            started = time.perf_counter()
+            if roll < 0.05:
+                lines = [
+                    "first_name,last_name,email,phone,department,position,hire_date,salary,status"
+                ]
+                for n in range(200):
+                    lines.append(
+                        f"Bulk,Row,bulk-{process_index}-{thread_index}-{n}@example.com,,"
+                        f"Operations,Analyst,2020-01-01,{rng.randint(40000, 90000)},active"
+                    )
+                upload = io.BytesIO("\n".join(lines).encode())
+                upload.name = "load.csv"
+                kind = "import"
+                response = client_request(
+                    client,
+                    "post",
+                    "/api/employees/import/csv/",
+                    counter,
+                    data={"file": upload},
+                )
+            elif roll < 0.55 and alive:
+                kind = "update"
+                response = client_request(
+                    client,
+                    "patch",
+                    f"/api/employees/{rng.choice(alive)}/edit/",
+                    counter,
+                    data={
+                        "salary": rng.randint(40000, 250000),
+                        "status": rng.choice(["active", "on_leave"]),
+                    },
+                    content_type="application/json",
+                )
+            elif roll < 0.8 and alive:
+                kind = "delete"
+                employee_id = alive.pop(rng.randrange(len(alive)))
+                response = client_request(
+                    client, "delete", f"/api/employees/{employee_id}/", counter
+                )
+            else:
+                kind = "create"
+                response = client_request(
+                    client,
+                    "post",
+                    "/api/employees/create/",
+                    counter,
+                    data={
+                        "firstName": "Load",
+                        "lastName": "Test",
+                        "email": f"load-{process_index}-{thread_index}-{i}@example.com",
+                        "department": "Engineering",
+                        "position": "Engineer",
+                        "salary": rng.randint(40000, 250000),
+                    },
+                    content_type="application/json",
+                )
+            elapsed = (time.perf_counter() - started) * 1000
+            stats["latencies"].append(elapsed)
+            stats[kind] += 1
+            if response.status_code < 400:
+                stats["ok"] += 1
+                continue
+            error = getattr(response, "exc_info", None)
+            message = str(error[1]) if error else response.content.decode()[:200]
+            if "locked" in message:
+                stats["locked"] += 1
+            else:
+                stats["other"] += 1
+                stats["messages"].append(f"{kind} {response.status_code}: {message}")
+    finally:
+        connections.close_all()
+
+
+def worker_process(process_index, threads, id_slices, operations, queue):
+    from collections import Counter
+
+    # The views print debug lines per request; keep the report readable.
+    sys.stdout = open(os.devnull, "w")
+    results = []
+    pool = []
+    for thread_index in range(threads):
+        stats = Counter()
+        stats["latencies"] = []
+        stats["messages"] = []
+        results.append(stats)
+        pool.append(
+            threading.Thread(
+                target=worker_thread,
+                args=(
+                    process_index,
+                    thread_index,
+                    id_slices[thread_index],
+                    operations,
+                    stats,
+                ),
+            )
+        )
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    merged = {"latencies": [], "messages": []}
+    for stats in results:
+        for key, value in stats.items():
+            if isinstance(value, list):
+                merged[key].extend(value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    queue.put(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=40, help="per thread")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="load-writes-")
+
+    def configure(settings):
+        settings.EMPLOYEE_THROTTLE = {"PATH": os.path.join(workdir, "throttle.sqlite3")}
+        if args.baseline:
+            default = settings.DATABASES["default"]
+            default.update(ENGINE="django.db.backends.sqlite3", OPTIONS={})
+            settings.DATABASES["replica"] = {**default, "TEST": {"MIRROR": "default"}}
+            settings.EMPLOYEE_WRITE_QUEUE = {"ENABLED": False}
+
+    setup_django(
+        test_db_name=os.path.join(workdir, "test.sqlite3"), configure=configure
+    )
+
+    from django.db import connections
+
+    from employees.models import Employee
+    from employees.services.hierarchy_service import HierarchyService
+    from employees.services.summary_service import SummaryService
+
+    seed_employees(args.rows)
+    SummaryService.rebuild()
+    HierarchyService.rebuild()
+    ids = list(Employee.objects.values_list("id", flat=True))
+    slices = args.processes * args.threads
+    id_slices = [ids[i::slices] for i in range(slices)]
+    connections.close_all()
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(
+            target=worker_process,
+            args=(
+                p,
+                args.threads,
+                id_slices[p * args.threads : (p + 1) * args.threads],
+                args.operations,
+                queue,
+            ),
+        )
+        for p in range(args.processes)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    total = {"latencies": [], "messages": []}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                total[key].extend(value)
+            else:
+                total[key] = total.get(key, 0) + value
+    latencies = sorted(total["latencies"])
+    requests = len(latencies)
+    drift = SummaryService.find_drift()
+
+    print(
+        f"{'baseline (stock sqlite3)' if args.baseline else 'WAL + write queue'}: "
+        f"{args.processes} processes x {args.threads} threads x {args.operations} requests"
+    )
+    print_table(
+        [
+            {
+                "requests": requests,
+                "ok": total.get("ok", 0),
+                "lock_errors": total.get("locked", 0),
+                "other_errors": total.get("other", 0),
+                "req_per_s": round(requests / elapsed, 1),
+                "p50_ms": round(statistics.median(latencies), 1),
+                "p99_ms": round(latencies[min(requests - 1, int(requests * 0.99))], 1),
+            }
+        ],
+        [
+            "requests",
+            "ok",
+            "lock_errors",
+            "other_errors",
+            "req_per_s",
+            "p50_ms",
+            "p99_ms",
+        ],
+    )
+    print(
+        "mix: "
+        + ", ".join(
+            f"{kind}={total.get(kind, 0)}"
+            for kind in ("update", "delete", "create", "import")
+        )
+    )
+    print(f"summary drift after load: {len(drift)} groups")
+    for message in total["messages"][:5]:
+        print("  ", message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Async versions of the read endpoints, for running under ASGI
+(``backend.asgi``). Queries go through Django's async ORM and exports
+stream from async iterators, so a slow client waits on the event loop
+instead of holding a worker thread. Responses match the sync views.
+
+DRF's ``@api_view`` does not support ``async def`` views, so these are
+plain Django views that apply the same throttles and error shapes.
+"""
+
+import functools
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from .conditional import Validators
+from .listing import EmployeeListQuery
+from .renderers import render_json
+from .serializers import EmployeeSerializer
+from .services.employee_service import EmployeeService
+from .throttles import ExportEmployeesThrottle, GetEmployeesThrottle
+
+
+def _json(data, status=200, headers=None):
+    """Compact JSON like DRF's JSONRenderer, so error bodies match too."""
+    return HttpResponse(
+        render_json(data),
+        status=status,
+        headers=headers,
+        content_type="application/json",
+    )
+
+
+def async_endpoint(*throttle_classes):
+    """
+    GET-only async view with token-bucket throttling. Clients are keyed by
+    address. Taking a token is a SQLite write that can wait on the bucket
+    file's lock, so it runs in a thread rather than on the event loop.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return _json(
+                    {"detail": f'Method "{request.method}" not allowed.'},
+                    status=405,
+                    headers={"Allow": "GET, HEAD"},
+                )
+            for throttle_class in throttle_classes:
+                throttle = throttle_class()
+                throttle.key = throttle.get_ip_key(request)
+                if not await sync_to_async(throttle.take)():
+                    wait = math.ceil(await sync_to_async(throttle.wait)())
+                    return _json(
+                        {
+                            "detail": "Request was throttled. "
+                            f"Expected available in {wait} seconds."
+                        },
+                        status=429,
+                        headers={"Retry-After": str(wait)},
+                    )
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@async_endpoint(GetEmployeesThrottle)
+async def get_all_employees(request):
+    request = Request(request)
+    try:
+        query = EmployeeListQuery(request)
+        response = query.cached_response(await EmployeeService.aget_watermark())
+        if response is None:
+            if query.search:
+                # Ranked FTS results are raw SQL, not an async-capable queryset.
+                page = await sync_to_async(query.paginator.paginate_queryset)(
+                    query.rows(), request
+                )
+            else:
+                page = await query.paginator.apaginate_queryset(query.rows(), request)
+            response = query.page_response(page)
+        return response
+
+    except NotFound as e:
+        return _json({"detail": str(e.detail)}, status=404)
+    except ValueError as e:
+        return _json({"error": str(e)}, status=400)
+
+
+@async_endpoint(GetEmployeesThrottle)
+async def get_employee(request, id):
+    employee = await EmployeeService.aget_employee(id)
+    if employee is None:
+        return _json({"error": "Employee not found"}, status=404)
+    validators = Validators.for_employee(employee.id, employee.updated_at)
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    return validators.apply(_json(EmployeeSerializer(employee).data))
+
+
+@async_endpoint(ExportEmployeesThrottle)
+async def export_employees_csv(request):
+    return EmployeeService.aexport_to_csv()
+
+
+@async_endpoint(ExportEmployeesThrottle)
+async def export_employees_ndjson(request):
+    return EmployeeService.aexport_to_ndjson()
@@ -0,0 +1,150 @@
+"""
+In-memory prefix index of department and position names, for the
+autocomplete endpoint (``GET /api/employees/autocomplete/<field>/``).
+
+Each field keeps its distinct values in a sorted list keyed by the
+case-folded name, so a prefix query is one binary search plus a slice.
+Values are added and removed as writes commit, and requests never touch
+the database.
+
+The index records the data generation (see ``GenerationRepository``) it
+reflects. A write in this process arrives with the generation it bumped
+to; if that is not the next one, another process wrote in between and the
+index is marked stale, to be reloaded off the request path.
+"""
+
+import bisect
+import threading
+import time
+
+from django.conf import settings
+
+FIELDS = ("department", "position")
+
+
+class PrefixIndex:
+    """
+    Distinct values with counts, sorted case-insensitively.
+    """
+
+    def __init__(self, counts: dict[str, int] | None = None):
+        self._counts = {value: n for value, n in (counts or {}).items() if n > 0}
+        self._keys = sorted((value.casefold(), value) for value in self._counts)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, value: str, n: int = 1):
+        count = self._counts.get(value, 0) + n
+        if count > 0:
+            if value not in self._counts:
+                bisect.insort(self._keys, (value.casefold(), value))
+            self._counts[value] = count
+        elif value in self._counts:
+            del self._counts[value]
+            key = (value.casefold(), value)
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def complete(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """
+        Up to ``limit`` ``(value, count)`` pairs whose value starts with
+        ``prefix`` (ignoring case), alphabetically.
+        """
+        prefix = prefix.casefold()
+        results = []
+        start = bisect.bisect_left(self._keys, (prefix,))
+        for folded, value in self._keys[start : start + limit]:
+            if not folded.startswith(prefix):
+                break
+            results.append((value, self._counts[value]))
+        return results
+
+
+class AutocompleteIndex:
+    def __init__(self, refresh_seconds: float = 30):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._indexes = None  # {field: PrefixIndex} once loaded
+        self.generation = None
+        self.stale = False
+        self.checked_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._indexes is not None
+
+    def needs_check(self) -> bool:
+        """
+        Whether the index should be compared with the database: it is
+        unloaded, known stale, or has not been checked for a while.
+        """
+        return (
+            self._indexes is None
+            or self.stale
+            or time.monotonic() - self.checked_at >= self.refresh_seconds
+        )
+
+    def complete(self, field: str, prefix: str, limit: int):
+        """
+        ``PrefixIndex.complete`` for ``field``, or None before the first
+        load.
+        """
+        with self._lock:
+            if self._indexes is None:
+                return None
+            return self._indexes[field].complete(prefix, limit)
+
+    def load(self, generation: int, counts: dict[str, dict[str, int]]):
+        """
+        Replace the index with ``counts`` read at ``generation``.
+        """
+        indexes = {field: PrefixIndex(counts[field]) for field in FIELDS}
+        with self._lock:
+            self._indexes = indexes
+            self.generation = generation
+            self.stale = False
+            self.checked_at = time.monotonic()
+
+    def mark_checked(self):
+        with self._lock:
+            self.checked_at = time.monotonic()
+
+    def apply(self, deltas: dict[str, dict[str, int]], generation: int):
+        """
+        Fold in a committed write's per-value count changes. ``generation``
+        is the value the write bumped the data generation to.
+        """
+        with self._lock:
+            if self._indexes is None or generation <= self.generation:
+                return
+            if generation != self.generation + 1:
+                # Another process wrote in between. Keep this write visible
+                # now; the reload brings in the rest.
+                self.stale = True
+            else:
+                self.generation = generation
+            for field, values in deltas.items():
+                index = self._indexes[field]
+                for value, n in values.items():
+                    if n:
+                        index.add(value, n)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self._indexes is not None,
+                "generation": self.generation,
+                "stale": self.stale,
+                "values": (
+                    {field: len(index) for field, index in self._indexes.items()}
+                    if self._indexes is not None
+                    else {}
+                ),
+            }
+
+
+_config = getattr(settings, "EMPLOYEE_AUTOCOMPLETE", {})
+
+autocomplete_index = AutocompleteIndex(
+    refresh_seconds=_config.get("REFRESH_SECONDS", 30)
+)
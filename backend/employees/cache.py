@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class ListResponseCache:
+    """
+    Bounded in-process LRU cache of rendered list responses.
+
+    Keys include the dataset generation (see ``GenerationRepository``), so a
+    write makes every older entry unreachable without any per-key
+    invalidation; stale entries simply age out of the LRU. Memory is bounded
+    both by entry count and by total bytes of cached bodies.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(request, generation: int) -> tuple:
+        """
+        Cache key for a list request: generation, host, path and the sorted
+        query parameters (page, page_size, search, cursor, ...).
+        """
+        params = tuple(
+            sorted(
+                (key, tuple(values)) for key, values in request.query_params.lists()
+            )
+        )
+        return (generation, request.get_host(), request.path, params)
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+
+_config = getattr(settings, "EMPLOYEE_LIST_CACHE", {})
+
+list_cache = ListResponseCache(
+    max_entries=_config.get("MAX_ENTRIES", 256),
+    max_bytes=_config.get("MAX_BYTES", 16 * 1024 * 1024),
+)
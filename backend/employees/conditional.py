@@ -0,0 +1,64 @@
+"""
+Conditional GET: ETag / Last-Modified validators and 304 responses.
+
+The list's validators come from a watermark, the data generation and the
+newest ``updated_at``, which one cheap query returns (see
+``EmployeeRepository.get_watermark``). Every service write bumps the
+generation in its transaction, the same counter the list cache is keyed
+on, so any committed write changes the watermark. It is read before the
+page, so a response is never labelled newer than its data.
+
+The list has no Last-Modified: a delete leaves MAX(updated_at) alone,
+so If-Modified-Since alone would answer 304 for a list that lost rows.
+Only the ETag, which includes the generation, can validate it.
+"""
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class Validators:
+    def __init__(self, etag: str, last_modified=None):
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def for_list(cls, watermark: dict) -> "Validators":
+        last_modified = watermark["last_modified"]
+        micros = _micros(last_modified) if last_modified else 0
+        return cls(f'"{watermark["generation"]:x}-{micros:x}"')
+
+    @classmethod
+    def for_employee(cls, employee_id: int, updated_at) -> "Validators":
+        return cls(f'"e{employee_id:x}-{_micros(updated_at):x}"', updated_at)
+
+    def not_modified(self, request) -> HttpResponseNotModified | None:
+        """
+        A 304 if the request's If-None-Match / If-Modified-Since still
+        match, else None.
+        """
+        last_modified = (
+            int(self.last_modified.timestamp()) if self.last_modified else None
+        )
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=last_modified
+        )
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        """
+        Set ETag and Last-Modified on a response, and ask clients to
+        revalidate instead of reusing it heuristically.
+        """
+        response["ETag"] = self.etag
+        if self.last_modified:
+            response["Last-Modified"] = http_date(self.last_modified.timestamp())
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+def _micros(value) -> int:
+    return int(value.timestamp()) * 1_000_000 + value.microsecond
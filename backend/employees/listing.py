@@ -0,0 +1,101 @@
+"""
+``GET /api/employees/`` request handling shared by the sync view and its
+async twin (``async_views``), which differ only in how the page is read.
+"""
+
+from django.http import HttpResponse
+
+from .cache import list_cache
+from .conditional import Validators
+from .metrics import serialization
+from .models import Employee
+from .pagination import (
+    EmployeeCursorPagination,
+    EmployeePagination,
+    order_expressions,
+    parse_ordering,
+)
+from .renderers import render_json
+from .serializers import EmployeeRowSerializer, parse_fields
+from .services.employee_service import EmployeeService
+
+
+class EmployeeListQuery:
+    """
+    The list endpoint's parameters, parsed and validated up front.
+
+    Every parameter is checked before the conditional response, so a bad
+    request gets its 400 (ValueError) or 404 (NotFound) even when the
+    client's ETag still matches.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        params = request.query_params
+        # ?fields=id,firstName,... narrows both the SELECT and the output.
+        self.serializer = EmployeeRowSerializer(parse_fields(params.get("fields")))
+        # ?ordering= accepts only orderings an index can return rows in.
+        ordering_param = params.get("ordering")
+        self.ordering = parse_ordering(ordering_param)
+        self.search = params.get("search", "").strip()
+        if self.search:
+            if ordering_param:
+                raise ValueError("Search results are ordered by relevance.")
+            # Ranked full-text results are paged by page number only.
+            self.paginator = EmployeePagination()
+        # ?pagination=cursor (or any ?cursor=) switches to keyset pagination,
+        # which skips COUNT(*) and OFFSET scans on deep pages.
+        elif params.get("pagination") == "cursor" or "cursor" in params:
+            self.paginator = EmployeeCursorPagination(self.ordering)
+            cursor = params.get(self.paginator.cursor_query_param)
+            if cursor:
+                self.paginator.decode_cursor(cursor)
+        else:
+            self.paginator = EmployeePagination()
+
+    def cached_response(self, watermark: dict) -> HttpResponse | None:
+        """
+        A 304 if the client's ETag matches ``watermark``, else the cached
+        page if there is one, else None: the caller reads the page and
+        passes it to ``page_response``.
+        """
+        self.validators = Validators.for_list(watermark)
+        not_modified = self.validators.not_modified(self.request)
+        if not_modified is not None:
+            return not_modified
+
+        self.cache_key = list_cache.make_key(self.request, watermark["generation"])
+        body = list_cache.get(self.cache_key)
+        if body is None:
+            return None
+        response = HttpResponse(body, content_type="application/json")
+        response["X-Cache"] = "HIT"
+        return self.validators.apply(response)
+
+    def rows(self):
+        """
+        The rows to page through: ranked search results (raw SQL, read
+        synchronously), or a ``values()`` queryset in the requested order.
+        """
+        if self.search:
+            employees = EmployeeService.search_employees(self.search)
+        else:
+            employees = Employee.objects.order_by(*order_expressions(self.ordering))
+        return self.serializer.values(employees, self.paginator.required_columns)
+
+    def page_response(self, page) -> HttpResponse:
+        """
+        Render and cache a page read from ``rows()``. Read-only fast path:
+        values() rows through a prebuilt row mapper, rendered with orjson
+        when available. Same bytes as EmployeeSerializer.
+        """
+        with serialization():
+            data = self.paginator.get_paginated_response(
+                self.serializer.to_representation(page)
+            ).data
+            body = render_json(data)
+        list_cache.set(self.cache_key, body)
+
+        response = HttpResponse(body, content_type="application/json")
+        response["X-Cache"] = "MISS"
+        return self.validators.apply(response)
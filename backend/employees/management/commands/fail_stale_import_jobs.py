@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from employees.services.job_service import STALE_AFTER, ImportJobService
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark import jobs that are still running but have recorded no "
+        "progress for EMPLOYEE_JOBS['STALE_MINUTES'] as failed, e.g. after "
+        "the process running them was restarted."
+    )
+
+    def handle(self, *args, **options):
+        failed = ImportJobService.fail_stale_jobs()
+        minutes = int(STALE_AFTER.total_seconds() // 60)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Failed {failed} import jobs with no progress for {minutes} minutes."
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from employees.services.sync_service import TOMBSTONE_RETENTION, SyncService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete employee deletion tombstones older than "
+        "EMPLOYEE_SYNC['TOMBSTONE_RETENTION_DAYS']. Delta sync tokens from "
+        "before the cut must then start over with a full sync."
+    )
+
+    def handle(self, *args, **options):
+        pruned = SyncService.prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {pruned} tombstones older than {TOMBSTONE_RETENTION.days} days."
+            )
+        )
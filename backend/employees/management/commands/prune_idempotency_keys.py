@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from employees.services.idempotency_service import KEY_RETENTION, IdempotencyService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete stored Idempotency-Key results older than "
+        "EMPLOYEE_IDEMPOTENCY['RETENTION_HOURS']. A retry with a pruned key "
+        "writes again."
+    )
+
+    def handle(self, *args, **options):
+        pruned = IdempotencyService.prune_keys()
+        hours = int(KEY_RETENTION.total_seconds() // 3600)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {pruned} idempotency keys older than {hours} hours."
+            )
+        )
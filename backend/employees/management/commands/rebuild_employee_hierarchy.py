@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from employees.services.hierarchy_service import HierarchyService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the employee hierarchy closure table from manager_id, or "
+        "with --check only report rows that have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare against paths computed from manager_id without "
+            "writing; exit 1 on drift.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = HierarchyService.find_drift()
+            if drift["missing"] or drift["extra"]:
+                self.stdout.write(json.dumps(drift, indent=2))
+                raise CommandError("Hierarchy table is out of date.")
+            self.stdout.write(self.style.SUCCESS("Hierarchy table is up to date."))
+            return
+
+        with transaction.atomic():
+            rows = HierarchyService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} hierarchy row(s)."))
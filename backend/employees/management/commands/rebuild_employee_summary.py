@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from employees.services.summary_service import SummaryService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the incrementally maintained employee summary table from "
+        "scratch, or with --check only report groups that have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare against a fresh GROUP BY without writing; exit 1 on drift.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = SummaryService.find_drift()
+            if drift:
+                self.stdout.write(json.dumps(drift, indent=2, default=str))
+                raise CommandError(f"{len(drift)} summary group(s) out of date.")
+            self.stdout.write(self.style.SUCCESS("Summary table is up to date."))
+            return
+
+        with transaction.atomic():
+            groups = SummaryService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {groups} summary group(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.repositories.search_repo import EmployeeSearchRepository
+
+
+class Command(BaseCommand):
+    help = "Recreate the employee full-text search table/triggers and reindex every row."
+
+    def handle(self, *args, **options):
+        if not EmployeeSearchRepository.is_supported():
+            raise CommandError("Full-text search index requires SQLite FTS5.")
+        EmployeeSearchRepository.install()
+        EmployeeSearchRepository.rebuild()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
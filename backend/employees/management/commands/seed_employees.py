@@ -0,0 +1,204 @@
+import datetime
+import functools
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from employees.models import Employee
+from employees.repositories.employee_repo import EmployeeRepository
+from employees.services.seed_service import (
+    DEFAULT_DEPARTMENTS,
+    DEFAULT_POSITIONS,
+    DEFAULT_STATUSES,
+    EmployeeGenerator,
+    SeedService,
+    parse_weights,
+)
+
+_STATUSES = {choice for choice, _ in Employee.Status.choices}
+
+
+def _weights(spec):
+    try:
+        return parse_weights(spec)
+    except ValueError as e:
+        raise CommandError(f"Bad weights {spec!r}: {e}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate COUNT synthetic employees for load testing. Rows are "
+        "written in chunks, one transaction each, and published like any "
+        "other write. Large loads drop the table's secondary indexes and the "
+        "full-text index and rebuild them, and the summary, hierarchy and "
+        "history tables, once at the end instead; if the command is killed "
+        "first, run it again with --repair."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, nargs="?")
+        parser.add_argument(
+            "--departments",
+            help='Weighted departments, e.g. "Engineering=40,Sales=25,Legal=5".',
+        )
+        parser.add_argument(
+            "--positions", help='Weighted positions, e.g. "Engineer=3,Manager=1".'
+        )
+        parser.add_argument(
+            "--statuses", help='Weighted statuses, e.g. "active=90,on_leave=10".'
+        )
+        parser.add_argument("--salary-median", type=float, default=85_000)
+        parser.add_argument(
+            "--salary-spread",
+            type=float,
+            default=0.35,
+            help="Sigma of the log-normal salary distribution (default 0.35).",
+        )
+        parser.add_argument(
+            "--hired-from",
+            type=datetime.date.fromisoformat,
+            default=datetime.date(2005, 1, 1),
+        )
+        parser.add_argument(
+            "--hired-to",
+            type=datetime.date.fromisoformat,
+            default=datetime.date.today(),
+        )
+        parser.add_argument("--email-prefix", default="seed")
+        parser.add_argument("--email-domain", default="example.com")
+        parser.add_argument(
+            "--start",
+            type=int,
+            help="Number of the first email (default: after the last seeded one).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument("--chunk-size", type=int, default=20_000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Generate chunks in this many processes (writes stay in one).",
+        )
+        parser.add_argument(
+            "--orm",
+            action="store_true",
+            help="Write through Employee model instances and bulk_create "
+            "(several times slower).",
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Keep the indexes updated row by row and publish every chunk "
+            "instead of rebuilding them after a large load.",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Only recreate indexes and derived tables left behind by an "
+            "interrupted load.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repair"]:
+            restored = SeedService.restore_indexes() + SeedService.rebuild_derived()
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt: {', '.join(restored) or 'nothing'}.")
+            )
+            return
+        count = options["count"]
+        chunk_size = options["chunk_size"]
+        if count is None:
+            raise CommandError("count is required unless --repair is given.")
+        if count <= 0 or chunk_size <= 0 or options["workers"] <= 0:
+            raise CommandError("count, --chunk-size and --workers must be positive.")
+        statuses = (
+            _weights(options["statuses"]) if options["statuses"] else DEFAULT_STATUSES
+        )
+        unknown = set(statuses) - _STATUSES
+        if unknown:
+            raise CommandError(f"Unknown status(es): {', '.join(sorted(unknown))}")
+        if options["hired_to"] < options["hired_from"]:
+            raise CommandError("--hired-to is before --hired-from.")
+
+        generator = EmployeeGenerator(
+            departments=(
+                _weights(options["departments"])
+                if options["departments"]
+                else DEFAULT_DEPARTMENTS
+            ),
+            positions=(
+                _weights(options["positions"])
+                if options["positions"]
+                else DEFAULT_POSITIONS
+            ),
+            statuses=statuses,
+            hired_from=options["hired_from"],
+            hired_to=options["hired_to"],
+            salary_median=options["salary_median"],
+            salary_spread=options["salary_spread"],
+            email_prefix=options["email_prefix"],
+            email_domain=options["email_domain"],
+            seed=options["seed"],
+        )
+        start = options["start"]
+        if start is None:
+            start = SeedService.next_email_number(
+                generator.email_prefix, generator.email_domain
+            )
+        specs = [
+            (offset, min(chunk_size, start + count - offset))
+            for offset in range(start, start + count, chunk_size)
+        ]
+        # Rebuilding an index reads the whole table; worth it once the load
+        # is at least as big as what is already there (max id is a cheap
+        # upper bound on the row count). Derived state is rebuilt with the
+        # indexes rather than published chunk by chunk.
+        bulk = not options["keep_indexes"] and count >= EmployeeRepository.get_max_id()
+        write = functools.partial(
+            SeedService.bulk_create_rows if options["orm"] else SeedService.insert_rows,
+            publish=not bulk,
+        )
+
+        verbose = options["verbosity"] >= 2
+        started = time.perf_counter()
+        if options["workers"] > 1:
+            # Forked workers must not inherit open database connections.
+            connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(options["workers"])
+            chunks = pool.imap(generator.chunk, specs)
+        else:
+            pool = None
+            chunks = map(generator.chunk, specs)
+        try:
+            if bulk:
+                with SeedService.bulk_load():
+                    written = self.write_chunks(chunks, write, count, started, verbose)
+                    self.stdout.write("Rebuilding indexes and derived tables...")
+            else:
+                written = self.write_chunks(chunks, write, count, started, verbose)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {written} employees in {elapsed:.1f}s "
+                f"({written / elapsed:,.0f} rows/s); emails "
+                f"{generator.email_prefix}{start}..{start + count - 1}"
+                f"@{generator.email_domain}."
+            )
+        )
+
+    def write_chunks(self, chunks, write, count, started, verbose) -> int:
+        written = 0
+        for rows in chunks:
+            written += write(rows)
+            if verbose:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{written}/{count} rows ({written / elapsed:,.0f} rows/s)"
+                )
+        return written
@@ -0,0 +1,251 @@
+"""
+Per-route request metrics, kept in process memory and rendered in the
+Prometheus text format by the ``/metrics`` view.
+
+``MetricsMiddleware`` (employees.middleware) opens a ``RequestMetrics``
+for each request. SQL queries on any connection are timed by an execute
+wrapper installed on every new connection, and code that turns data into
+bytes marks itself with ``serialization()``. Both attribute their time to
+the current request through a context variable, which follows the request
+into ``sync_to_async`` threads and the write queue's writer thread.
+
+Each worker process keeps its own registry; Prometheus should scrape
+every process (or run one worker per scrape target).
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+
+DURATION_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000, 10000)
+SIZE_BUCKETS = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+    16777216,
+    67108864,
+)
+LABELS = ("method", "route", "status")
+# ListResponseCache.stats() keys: (metric suffix, type, help).
+CACHE_STATS = (
+    ("hits", "hits_total", "counter", "Lookups answered from the cache."),
+    ("misses", "misses_total", "counter", "Lookups not found in the cache."),
+    ("evictions", "evictions_total", "counter", "Entries evicted to stay in bounds."),
+    ("entries", "entries", "gauge", "Entries held, including unreachable ones."),
+    ("bytes", "bytes", "gauge", "Bytes of cached response bodies."),
+)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label set, as Prometheus expects.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, lines: list[str]):
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for labels, series in sorted(self._series.items()):
+            label_text = ",".join(
+                f'{key}="{_escape(value)}"' for key, value in zip(LABELS, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                )
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+
+
+def render_cache(prefix: str, stats: dict) -> str:
+    """
+    A cache's ``stats()`` as Prometheus counters and gauges named
+    ``<prefix>_<stat>``.
+    """
+    lines = []
+    for key, suffix, kind, documentation in CACHE_STATS:
+        name = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {stats[key]}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duration = Histogram(
+            "employees_http_request_duration_seconds",
+            "Time from request to last response byte.",
+            DURATION_BUCKETS,
+        )
+        self.queries = Histogram(
+            "employees_http_request_db_queries",
+            "SQL queries executed per request.",
+            QUERY_COUNT_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "employees_http_request_db_duration_seconds",
+            "Time spent executing SQL per request.",
+            DURATION_BUCKETS,
+        )
+        self.serialization = Histogram(
+            "employees_http_request_serialization_duration_seconds",
+            "Time spent serializing response data per request.",
+            DURATION_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "employees_http_response_size_bytes",
+            "Response body size.",
+            SIZE_BUCKETS,
+        )
+        self._histograms = (
+            self.duration,
+            self.queries,
+            self.db_duration,
+            self.serialization,
+            self.response_size,
+        )
+
+    def record(self, labels: tuple, metrics: "RequestMetrics", size: int):
+        with self._lock:
+            self.duration.observe(labels, metrics.elapsed())
+            self.queries.observe(labels, metrics.queries)
+            self.db_duration.observe(labels, metrics.db_time)
+            self.serialization.observe(labels, metrics.serialization_time)
+            self.response_size.observe(labels, size)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for histogram in self._histograms:
+                histogram.render(lines)
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            for histogram in self._histograms:
+                histogram._series.clear()
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetrics:
+    """
+    Counters for one request. A request's work may hop threads but runs
+    one step at a time, so the counters need no lock.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self._serializing = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return (
+            f"app;dur={self.elapsed() * 1000:.1f}, "
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialization_time * 1000:.1f}"
+        )
+
+
+current = ContextVar("employees_request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper: time each query against the current request, if any.
+    """
+    metrics = current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def install(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    install(connection)
+
+
+connection_created.connect(_on_connection_created)
+
+
+@contextmanager
+def serialization():
+    """
+    Count the enclosed block as serialization time for the current request.
+    Nested blocks count once.
+    """
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    metrics._serializing += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serializing -= 1
+        if not metrics._serializing:
+            metrics.serialization_time += time.perf_counter() - started
@@ -0,0 +1,107 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count and time, serialization time and
+    response size per route (see employees.metrics), and reports the
+    request's own numbers in a ``Server-Timing`` header.
+
+    Streamed responses are measured until their last chunk is sent; their
+    ``Server-Timing`` header can only cover the time to the first byte.
+    Put this first in MIDDLEWARE so the whole stack is timed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics, token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self._finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        return self._finish(request, response, request_metrics)
+
+    def _start(self):
+        # Connections opened before this module was imported missed the
+        # connection_created hook.
+        for connection in connections.all(initialized_only=True):
+            metrics.install(connection)
+        request_metrics = metrics.RequestMetrics()
+        return request_metrics, metrics.current.set(request_metrics)
+
+    def _finish(self, request, response, request_metrics):
+        match = getattr(request, "resolver_match", None)
+        labels = (
+            request.method,
+            "/" + match.route if match is not None else "<unmatched>",
+            str(response.status_code),
+        )
+        response["Server-Timing"] = request_metrics.server_timing()
+        if not response.streaming:
+            metrics.registry.record(labels, request_metrics, len(response.content))
+        elif response.is_async:
+            response.streaming_content = self._aiter_measured(
+                response.streaming_content, labels, request_metrics
+            )
+        else:
+            response.streaming_content = self._iter_measured(
+                response.streaming_content, labels, request_metrics
+            )
+        return response
+
+    @staticmethod
+    def _iter_measured(content, labels, request_metrics):
+        size = 0
+        iterator = iter(content)
+        try:
+            while True:
+                # Queries made while producing a chunk belong to this request.
+                token = metrics.current.set(request_metrics)
+                try:
+                    chunk = next(iterator, None)
+                finally:
+                    metrics.current.reset(token)
+                if chunk is None:
+                    break
+                size += len(chunk)
+                yield chunk
+        finally:
+            metrics.registry.record(labels, request_metrics, size)
+
+    @staticmethod
+    async def _aiter_measured(content, labels, request_metrics):
+        size = 0
+        iterator = aiter(content)
+        try:
+            while True:
+                token = metrics.current.set(request_metrics)
+                try:
+                    chunk = await anext(iterator, None)
+                finally:
+                    metrics.current.reset(token)
+                if chunk is None:
+                    break
+                size += len(chunk)
+                yield chunk
+        finally:
+            metrics.registry.record(labels, request_metrics, size)
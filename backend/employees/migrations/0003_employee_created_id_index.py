@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_alter_employee_hire_date'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='employee',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Employee', 'verbose_name_plural': 'Employees'},
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['-created_at', '-id'], name='employees_created_id_idx'),
+        ),
+    ]
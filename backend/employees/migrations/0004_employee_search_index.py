@@ -0,0 +1,90 @@
+from django.db import migrations
+
+# SQLite FTS5 index over employee names, email, phone, department and
+# position, as of this migration. The SQL is frozen here rather than read
+# from employees.repositories.search_repo, so later changes to the app
+# cannot change what this migration does; rebuild_search_index reinstalls
+# the current definition.
+#
+# External-content table: the index reads column values back from
+# employees_employee, and the triggers keep it in sync with every write.
+INSTALL_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS employees_employee_fts USING fts5(
+        first_name, last_name, email, phone, department, position,
+        content='employees_employee',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employees_employee_fts_ai
+    AFTER INSERT ON employees_employee
+    BEGIN
+        INSERT INTO employees_employee_fts(
+            rowid, first_name, last_name, email, phone, department, position
+        )
+        VALUES (
+            new.id, new.first_name, new.last_name, new.email, new.phone,
+            new.department, new.position
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employees_employee_fts_ad
+    AFTER DELETE ON employees_employee
+    BEGIN
+        INSERT INTO employees_employee_fts(
+            employees_employee_fts,
+            rowid, first_name, last_name, email, phone, department, position
+        )
+        VALUES (
+            'delete', old.id, old.first_name, old.last_name, old.email,
+            old.phone, old.department, old.position
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employees_employee_fts_au
+    AFTER UPDATE OF first_name, last_name, email, phone, department, position
+    ON employees_employee
+    BEGIN
+        INSERT INTO employees_employee_fts(
+            employees_employee_fts,
+            rowid, first_name, last_name, email, phone, department, position
+        )
+        VALUES (
+            'delete', old.id, old.first_name, old.last_name, old.email,
+            old.phone, old.department, old.position
+        );
+        INSERT INTO employees_employee_fts(
+            rowid, first_name, last_name, email, phone, department, position
+        )
+        VALUES (
+            new.id, new.first_name, new.last_name, new.email, new.phone,
+            new.department, new.position
+        );
+    END
+    """,
+    # Index the rows that existed before the triggers.
+    "INSERT INTO employees_employee_fts(employees_employee_fts) VALUES ('rebuild')",
+]
+
+UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS employees_employee_fts_ai",
+    "DROP TRIGGER IF EXISTS employees_employee_fts_ad",
+    "DROP TRIGGER IF EXISTS employees_employee_fts_au",
+    "DROP TABLE IF EXISTS employees_employee_fts",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_employee_created_id_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(INSTALL_SQL, UNINSTALL_SQL),
+    ]
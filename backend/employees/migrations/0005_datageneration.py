@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataGeneration',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Data Generation',
+                'verbose_name_plural': 'Data Generations',
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.27 on 2026-10-17 20:36
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def build_summary(apps, schema_editor):
+    Employee = apps.get_model('employees', 'Employee')
+    EmployeeSummary = apps.get_model('employees', 'EmployeeSummary')
+    rows = (
+        Employee.objects.order_by()
+        .values('department', 'status')
+        .annotate(
+            headcount=Count('id'),
+            salary_count=Count('salary'),
+            salary_total=Sum('salary'),
+            salary_min=Min('salary'),
+            salary_max=Max('salary'),
+        )
+    )
+    EmployeeSummary.objects.bulk_create(
+        EmployeeSummary(**{**row, 'salary_total': row['salary_total'] or 0})
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('on_leave', 'On Leave')], max_length=20)),
+                ('headcount', models.PositiveIntegerField(default=0)),
+                ('salary_count', models.PositiveIntegerField(default=0)),
+                ('salary_total', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Employee Summary',
+                'verbose_name_plural': 'Employee Summaries',
+                'ordering': ['department', 'status'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'status', 'salary'], name='employees_dept_status_sal_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeesummary',
+            constraint=models.UniqueConstraint(fields=('department', 'status'), name='unique_summary_group'),
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_employeesummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['updated_at'], name='employees_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_employee_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('employee_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Employee Tombstone',
+                'verbose_name_plural': 'Employee Tombstones',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0010_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employees_e_departm_e28f46_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employees_e_last_na_99a4c0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='employees_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'last_name', 'first_name', 'id'], name='employees_dept_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['hire_date', 'id'], name='employees_hire_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['salary', 'id'], name='employees_salary_id_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_hierarchy(apps, schema_editor):
+    # Nobody has a manager yet, so every employee's only path is to itself.
+    Employee = apps.get_model('employees', 'Employee')
+    EmployeeHierarchy = apps.get_model('employees', 'EmployeeHierarchy')
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        'INSERT INTO {} (ancestor_id, descendant_id, depth) '
+        'SELECT {id}, {id}, 0 FROM {}'.format(
+            quote(EmployeeHierarchy._meta.db_table),
+            quote(Employee._meta.db_table),
+            id=quote(Employee._meta.pk.column),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0011_employee_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='manager',
+            field=models.ForeignKey(blank=True, help_text='Employee this employee reports to (optional)', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='reports', to='employees.employee', verbose_name='Manager'),
+        ),
+        migrations.CreateModel(
+            name='EmployeeHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='descendant_links', to='employees.employee')),
+                ('descendant', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='ancestor_links', to='employees.employee')),
+            ],
+            options={
+                'verbose_name': 'Employee Hierarchy Path',
+                'verbose_name_plural': 'Employee Hierarchy Paths',
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='employees_hier_anc_idx'), models.Index(fields=['descendant', 'depth', 'ancestor'], name='employees_hier_desc_idx')],
+            },
+        ),
+        migrations.RunPython(build_hierarchy, migrations.RunPython.noop),
+    ]
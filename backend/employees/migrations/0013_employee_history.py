@@ -0,0 +1,48 @@
+# Generated by Django 4.2.27 on 2026-10-17 21:56
+
+from django.db import migrations, models
+
+
+def record_current_state(apps, schema_editor):
+    # History starts now: each existing employee gets a "created" entry with
+    # its current values, dated when it was created.
+    Employee = apps.get_model('employees', 'Employee')
+    EmployeeHistory = apps.get_model('employees', 'EmployeeHistory')
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        'INSERT INTO {} (employee_id, recorded_at, kind, department, position, '
+        'status, salary) SELECT id, created_at, 1, department, position, status, '
+        'salary FROM {}'.format(
+            quote(EmployeeHistory._meta.db_table),
+            quote(Employee._meta.db_table),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_employee_hierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('employee_id', models.BigIntegerField()),
+                ('recorded_at', models.DateTimeField()),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Created'), (2, 'Updated'), (3, 'Deleted')])),
+                ('department', models.CharField(max_length=100)),
+                ('position', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('on_leave', 'On Leave')], max_length=20)),
+                ('salary', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+            ],
+            options={
+                'verbose_name': 'Employee History Entry',
+                'verbose_name_plural': 'Employee History',
+                'indexes': [models.Index(fields=['employee_id', 'recorded_at'], name='employees_history_emp_idx'), models.Index(fields=['recorded_at', 'employee_id'], name='employees_history_at_idx')],
+            },
+        ),
+        migrations.RunPython(record_current_state, migrations.RunPython.noop),
+    ]
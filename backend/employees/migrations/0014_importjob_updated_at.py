@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0013_employee_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
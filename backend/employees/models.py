@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.core.validators import EmailValidator, MinValueValidator
 
@@ -59,19 +61,267 @@ class Employee(models.Model):
         verbose_name="Status",
         help_text="Current employment status",
     )
+    # Reports of a deleted manager are moved up to the nearest surviving
+    # manager by the service layer (see HierarchyService), not cascaded.
+    manager = models.ForeignKey(
+        "self",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="reports",
+        verbose_name="Manager",
+        help_text="Employee this employee reports to (optional)",
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
 
     class Meta:
         verbose_name = "Employee"
         verbose_name_plural = "Employees"
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
         indexes = [
             models.Index(fields=["email"]),
-            models.Index(fields=["department"]),
             models.Index(fields=["status"]),
-            models.Index(fields=["last_name", "first_name"]),
+            # MAX(updated_at) for conditional GET validators.
+            models.Index(fields=["updated_at"], name="employees_updated_at_idx"),
+            # Backs MIN/MAX(salary) lookups when the summary recomputes a group.
+            models.Index(
+                fields=["department", "status", "salary"],
+                name="employees_dept_status_sal_idx",
+            ),
+            # Backs keyset pagination on (created_at, id).
+            models.Index(
+                fields=["-created_at", "-id"], name="employees_created_id_idx"
+            ),
+            # The list's ?ordering= options, one per index ending in id (see
+            # pagination.INDEXED_ORDERINGS). They also serve lookups on
+            # their leading columns.
+            models.Index(
+                fields=["last_name", "first_name", "id"], name="employees_name_id_idx"
+            ),
+            models.Index(
+                fields=["department", "last_name", "first_name", "id"],
+                name="employees_dept_name_id_idx",
+            ),
+            models.Index(fields=["hire_date", "id"], name="employees_hire_id_idx"),
+            models.Index(fields=["salary", "id"], name="employees_salary_id_idx"),
         ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+
+class EmployeeHierarchy(models.Model):
+    """
+    Closure table of the reporting hierarchy: one row for every employee
+    and each of their managers, direct or indirect, ``depth`` levels up,
+    plus a depth-0 row pairing every employee with itself. Maintained by
+    the service-layer write paths alongside ``Employee.manager``.
+    """
+
+    ancestor = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="descendant_links",
+    )
+    descendant = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="ancestor_links",
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Employee Hierarchy Path"
+        verbose_name_plural = "Employee Hierarchy Paths"
+        indexes = [
+            # A subtree, level by level, in id order within a level.
+            models.Index(
+                fields=["ancestor", "depth", "descendant"],
+                name="employees_hier_anc_idx",
+            ),
+            # A management chain, nearest manager first.
+            models.Index(
+                fields=["descendant", "depth", "ancestor"],
+                name="employees_hier_desc_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
+
+
+class EmployeeHistory(models.Model):
+    """
+    Append-only log of employee states: a row when an employee is created,
+    whenever its department, position, status or salary changes, and when
+    it is deleted, holding the values it had from ``recorded_at`` on. Rows
+    are never updated; the service layer queues them in memory and inserts
+    them in batches (see HistoryService).
+    """
+
+    class Kind(models.IntegerChoices):
+        CREATED = 1, "Created"
+        UPDATED = 2, "Updated"
+        DELETED = 3, "Deleted"
+
+    employee_id = models.BigIntegerField()
+    recorded_at = models.DateTimeField()
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    department = models.CharField(max_length=100)
+    position = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=Employee.Status.choices)
+    salary = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = "Employee History Entry"
+        verbose_name_plural = "Employee History"
+        indexes = [
+            # One employee's states, newest last: the state at a time is
+            # the last entry at or before it.
+            models.Index(
+                fields=["employee_id", "recorded_at"],
+                name="employees_history_emp_idx",
+            ),
+            # Employees changed after a time, as a covering range scan.
+            models.Index(
+                fields=["recorded_at", "employee_id"],
+                name="employees_history_at_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.get_kind_display()} at {self.recorded_at}"
+
+
+class DataGeneration(models.Model):
+    """
+    Monotonic per-dataset counter shared by all worker processes.
+    Every committed write bumps it, so caches keyed on the current value
+    never serve data from before the write.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Data Generation"
+        verbose_name_plural = "Data Generations"
+
+    def __str__(self):
+        return f"{self.name}@{self.value}"
+
+
+class EmployeeSummary(models.Model):
+    """
+    Headcount and salary aggregates per (department, status), maintained
+    incrementally by the service-layer write paths.
+    """
+
+    department = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=Employee.Status.choices)
+    headcount = models.PositiveIntegerField(default=0)
+    salary_count = models.PositiveIntegerField(default=0)
+    salary_total = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    salary_min = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    salary_max = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = "Employee Summary"
+        verbose_name_plural = "Employee Summaries"
+        ordering = ["department", "status"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["department", "status"], name="unique_summary_group"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.department}/{self.status}: {self.headcount}"
+
+
+class ImportJob(models.Model):
+    """
+    Background employee import started from an uploaded file.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_created = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # When the worker last recorded progress; running jobs that stop
+    # updating it are failed by the fail_stale_import_jobs command.
+    updated_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Import Job"
+        verbose_name_plural = "Import Jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+class EmployeeTombstone(models.Model):
+    """
+    Deletion log for delta sync: one row per deleted employee, in deletion
+    order (``id``). Rows older than the sync retention period are pruned.
+    """
+
+    employee_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Employee Tombstone"
+        verbose_name_plural = "Employee Tombstones"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.employee_id} deleted at {self.deleted_at}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored result of a write sent with an ``Idempotency-Key`` header, so a
+    retry with the same key replays it instead of writing again. Keys
+    older than the retention period are pruned.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    request_hash = models.CharField(max_length=64)
+    response = models.JSONField()
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+
+    def __str__(self):
+        return self.key
@@ -1,7 +1,363 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from functools import lru_cache
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Employee
+from .serializers import EmployeeSerializer
 
 
 class EmployeePagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    # Columns rows must carry besides the requested fields.
+    required_columns = ()
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        ``paginate_queryset`` for async views: COUNT and the page slice run
+        through the async ORM.
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = await queryset.acount()
+        self._open_page(paginator, request)
+        self.page.object_list = [row async for row in self.page.object_list]
+        return list(self.page)
+
+    def paginate_counted(self, queryset, count: int, request, view=None):
+        """
+        ``paginate_queryset`` for a queryset whose row count the caller
+        already knows, skipping the COUNT(*).
+        """
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = count
+        self._open_page(paginator, request)
+        return list(self.page)
+
+    def _open_page(self, paginator, request):
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+
+DEFAULT_ORDERING = ("-created_at", "-id")
+
+
+def _flip(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _indexed_orderings():
+    # Every index ending in the primary key is a unique ordering the index
+    # can return rows in, read forwards or backwards.
+    orderings = []
+    for index in Employee._meta.indexes:
+        fields = tuple(index.fields)
+        if fields and fields[-1].lstrip("-") == "id":
+            orderings.append(fields)
+            orderings.append(tuple(_flip(field) for field in fields))
+    return orderings
+
+
+INDEXED_ORDERINGS = _indexed_orderings()
+
+
+def parse_ordering(value: str | None) -> tuple[str, ...]:
+    """
+    Parse ``?ordering=department,-hireDate`` style API field names into a
+    model ordering. Only orderings an index on Employee can return rows in
+    are accepted: the requested fields must lead one of
+    ``INDEXED_ORDERINGS``, which then supplies the remaining columns down
+    to the id tiebreak. Returns ``DEFAULT_ORDERING`` for a missing or empty
+    value; raises ValueError otherwise.
+    """
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    if not names:
+        return DEFAULT_ORDERING
+    sources = _sources()
+    requested = []
+    for name in names:
+        descending = name.startswith("-")
+        source = sources.get(name.lstrip("-"))
+        if source is None:
+            raise ValueError(f"Unknown ordering field: {name.lstrip('-')}")
+        requested.append(f"-{source}" if descending else source)
+    requested = tuple(requested)
+    for ordering in INDEXED_ORDERINGS:
+        if ordering[: len(requested)] == requested:
+            return ordering
+    api_names = {source: name for name, source in sources.items()}
+    supported = "; ".join(
+        ",".join(
+            f"-{api_names[field[1:]]}" if field.startswith("-") else api_names[field]
+            for field in ordering
+        )
+        for ordering in INDEXED_ORDERINGS
+    )
+    raise ValueError(
+        f"Unsupported ordering: {','.join(names)}. "
+        f"Orderings must lead one of: {supported}"
+    )
+
+
+def order_expressions(ordering):
+    """
+    ``order_by`` arguments for a model ordering. NULL sorts as the lowest
+    value either way (first ascending, last descending), which is the
+    order an SQLite index returns it in, made explicit.
+    """
+    expressions = []
+    for field in ordering:
+        name = field.lstrip("-")
+        if not Employee._meta.get_field(name).null:
+            expressions.append(field)
+        elif field.startswith("-"):
+            expressions.append(F(name).desc(nulls_last=True))
+        else:
+            expressions.append(F(name).asc(nulls_first=True))
+    return expressions
+
+
+class EmployeeCursorPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a unique ordering.
+
+    Each page is fetched with a ``WHERE (created_at, id) < (cursor)`` style
+    predicate and ``LIMIT page_size + 1`` instead of ``COUNT(*)`` + ``OFFSET``,
+    so the cost of a page does not depend on how deep into the table it is.
+    The cursor is an opaque base64 token holding the ordering, the boundary
+    row's values in it and the direction of travel. A cursor is only valid
+    with the ordering it was issued for.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=DEFAULT_ORDERING):
+        # Must end in a unique field so every row has a distinct position.
+        self.ordering = tuple(ordering)
+        # Cursors are built from the boundary row's ordering values.
+        self.required_columns = tuple(field.lstrip("-") for field in self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = []
+        for segment in self._page_segments(queryset, request):
+            rows.extend(segment[: self.page_size_value + 1 - len(rows)])
+            if len(rows) > self.page_size_value:
+                break
+        return self._finish_page(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        ``paginate_queryset`` for async views, fetching through the async ORM.
+        """
+        rows = []
+        for segment in self._page_segments(queryset, request):
+            limit = self.page_size_value + 1 - len(rows)
+            rows.extend([row async for row in segment[:limit]])
+            if len(rows) > self.page_size_value:
+                break
+        return self._finish_page(rows)
+
+    def _page_segments(self, queryset, request):
+        """
+        Order and seek ``queryset`` for the requested page. Returns the
+        querysets to read from in turn, until one row more than the page
+        size is found (which tells whether another page follows). That is
+        one queryset unless the cursor sits on a nullable leading column;
+        see ``seek_filters``.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size_value = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        values, reverse = self.decode_cursor(encoded) if encoded else (None, False)
+        self.cursor_values = values
+        self.reverse = reverse
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(_flip(field) for field in ordering)
+
+        queryset = queryset.order_by(*order_expressions(ordering))
+        if values is None:
+            return [queryset]
+        return [queryset.filter(q) for q in seek_filters(ordering, values)]
+
+    def _finish_page(self, rows):
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = self.cursor_values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor_values is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def encode_cursor(self, row, reverse):
+        values = [
+            _field_value(row, field.lstrip("-")) for field in self.ordering
+        ]
+        payload = json.dumps(
+            {"o": self.ordering, "v": values, "r": int(reverse)},
+            separators=(",", ":"),
+        )
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, encoded):
+        try:
+            payload = base64.urlsafe_b64decode(parse.unquote(encoded).encode("ascii"))
+            data = json.loads(payload)
+            raw_values = data["v"]
+            reverse = bool(data.get("r", 0))
+            ordering = tuple(data["o"])
+            if ordering != self.ordering or len(raw_values) != len(ordering):
+                raise ValueError("cursor does not match ordering")
+            values = [
+                _parse_value(field.lstrip("-"), value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+
+def seek_filter(ordering, values):
+    """
+    Build the lexicographic "comes after" predicate for a keyset ordering.
+
+    For ``("-created_at", "-id")`` and values ``(t, i)`` this produces
+    ``created_at <= t AND (created_at < t OR id < i)``, which keeps the
+    leading column as a plain range so the matching index can be used for
+    the seek.
+    """
+    q = Q()
+    for part in seek_filters(ordering, values):
+        q |= part
+    return q
+
+
+def seek_filters(ordering, values):
+    """
+    ``seek_filter`` split into predicates whose rows follow one another in
+    ``ordering``, each a range the index can seek to.
+
+    NULL sorts lowest (see ``order_expressions``). A nullable leading
+    column needs two ranges when the rows after the cursor cross the NULL
+    block: descending from a value, the smaller values and then the NULLs;
+    ascending from NULL, the rest of the NULLs and then every value. One
+    predicate joined with OR would make SQLite scan from the start.
+    """
+    field, *rest = ordering
+    name = field.lstrip("-")
+    descending = field.startswith("-")
+    op = "lt" if descending else "gt"
+    value, *rest_values = values
+    after = seek_filter(rest, rest_values) if rest else None
+
+    if value is None:
+        # Only a nullable column holds None (see _parse_value).
+        nulls = Q(**{f"{name}__isnull": True})
+        if after is not None:
+            nulls &= after
+        if descending:
+            return [nulls]
+        return [nulls, Q(**{f"{name}__isnull": False})]
+
+    if after is None:
+        segment = Q(**{f"{name}__{op}": value})
+    else:
+        inclusive = "lte" if descending else "gte"
+        segment = Q(**{f"{name}__{inclusive}": value}) & (
+            Q(**{f"{name}__{op}": value}) | after
+        )
+    if descending and Employee._meta.get_field(name).null:
+        return [segment, Q(**{f"{name}__isnull": True})]
+    return [segment]
+
+
+@lru_cache(maxsize=None)
+def _sources():
+    # API field name -> model field, e.g. "hireDate" -> "hire_date".
+    declared = EmployeeSerializer().fields
+    return {name: declared[name].source for name in EmployeeSerializer.Meta.fields}
+
+
+def _field_value(row, name):
+    value = row[name] if isinstance(row, dict) else getattr(row, name)
+    if value is None:
+        return None
+    field = Employee._meta.get_field(name)
+    return field.value_to_string(_Holder(name, value))
+
+
+def _parse_value(name, value):
+    field = Employee._meta.get_field(name)
+    if value is None and field.null:
+        return None
+    if not isinstance(value, str):
+        raise ValueError("cursor values must be strings")
+    return field.to_python(value)
+
+
+class _Holder:
+    """Minimal stand-in so ``Field.value_to_string`` works on raw values."""
+
+    def __init__(self, name, value):
+        setattr(self, name, value)
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+# Bucket state per (scope, client): tokens left and when they were counted.
+# ``full_at`` is when the bucket will have refilled completely; rows past it
+# are indistinguishable from a missing row and can be pruned.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    stamp REAL NOT NULL,
+    full_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Refill the bucket for the time elapsed, then take one token. The WHERE
+# clause turns the update into a no-op when fewer than one token is left,
+# so an empty RETURNING result means "deny". One statement, so it is
+# atomic across every process sharing the file.
+_TAKE = """
+INSERT INTO buckets (key, tokens, stamp, full_at)
+VALUES (:key, :capacity - 1, :now, :now + 1 / :rate)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = MIN(:capacity, tokens + (:now - stamp) * :rate) - 1,
+    stamp = :now,
+    full_at = :now
+        + (:capacity - MIN(:capacity, tokens + (:now - stamp) * :rate) + 1) / :rate
+WHERE MIN(:capacity, tokens + (:now - stamp) * :rate) >= 1
+RETURNING tokens
+"""
+
+_PEEK = "SELECT tokens, stamp FROM buckets WHERE key = ?"
+_PRUNE = "DELETE FROM buckets WHERE full_at < ?"
+
+
+class TokenBucketStore:
+    """
+    Token buckets kept in a small SQLite file shared by every worker
+    process on the host.
+
+    Each bucket is one fixed-size row, and taking a token is a single
+    UPSERT, so the cost per request does not depend on the rate or on
+    traffic. The file is separate from the main database so throttling
+    never waits on the application's write lock. Durability does not
+    matter here, so the file runs in WAL mode with ``synchronous=OFF``.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after a fork.
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(_SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def take(self, key: str, capacity: int, rate: float, now: float = None) -> bool:
+        """
+        Take one token from ``key``'s bucket (``capacity`` tokens, refilled
+        at ``rate`` tokens per second). Returns False if it is empty.
+        """
+        now = time.time() if now is None else now
+        connection = self._connection()
+        row = connection.execute(
+            _TAKE, {"key": key, "capacity": capacity, "rate": rate, "now": now}
+        ).fetchone()
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            connection.execute(_PRUNE, (now,))
+        return row is not None
+
+    def wait(self, key: str, rate: float, now: float = None) -> float:
+        """
+        Seconds until ``key``'s bucket holds a whole token again.
+        """
+        now = time.time() if now is None else now
+        row = self._connection().execute(_PEEK, (key,)).fetchone()
+        if row is None:
+            return 0.0
+        tokens, stamp = row
+        available = tokens + (now - stamp) * rate
+        return max(0.0, (1 - available) / rate)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM buckets")
+
+
+_config = getattr(settings, "EMPLOYEE_THROTTLE", {})
+bucket_store = TokenBucketStore(
+    _config.get("PATH", os.path.join(settings.BASE_DIR, "throttle.sqlite3"))
+)
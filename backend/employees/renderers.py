@@ -0,0 +1,46 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+from .metrics import serialization
+
+_json_renderer = JSONRenderer()
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    DRF's JSONRenderer, with rendering counted as serialization time in the
+    request metrics.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serialization():
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+def render_json(data) -> bytes:
+    """
+    Render plain JSON-native data (dicts, lists, str, int, None) to the same
+    bytes DRF's JSONRenderer produces with the project settings: compact
+    separators, raw UTF-8, and U+2028/U+2029 escaped.
+
+    Uses orjson when it is installed and falls back to DRF otherwise.
+    """
+    with serialization():
+        return _render_json(data)
+
+
+def _render_json(data) -> bytes:
+    if orjson is not None:
+        try:
+            body = orjson.dumps(data)
+        except TypeError:
+            # Not JSON-native (or lone surrogates); let DRF's encoder handle it.
+            return _json_renderer.render(data)
+        return body.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return _json_renderer.render(data)
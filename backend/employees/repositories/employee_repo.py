@@ -1,11 +1,24 @@
+from django.db import connections, router
+from django.db.models import Count, F, Max, Q, Subquery
 from django.db.models.sql import Query
-from ..models import Employee
+from django.utils import timezone
+from ..models import DataGeneration, Employee
+from .generation_repo import EMPLOYEES, GenerationRepository
 from django.db.models.query import QuerySet
 from django.conf import settings
 
 # from typing import Dict, List
 
 
+def _watermark_query():
+    # The newest employee by updated_at, one seek on its index, with the
+    # data generation alongside as a scalar subquery.
+    generation = DataGeneration.objects.filter(name=EMPLOYEES).values("value")
+    return Employee.objects.order_by("-updated_at").values(
+        last_modified=F("updated_at"), generation=Subquery(generation)
+    )
+
+
 class EmployeeRepository:
     @staticmethod
     def get_employee_by_id(employee_id):
@@ -17,6 +30,40 @@ class EmployeeRepository:
         except Employee.DoesNotExist:
             return None
 
+    @staticmethod
+    async def aget_employee_by_id(employee_id):
+        """
+        Get employee by id from database, for async callers.
+        """
+        try:
+            return await Employee.objects.aget(id=employee_id)
+        except Employee.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_watermark() -> dict:
+        """
+        ``{"generation", "last_modified"}``: the data generation, which
+        every service write bumps, and the newest updated_at, in one query.
+        """
+        watermark = _watermark_query().first()
+        if watermark is None:
+            return {"generation": GenerationRepository.current(), "last_modified": None}
+        watermark["generation"] = watermark["generation"] or 0
+        return watermark
+
+    @staticmethod
+    async def aget_watermark() -> dict:
+        """
+        ``get_watermark`` for async callers.
+        """
+        watermark = await _watermark_query().afirst()
+        if watermark is None:
+            generation = await GenerationRepository.acurrent()
+            return {"generation": generation, "last_modified": None}
+        watermark["generation"] = watermark["generation"] or 0
+        return watermark
+
     @staticmethod
     def create_employee(employee_data: dict) -> Employee:
         """
@@ -26,6 +73,44 @@ class EmployeeRepository:
         employee = Employee.objects.create(**employee_data)
         return employee
 
+    @staticmethod
+    def insert_employee(employee: Employee) -> bool:
+        """
+        Inserts ``employee`` unless another employee has its email, in one
+        ``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id``: the
+        unique constraint decides, so there is no separate lookup for
+        concurrent writers to race past. Sets the instance's id and returns
+        True, or returns False without writing.
+        """
+        connection = connections[router.db_for_write(Employee)]
+        quote = connection.ops.quote_name
+        fields = [
+            field for field in Employee._meta.concrete_fields if not field.primary_key
+        ]
+        values = [
+            field.get_db_prep_save(field.pre_save(employee, True), connection)
+            for field in fields
+        ]
+        sql = (
+            "INSERT INTO {} ({}) VALUES ({}) "
+            "ON CONFLICT ({}) DO NOTHING RETURNING {}"
+        ).format(
+            quote(Employee._meta.db_table),
+            ", ".join(quote(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+            quote(Employee._meta.get_field("email").column),
+            quote(Employee._meta.pk.column),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, values)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        employee.pk = row[0]
+        employee._state.adding = False
+        employee._state.db = connection.alias
+        return True
+
     @staticmethod
     def get_employee_by_email(email: str) -> Employee | None:
         """
@@ -36,6 +121,157 @@ class EmployeeRepository:
         except Employee.DoesNotExist:
             return None
 
+    @staticmethod
+    def get_employees_by_emails(emails) -> dict[str, Employee]:
+        """
+        Returns {email: Employee} for every existing employee in ``emails``,
+        using a single IN query.
+        """
+        if not emails:
+            return {}
+        return Employee.objects.in_bulk(list(emails), field_name="email")
+
+    @staticmethod
+    def get_employees_by_ids(ids) -> dict[int, Employee]:
+        """
+        Returns {id: Employee} for every existing employee in ``ids``,
+        using a single IN query.
+        """
+        if not ids:
+            return {}
+        return Employee.objects.in_bulk(list(ids))
+
+    @staticmethod
+    def delete_employees_by_ids(ids):
+        """
+        Deletes every employee in ``ids`` with a single DELETE.
+        """
+        return Employee.objects.filter(pk__in=ids).delete()
+
+    @staticmethod
+    def bulk_create_employees(employees: list[Employee], batch_size: int):
+        """
+        Inserts new employees in batches of ``batch_size``.
+        """
+        return Employee.objects.bulk_create(employees, batch_size=batch_size)
+
+    @staticmethod
+    def insert_rows(fields: list[str], rows: list[tuple]):
+        """
+        Inserts rows of database-ready values for ``fields`` with one
+        executemany, stamping created_at and updated_at. No model instances
+        are built, so nothing is validated or converted: for generated data.
+        """
+        connection = connections[router.db_for_write(Employee)]
+        quote = connection.ops.quote_name
+        columns = [Employee._meta.get_field(name).column for name in fields]
+        columns += ["created_at", "updated_at"]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(Employee._meta.db_table),
+            ", ".join(quote(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(*row, now, now) for row in rows])
+
+    @staticmethod
+    def drop_indexes():
+        """
+        Drops the indexes declared in ``Employee.Meta.indexes``. Restore
+        them with ``create_missing_indexes``.
+        """
+        connection = connections[router.db_for_write(Employee)]
+        with connection.schema_editor() as editor:
+            for index in Employee._meta.indexes:
+                editor.remove_index(Employee, index)
+
+    @staticmethod
+    def create_missing_indexes() -> list[str]:
+        """
+        Creates any index in ``Employee.Meta.indexes`` that the table lacks.
+        Returns the names of the indexes created.
+        """
+        connection = connections[router.db_for_write(Employee)]
+        with connection.cursor() as cursor:
+            existing = connection.introspection.get_constraints(
+                cursor, Employee._meta.db_table
+            )
+        missing = [
+            index for index in Employee._meta.indexes if index.name not in existing
+        ]
+        with connection.schema_editor() as editor:
+            for index in missing:
+                editor.add_index(Employee, index)
+        return [index.name for index in missing]
+
+    @staticmethod
+    def get_max_id() -> int:
+        """
+        Highest employee id, or 0 for an empty table.
+        """
+        return Employee.objects.aggregate(last=Max("id"))["last"] or 0
+
+    @staticmethod
+    def count_by(field: str) -> dict:
+        """
+        Returns {value: number of employees} for every distinct value of
+        ``field``, with one GROUP BY.
+        """
+        return dict(
+            Employee.objects.values(field)
+            .annotate(n=Count("id"))
+            .order_by()
+            .values_list(field, "n")
+        )
+
+    @staticmethod
+    def get_ids_after(last_id: int) -> list[int]:
+        """
+        Ids of every employee with a higher id than ``last_id``, ascending.
+        """
+        return list(
+            Employee.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    @staticmethod
+    def get_latest_email_like(prefix: str, suffix: str) -> str | None:
+        """
+        Email of the newest employee whose email starts with ``prefix`` and
+        ends with ``suffix``.
+        """
+        return (
+            Employee.objects.filter(email__startswith=prefix, email__endswith=suffix)
+            .order_by("-id")
+            .values_list("email", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def bulk_update_employees(employees: list[Employee], fields, batch_size: int):
+        """
+        Writes ``fields`` of existing employees in batches of ``batch_size``.
+        """
+        return Employee.objects.bulk_update(employees, fields, batch_size=batch_size)
+
+    @staticmethod
+    def get_changed_rows(after, fields: list[str], limit: int) -> list[dict]:
+        """
+        Up to ``limit`` employees whose ``(updated_at, id)`` comes after
+        ``after`` (None for all), least recently changed first, as dicts of
+        ``fields``. Seeks on the updated_at index.
+        """
+        queryset = Employee.objects.order_by("updated_at", "id")
+        if after is not None:
+            updated_at, employee_id = after
+            queryset = queryset.filter(
+                Q(updated_at__gte=updated_at)
+                & (Q(updated_at__gt=updated_at) | Q(id__gt=employee_id))
+            )
+        return list(queryset.values(*fields)[:limit])
+
     @staticmethod
     def get_all_employees() -> list[Employee]:
         """
@@ -43,6 +279,53 @@ class EmployeeRepository:
         """
         return list(Employee.objects.all())
 
+    @staticmethod
+    def iter_employee_rows(fields: list[str], chunk_size: int = 2000):
+        """
+        Streams ``fields`` of every employee as tuples, fetching
+        ``chunk_size`` rows at a time instead of loading the whole table.
+        """
+        return (
+            Employee.objects.order_by("id")
+            .values_list(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
+
+    @staticmethod
+    def iter_employee_chunks(fields: list[str], chunk_size: int = 5000):
+        """
+        Yields every employee as lists of up to ``chunk_size`` dicts of
+        ``fields``, in id order, one keyset query (id > last seen) per chunk.
+        """
+        rows = Employee.objects.order_by("id").values(*dict.fromkeys(["id", *fields]))
+        last_id = 0
+        while True:
+            chunk = list(rows.filter(id__gt=last_id)[:chunk_size])
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1]["id"]
+
+    @staticmethod
+    async def aiter_employee_rows(fields: list[str], chunk_size: int = 2000):
+        """
+        Async ``iter_employee_rows``: an async iterator of tuples.
+
+        Reads keyset chunks (id > last seen) rather than using
+        ``aiterator()``, which on Django 4.2 opens the values_list cursor
+        from the event loop. No cursor stays open between chunks.
+        """
+        rows = Employee.objects.order_by("id").values_list("id", *fields)
+        last_id = 0
+        while True:
+            chunk = [row async for row in rows.filter(id__gt=last_id)[:chunk_size]]
+            for row in chunk:
+                yield row[1:]
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1][0]
+
     @staticmethod
     def delete_employee(employee):
         """
@@ -0,0 +1,56 @@
+from django.db import connections, router
+
+from ..models import DataGeneration
+
+EMPLOYEES = "employees"
+
+
+class GenerationRepository:
+    @staticmethod
+    def current(name: str = EMPLOYEES) -> int:
+        """
+        Returns the current generation of a dataset (0 if never written).
+        """
+        value = (
+            DataGeneration.objects.filter(name=name)
+            .values_list("value", flat=True)
+            .first()
+        )
+        return value or 0
+
+    @staticmethod
+    async def acurrent(name: str = EMPLOYEES) -> int:
+        """
+        ``current`` for async callers.
+        """
+        value = await (
+            DataGeneration.objects.filter(name=name)
+            .values_list("value", flat=True)
+            .afirst()
+        )
+        return value or 0
+
+    @staticmethod
+    def bump(name: str = EMPLOYEES) -> int:
+        """
+        Atomically increments the generation of a dataset and returns the
+        new value, with one ``UPDATE ... RETURNING``.
+        """
+        connection = connections[router.db_for_write(DataGeneration)]
+        quote = connection.ops.quote_name
+        sql = (
+            "UPDATE {table} SET {value} = {value} + 1 "
+            "WHERE {name} = %s RETURNING {value}"
+        ).format(
+            table=quote(DataGeneration._meta.db_table),
+            value=quote("value"),
+            name=quote("name"),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [name])
+            row = cursor.fetchone()
+            if row is None:
+                DataGeneration.objects.get_or_create(name=name)
+                cursor.execute(sql, [name])
+                row = cursor.fetchone()
+        return row[0]
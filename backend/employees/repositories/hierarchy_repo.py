@@ -0,0 +1,250 @@
+from django.db import connections, router
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Employee, EmployeeHierarchy
+
+
+def _sql(template: str, write: bool = True) -> tuple:
+    """
+    Format ``template`` with quoted table names; returns it with the
+    connection to run it on: the write alias, or the read alias for reads.
+    """
+    route = router.db_for_write if write else router.db_for_read
+    connection = connections[route(EmployeeHierarchy)]
+    quote = connection.ops.quote_name
+    return (
+        template.format(
+            hierarchy=quote(EmployeeHierarchy._meta.db_table),
+            employee=quote(Employee._meta.db_table),
+        ),
+        connection,
+    )
+
+
+# Every path implied by manager_id, computed from scratch.
+_PATHS = (
+    "WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS ("
+    "SELECT id, id, 0 FROM {employee} "
+    "UNION ALL "
+    "SELECT paths.ancestor_id, report.id, paths.depth + 1 "
+    "FROM paths JOIN {employee} AS report "
+    "ON report.manager_id = paths.descendant_id"
+    ") "
+)
+
+
+def _placeholders(ids) -> str:
+    return ", ".join(["%s"] * len(ids))
+
+
+class HierarchyRepository:
+    @staticmethod
+    def get_ancestor_paths(ids) -> dict[int, list[tuple[int, int]]]:
+        """
+        Returns {id: [(ancestor, depth), ...]} for every employee in
+        ``ids`` that has closure rows, including its depth-0 row, using a
+        single IN query.
+        """
+        paths = {}
+        rows = EmployeeHierarchy.objects.filter(
+            descendant_id__in=list(ids)
+        ).values_list("descendant_id", "ancestor_id", "depth")
+        for descendant, ancestor, depth in rows:
+            paths.setdefault(descendant, []).append((ancestor, depth))
+        return paths
+
+    @staticmethod
+    def get_existing_paths(pairs) -> set[tuple[int, int]]:
+        """
+        Returns the ``(ancestor, descendant)`` pairs in ``pairs`` that have
+        a closure row.
+        """
+        if not pairs:
+            return set()
+        condition = Q()
+        for ancestor, descendant in pairs:
+            condition |= Q(ancestor_id=ancestor, descendant_id=descendant)
+        return set(
+            EmployeeHierarchy.objects.filter(condition).values_list(
+                "ancestor_id", "descendant_id"
+            )
+        )
+
+    @staticmethod
+    def insert_paths(rows: list[tuple[int, int, int]]):
+        """
+        Inserts ``(ancestor, descendant, depth)`` rows with one executemany.
+        """
+        sql, connection = _sql(
+            "INSERT INTO {hierarchy} (ancestor_id, descendant_id, depth) "
+            "VALUES (%s, %s, %s)"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    @staticmethod
+    def detach_subtree(employee_id: int) -> int:
+        """
+        Deletes the paths from anything above ``employee_id`` to it and its
+        subtree, leaving the subtree's internal paths. Returns the count.
+        """
+        subtree = EmployeeHierarchy.objects.filter(ancestor_id=employee_id).values(
+            "descendant_id"
+        )
+        deleted, _ = (
+            EmployeeHierarchy.objects.filter(descendant_id__in=subtree)
+            .exclude(ancestor_id__in=subtree)
+            .delete()
+        )
+        return deleted
+
+    @staticmethod
+    def attach_subtree(employee_id: int, manager_id: int):
+        """
+        Adds paths from ``manager_id`` and everything above it to
+        ``employee_id`` and its subtree, in one INSERT ... SELECT over the
+        cross product of the two path sets.
+        """
+        sql, connection = _sql(
+            "INSERT INTO {hierarchy} (ancestor_id, descendant_id, depth) "
+            "SELECT up.ancestor_id, down.descendant_id, up.depth + down.depth + 1 "
+            "FROM {hierarchy} AS up, {hierarchy} AS down "
+            "WHERE up.descendant_id = %s AND down.ancestor_id = %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [manager_id, employee_id])
+
+    @staticmethod
+    def reassign_reports(deleted_ids: list[int]) -> int:
+        """
+        Points the surviving reports of deleted employees at their nearest
+        manager that is not being deleted (or at nobody), read from the
+        deleted managers' closure rows. Returns the employees moved.
+        """
+        marks = _placeholders(deleted_ids)
+        sql, connection = _sql(
+            "UPDATE {employee} SET updated_at = %s, manager_id = ("
+            "SELECT up.ancestor_id FROM {hierarchy} AS up "
+            "WHERE up.descendant_id = {employee}.manager_id "
+            f"AND up.depth > 0 AND up.ancestor_id NOT IN ({marks}) "
+            "ORDER BY up.depth LIMIT 1"
+            f") WHERE manager_id IN ({marks})"
+        )
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [now, *deleted_ids, *deleted_ids])
+            return cursor.rowcount
+
+    @staticmethod
+    def close_gaps(deleted_ids: list[int]):
+        """
+        Shortens every surviving path that passes through deleted
+        employees by the number of them it passes through. In a tree those
+        are the deleted ancestors of the path's descendant that sit closer
+        to it than the path's ancestor does.
+        """
+        marks = _placeholders(deleted_ids)
+        sql, connection = _sql(
+            "UPDATE {hierarchy} SET depth = depth - ("
+            "SELECT COUNT(*) FROM {hierarchy} AS mid "
+            "WHERE mid.descendant_id = {hierarchy}.descendant_id "
+            "AND mid.depth > 0 AND mid.depth < {hierarchy}.depth "
+            f"AND mid.ancestor_id IN ({marks})"
+            ") WHERE descendant_id IN ("
+            "SELECT descendant_id FROM {hierarchy} "
+            f"WHERE ancestor_id IN ({marks}) AND depth > 0"
+            f") AND ancestor_id NOT IN ({marks}) AND depth > 1"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*deleted_ids] * 3)
+
+    @staticmethod
+    def delete_paths(deleted_ids: list[int]) -> int:
+        """
+        Deletes every path that starts or ends at a deleted employee.
+        """
+        deleted, _ = EmployeeHierarchy.objects.filter(
+            Q(ancestor_id__in=deleted_ids) | Q(descendant_id__in=deleted_ids)
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def get_report_counts(employee_id: int) -> dict | None:
+        """
+        Returns ``{"direct": n, "total": n}`` for ``employee_id`` from one
+        aggregate over its closure rows, or None if it does not exist.
+        Raw SQL: the scan is a covering index range, and building the
+        ORM aggregate costs more than running it for most subtrees.
+        """
+        sql, connection = _sql(
+            "SELECT COUNT(*) FILTER (WHERE depth = 0), "
+            "COUNT(*) FILTER (WHERE depth = 1), COUNT(*) "
+            "FROM {hierarchy} WHERE ancestor_id = %s",
+            write=False,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [employee_id])
+            exists, direct, rows = cursor.fetchone()
+        if not exists:
+            return None
+        return {"direct": direct, "total": rows - 1}
+
+    @staticmethod
+    def get_subtree(employee_id: int, max_depth: int | None = None):
+        """
+        Returns the employees below ``employee_id`` (down to ``max_depth``
+        levels if given), level by level and in id order within a level:
+        the order the (ancestor, depth, descendant) index holds them in.
+        """
+        links = {
+            "ancestor_links__ancestor_id": employee_id,
+            "ancestor_links__depth__gt": 0,
+        }
+        if max_depth is not None:
+            links["ancestor_links__depth__lte"] = max_depth
+        return Employee.objects.filter(**links).order_by(
+            "ancestor_links__depth", "ancestor_links__descendant_id"
+        )
+
+    @staticmethod
+    def get_chain(employee_id: int):
+        """
+        Returns ``employee_id`` followed by its managers, nearest first;
+        empty if the employee does not exist.
+        """
+        return Employee.objects.filter(
+            descendant_links__descendant_id=employee_id
+        ).order_by("descendant_links__depth")
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Replaces the closure table with the paths computed from
+        ``manager_id`` by a recursive query. Returns the rows written.
+        """
+        EmployeeHierarchy.objects.all().delete()
+        sql, connection = _sql(
+            "INSERT INTO {hierarchy} (ancestor_id, descendant_id, depth) "
+            + _PATHS
+            + "SELECT ancestor_id, descendant_id, depth FROM paths"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.rowcount
+
+    @staticmethod
+    def count_drift() -> tuple[int, int]:
+        """
+        Compares the closure table with the paths computed from
+        ``manager_id``. Returns ``(missing, extra)`` row counts.
+        """
+        stored = "SELECT ancestor_id, descendant_id, depth FROM {hierarchy}"
+        sql, connection = _sql(
+            _PATHS + "SELECT "
+            f"(SELECT COUNT(*) FROM (SELECT * FROM paths EXCEPT {stored})), "
+            f"(SELECT COUNT(*) FROM ({stored} EXCEPT SELECT * FROM paths))"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchone()
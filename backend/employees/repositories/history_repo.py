@@ -0,0 +1,174 @@
+from django.db import connections, router
+
+from ..models import Employee, EmployeeHistory, EmployeeSummary
+
+HISTORY_FIELDS = [
+    "employee_id",
+    "recorded_at",
+    "kind",
+    "department",
+    "position",
+    "status",
+    "salary",
+]
+
+
+def _sql(template: str, write: bool = True) -> tuple:
+    """
+    Format ``template`` with quoted table names; returns it with the
+    connection to run it on: the write alias, or the read alias for reads.
+    """
+    route = router.db_for_write if write else router.db_for_read
+    connection = connections[route(EmployeeHistory)]
+    quote = connection.ops.quote_name
+    return (
+        template.format(
+            history=quote(EmployeeHistory._meta.db_table),
+            employee=quote(Employee._meta.db_table),
+            summary=quote(EmployeeSummary._meta.db_table),
+        ),
+        connection,
+    )
+
+
+class HistoryRepository:
+    @staticmethod
+    def insert(rows: list[tuple]):
+        """
+        Appends history rows (tuples in ``HISTORY_FIELDS`` order) with one
+        executemany.
+        """
+        sql, connection = _sql(
+            "INSERT INTO {history} (%s) VALUES (%s)"
+            % (", ".join(HISTORY_FIELDS), ", ".join(["%s"] * len(HISTORY_FIELDS)))
+        )
+        adapt = connection.ops.adapt_datetimefield_value
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(row[0], adapt(row[1]), *row[2:]) for row in rows])
+
+    @staticmethod
+    def record_missing() -> int:
+        """
+        Appends a "created" row, dated when the employee was created, for
+        every employee without history (rows loaded around the service
+        layer). Returns the rows written.
+        """
+        sql, connection = _sql(
+            "INSERT INTO {history} (%s) " % ", ".join(HISTORY_FIELDS)
+            + "SELECT id, created_at, %s, department, position, status, salary "
+            "FROM {employee} WHERE NOT EXISTS ("
+            "SELECT 1 FROM {history} WHERE employee_id = {employee}.id)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [EmployeeHistory.Kind.CREATED])
+            return cursor.rowcount
+
+    @staticmethod
+    def get_entries(employee_id: int):
+        """
+        Returns an employee's history rows, oldest first.
+        """
+        return (
+            EmployeeHistory.objects.filter(employee_id=employee_id)
+            .order_by("recorded_at", "id")
+            .values(*HISTORY_FIELDS)
+        )
+
+    @staticmethod
+    def get_entry_at(employee_id: int, at) -> dict | None:
+        """
+        Returns the last history row of an employee recorded at or before
+        ``at`` (one seek on the (employee_id, recorded_at) index), or None.
+        """
+        return (
+            EmployeeHistory.objects.filter(employee_id=employee_id, recorded_at__lte=at)
+            .order_by("-recorded_at", "-id")
+            .values(*HISTORY_FIELDS)
+            .first()
+        )
+
+    @staticmethod
+    def get_span() -> tuple:
+        """
+        Returns the first and last ``recorded_at`` (None, None if empty),
+        one seek at each end of the recorded_at index.
+        """
+        sql, connection = _sql(
+            "SELECT (SELECT MIN(recorded_at) FROM {history}), "
+            "(SELECT MAX(recorded_at) FROM {history})",
+            write=False,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            first, last = cursor.fetchone()
+        convert = connection.ops.convert_datetimefield_value
+        return (
+            convert(first, None, connection),
+            convert(last, None, connection),
+        )
+
+    @staticmethod
+    def get_headcount_back_from(at) -> list[tuple[str, str, int]]:
+        """
+        Returns ``(department, status, headcount)`` for every non-empty
+        group as of ``at``, in one statement (so one snapshot).
+
+        Works back from the present: the summary table's current
+        headcount, minus the current groups of the employees with history
+        after ``at``, plus the groups those employees were in at ``at``.
+        The cost follows the number of employees changed since ``at``: a
+        range scan of the recorded_at index, then one seek per employee on
+        the employee_id index and one primary-key lookup each.
+        """
+        sql, connection = _sql(
+            # Without INDEXED BY, DISTINCT makes SQLite walk the whole
+            # employee_id index in order instead of the recorded_at range.
+            "WITH changed (employee_id) AS ("
+            "SELECT DISTINCT employee_id FROM {history} "
+            "INDEXED BY employees_history_at_idx WHERE recorded_at > %s"
+            ") "
+            "SELECT department, status, SUM(n) FROM ("
+            "SELECT department, status, headcount AS n FROM {summary} "
+            "UNION ALL "
+            "SELECT department, status, -COUNT(*) FROM {employee} "
+            "WHERE id IN (SELECT employee_id FROM changed) "
+            "GROUP BY department, status "
+            "UNION ALL "
+            "SELECT past.department, past.status, COUNT(*) "
+            "FROM changed JOIN {history} AS past ON past.id = ("
+            "SELECT entry.id FROM {history} AS entry "
+            "WHERE entry.employee_id = changed.employee_id "
+            "AND entry.recorded_at <= %s "
+            "ORDER BY entry.recorded_at DESC, entry.id DESC LIMIT 1"
+            ") WHERE past.kind != %s "
+            "GROUP BY past.department, past.status"
+            ") GROUP BY department, status HAVING SUM(n) > 0 "
+            "ORDER BY department, status",
+            write=False,
+        )
+        at = connection.ops.adapt_datetimefield_value(at)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [at, at, EmployeeHistory.Kind.DELETED])
+            return cursor.fetchall()
+
+    @staticmethod
+    def get_headcount_replayed(at) -> list[tuple[str, str, int]]:
+        """
+        ``get_headcount_back_from`` computed forward instead: the latest
+        row per employee up to ``at``, in one pass over the employee_id
+        index. The cost follows the rows recorded before ``at``. (SQLite
+        takes the bare columns from the row holding MAX(recorded_at); ids
+        follow flush order, not write order, so MAX(id) would not do.)
+        """
+        sql, connection = _sql(
+            "SELECT department, status, COUNT(*) FROM ("
+            "SELECT kind, department, status, MAX(recorded_at) "
+            "FROM {history} WHERE recorded_at <= %s GROUP BY employee_id"
+            ") WHERE kind != %s GROUP BY department, status "
+            "ORDER BY department, status",
+            write=False,
+        )
+        at = connection.ops.adapt_datetimefield_value(at)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [at, EmployeeHistory.Kind.DELETED])
+            return cursor.fetchall()
@@ -0,0 +1,38 @@
+from ..models import IdempotencyKey
+
+
+class IdempotencyRepository:
+    @staticmethod
+    def get(key: str) -> IdempotencyKey | None:
+        """
+        Returns the stored result for ``key``, or None.
+        """
+        return IdempotencyKey.objects.filter(key=key).first()
+
+    @staticmethod
+    def save(key: str, request_hash: str, response: dict, created_at) -> None:
+        """
+        Stores the result for ``key`` with one upsert, replacing an expired
+        entry for the same key.
+        """
+        IdempotencyKey.objects.bulk_create(
+            [
+                IdempotencyKey(
+                    key=key,
+                    request_hash=request_hash,
+                    response=response,
+                    created_at=created_at,
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["request_hash", "response", "created_at"],
+        )
+
+    @staticmethod
+    def prune(before) -> int:
+        """
+        Deletes keys stored before ``before``. Returns the count.
+        """
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=before).delete()
+        return deleted
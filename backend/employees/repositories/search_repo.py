@@ -0,0 +1,212 @@
+import re
+
+from django.db import connection, connections, router
+from django.db.models import Q
+
+from ..models import Employee
+
+FTS_TABLE = "employees_employee_fts"
+EMPLOYEE_TABLE = Employee._meta.db_table
+
+# Indexed columns, in FTS column order.
+SEARCH_FIELDS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "department",
+    "position",
+]
+
+# bm25() weights per column: name hits rank above email, department and
+# position hits, which rank above phone number fragments.
+RANK_WEIGHTS = [10.0, 10.0, 5.0, 1.0, 2.0, 2.0]
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _columns(prefix=""):
+    return ", ".join(f"{prefix}{field}" for field in SEARCH_FIELDS)
+
+
+# External-content FTS5 table: the index stores only the inverted lists and
+# reads column values back from employees_employee, so rows are not stored
+# twice. The triggers keep it in sync with every write to the table,
+# including bulk_create/bulk_update and raw SQL imports. Migration 0004
+# holds a frozen copy; run rebuild_search_index after changing this one.
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns()},
+        content='{EMPLOYEE_TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {EMPLOYEE_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns()})
+        VALUES (new.id, {_columns("new.")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {EMPLOYEE_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns()})
+        VALUES ('delete', old.id, {_columns("old.")});
+    END
+    """,
+    # Only reindex when a searchable column changes, so salary/status edits
+    # do not touch the index.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF {_columns()} ON {EMPLOYEE_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns()})
+        VALUES ('delete', old.id, {_columns("old.")});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns()})
+        VALUES (new.id, {_columns("new.")});
+    END
+    """,
+]
+
+UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def build_match_expression(term: str) -> str | None:
+    """
+    Turn free text into an FTS5 query: every word becomes a quoted prefix
+    term and all terms must match, e.g. ``"jo sm"`` -> ``"jo"* "sm"*``.
+    Returns None if the text has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class RankedSearchResults:
+    """
+    Lazy, sliceable result set for a full-text match, ordered by relevance.
+
+    Quacks enough like a QuerySet (``count()``, slicing, ``ordered``) for
+    Django's Paginator, so it plugs straight into ``EmployeePagination``.
+    Only the ids of the requested slice are ranked and fetched.
+    """
+
+    ordered = True
+
+    def __init__(self, match: str, using=None, fields=None):
+        self.match = match
+        self.using = using or router.db_for_read(Employee)
+        self.fields = fields
+        self._count = None
+
+    @property
+    def connection(self):
+        # Looked up on use: connections are per thread, and async views
+        # build the results on the event loop but page them in a worker.
+        return connections[self.using]
+
+    def values(self, *fields):
+        """Like ``QuerySet.values()``: slices yield dicts of ``fields``."""
+        return RankedSearchResults(self.match, self.using, fields or None)
+
+    def count(self) -> int:
+        if self._count is None:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                    [self.match],
+                )
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def ids(self, offset: int, limit: int) -> list[int]:
+        weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid DESC "
+                "LIMIT %s OFFSET %s",
+                [self.match, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key : key + 1][0]
+        start = key.start or 0
+        stop = key.stop if key.stop is not None else self.count()
+        if stop <= start:
+            return []
+        ids = self.ids(start, stop - start)
+        queryset = Employee.objects.using(self.using)
+        if self.fields is None:
+            employees = queryset.in_bulk(ids)
+        else:
+            rows = queryset.filter(id__in=ids).values("id", *self.fields)
+            employees = {row["id"]: row for row in rows}
+        return [employees[pk] for pk in ids if pk in employees]
+
+
+class EmployeeSearchRepository:
+    @staticmethod
+    def is_supported() -> bool:
+        return connection.vendor == "sqlite"
+
+    @staticmethod
+    def install(schema_editor=None):
+        """
+        Create the FTS5 table and sync triggers if they are missing.
+        Safe to re-run, e.g. after a migration rebuilt employees_employee
+        (SQLite table rebuilds drop triggers).
+        """
+        conn = schema_editor.connection if schema_editor else connection
+        with conn.cursor() as cursor:
+            for statement in INSTALL_SQL:
+                cursor.execute(statement)
+
+    @staticmethod
+    def uninstall(schema_editor=None):
+        conn = schema_editor.connection if schema_editor else connection
+        with conn.cursor() as cursor:
+            for statement in UNINSTALL_SQL:
+                cursor.execute(statement)
+
+    @staticmethod
+    def rebuild(schema_editor=None):
+        """
+        Re-read every employee row into the index.
+        """
+        conn = schema_editor.connection if schema_editor else connection
+        with conn.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    @staticmethod
+    def search(term: str):
+        """
+        Returns employees matching every word of ``term`` as a prefix in
+        any searchable column, best matches first.
+        """
+        if EmployeeSearchRepository.is_supported():
+            match = build_match_expression(term)
+            if match is None:
+                return Employee.objects.none()
+            return RankedSearchResults(match)
+
+        # Other backends have no FTS5; fall back to the plain scan.
+        query = Q()
+        for field in SEARCH_FIELDS:
+            query |= Q(**{f"{field}__icontains": term})
+        return Employee.objects.filter(query)
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    Max,
+    Min,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from ..models import Employee, EmployeeSummary
+
+
+class SummaryRepository:
+    @staticmethod
+    def get_rows():
+        """
+        Returns every non-empty (department, status) summary row.
+        """
+        return EmployeeSummary.objects.filter(headcount__gt=0).values(
+            "department",
+            "status",
+            "headcount",
+            "salary_count",
+            "salary_total",
+            "salary_min",
+            "salary_max",
+        )
+
+    @staticmethod
+    def apply_deltas(deltas: dict):
+        """
+        Apply per-group deltas with one UPDATE per touched group.
+
+        ``deltas`` maps (department, status) to a dict with ``headcount``,
+        ``salary_count`` and ``salary_total`` deltas, the ``added_min`` /
+        ``added_max`` of salaries that entered the group and the
+        ``removed_min`` / ``removed_max`` of salaries that left it.
+
+        Counts and totals are F() increments. Min/max fold in added salaries
+        with LEAST/GREATEST; only when a removed salary was the current
+        min/max is it re-read from the employee table, which the
+        (department, status, salary) index answers with a single seek.
+        """
+        if not deltas:
+            return
+        EmployeeSummary.objects.bulk_create(
+            [
+                EmployeeSummary(department=department, status=status)
+                for department, status in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        for (department, status), delta in deltas.items():
+            salaries = Employee.objects.filter(
+                department=department, status=status, salary__isnull=False
+            )
+            recomputed_min = Subquery(salaries.order_by("salary").values("salary")[:1])
+            recomputed_max = Subquery(salaries.order_by("-salary").values("salary")[:1])
+
+            salary_min = F("salary_min")
+            if delta["added_min"] is not None:
+                salary_min = Least(
+                    Coalesce(F("salary_min"), Value(delta["added_min"])),
+                    Value(delta["added_min"]),
+                )
+            if delta["removed_min"] is not None:
+                salary_min = Case(
+                    When(salary_min__gte=delta["removed_min"], then=recomputed_min),
+                    default=salary_min,
+                )
+
+            salary_max = F("salary_max")
+            if delta["added_max"] is not None:
+                salary_max = Greatest(
+                    Coalesce(F("salary_max"), Value(delta["added_max"])),
+                    Value(delta["added_max"]),
+                )
+            if delta["removed_max"] is not None:
+                salary_max = Case(
+                    When(salary_max__lte=delta["removed_max"], then=recomputed_max),
+                    default=salary_max,
+                )
+
+            EmployeeSummary.objects.filter(department=department, status=status).update(
+                headcount=F("headcount") + delta["headcount"],
+                salary_count=F("salary_count") + delta["salary_count"],
+                salary_total=F("salary_total") + delta["salary_total"],
+                salary_min=salary_min,
+                salary_max=salary_max,
+            )
+
+    @staticmethod
+    def compute_from_employees():
+        """
+        Aggregate the summary straight from the employee table (GROUP BY).
+        """
+        return (
+            Employee.objects.order_by()
+            .values("department", "status")
+            .annotate(
+                headcount=Count("id"),
+                salary_count=Count("salary"),
+                salary_total=Coalesce(
+                    Sum("salary"), Value(Decimal("0")), output_field=DecimalField()
+                ),
+                salary_min=Min("salary"),
+                salary_max=Max("salary"),
+            )
+        )
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Replace the summary table with a fresh GROUP BY over employees.
+        Returns the number of groups written.
+        """
+        rows = list(SummaryRepository.compute_from_employees())
+        EmployeeSummary.objects.all().delete()
+        EmployeeSummary.objects.bulk_create(EmployeeSummary(**row) for row in rows)
+        return len(rows)
@@ -0,0 +1,86 @@
+from django.db import connections, router
+
+from ..models import EmployeeTombstone
+
+
+class TombstoneRepository:
+    @staticmethod
+    def record(employee_ids: list[int], deleted_at) -> None:
+        """
+        Appends one tombstone per deleted employee id.
+        """
+        EmployeeTombstone.objects.bulk_create(
+            [
+                EmployeeTombstone(employee_id=employee_id, deleted_at=deleted_at)
+                for employee_id in employee_ids
+            ]
+        )
+
+    @staticmethod
+    def get_after(seq: int, limit: int) -> list[tuple[int, int]]:
+        """
+        Returns up to ``limit`` ``(seq, employee_id)`` pairs logged after
+        ``seq``, oldest first.
+        """
+        return list(
+            EmployeeTombstone.objects.filter(id__gt=seq)
+            .order_by("id")
+            .values_list("id", "employee_id")[:limit]
+        )
+
+    @staticmethod
+    def get_first_seq() -> int | None:
+        """
+        Returns the oldest retained sequence number (None if the log is empty).
+        """
+        return (
+            EmployeeTombstone.objects.order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def get_last_seq() -> int:
+        """
+        Returns the newest sequence number (0 if the log is empty).
+        """
+        return (
+            EmployeeTombstone.objects.order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+            or 0
+        )
+
+    @staticmethod
+    def get_high_water_seq() -> int:
+        """
+        Returns the newest sequence number ever issued (0 if none), even if
+        its tombstone has since been deleted. On SQLite this is the table's
+        AUTOINCREMENT counter; elsewhere the newest retained one.
+        """
+        connection = connections[router.db_for_read(EmployeeTombstone)]
+        if connection.vendor != "sqlite":
+            return TombstoneRepository.get_last_seq()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = %s",
+                [EmployeeTombstone._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def prune(before) -> int:
+        """
+        Deletes tombstones logged before ``before``, always keeping the
+        newest one so the log's start stays visible. Returns the count.
+        """
+        last = TombstoneRepository.get_last_seq()
+        if not last:
+            return 0
+        deleted, _ = (
+            EmployeeTombstone.objects.filter(deleted_at__lt=before)
+            .exclude(id=last)
+            .delete()
+        )
+        return deleted
@@ -1,5 +1,11 @@
+import decimal
+import operator
+from functools import lru_cache
+
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Employee
+from .models import Employee, ImportJob
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
@@ -18,6 +24,9 @@ class EmployeeSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
+    managerId = serializers.IntegerField(
+        source="manager_id", required=False, allow_null=True
+    )
     createdAt = serializers.DateTimeField(source="created_at", read_only=True)
     updatedAt = serializers.DateTimeField(source="updated_at", read_only=True)
 
@@ -34,6 +43,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             "hireDate",
             "salary",
             "status",
+            "managerId",
             "createdAt",
             "updatedAt",
         ]
@@ -80,3 +90,155 @@ class EmployeeSerializer(serializers.ModelSerializer):
         if value is not None and value < 0:
             raise serializers.ValidationError("Salary cannot be negative.")
         return value
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Read-only view of a background import job, camelCase for the frontend."""
+
+    rowsProcessed = serializers.IntegerField(source="rows_processed")
+    rowsCreated = serializers.IntegerField(source="rows_created")
+    rowsUpdated = serializers.IntegerField(source="rows_updated")
+    rowsUnchanged = serializers.IntegerField(source="rows_unchanged")
+    rowsFailed = serializers.IntegerField(source="rows_failed")
+    createdAt = serializers.DateTimeField(source="created_at")
+    startedAt = serializers.DateTimeField(source="started_at")
+    finishedAt = serializers.DateTimeField(source="finished_at")
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "filename",
+            "status",
+            "rowsProcessed",
+            "rowsCreated",
+            "rowsUpdated",
+            "rowsUnchanged",
+            "rowsFailed",
+            "errors",
+            "message",
+            "createdAt",
+            "startedAt",
+            "finishedAt",
+        ]
+        read_only_fields = fields
+
+
+def _datetime(value, tz):
+    if value is None:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _date(value):
+    return None if value is None else value.isoformat()
+
+
+def _make_decimal(max_digits, decimal_places):
+    exponent = decimal.Decimal(".1") ** decimal_places
+    context = decimal.Context(prec=max_digits)
+
+    def _decimal(value):
+        if value is None:
+            return None
+        return "{:f}".format(value.quantize(exponent, context=context))
+
+    return _decimal
+
+
+def _converter(model_field):
+    """Match the DRF field representation for one model field type."""
+    if isinstance(model_field, models.DateTimeField):
+        return _datetime
+    if isinstance(model_field, models.DateField):
+        return _date
+    if isinstance(model_field, models.DecimalField):
+        return _make_decimal(model_field.max_digits, model_field.decimal_places)
+    return None
+
+
+def parse_fields(value: str | None) -> tuple[str, ...] | None:
+    """
+    Parse a ``?fields=id,firstName,status`` list into API field names, in
+    serializer order. Returns None (every field) for a missing or empty
+    value; raises ValueError for unknown names.
+    """
+    requested = {name.strip() for name in (value or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(EmployeeSerializer.Meta.fields)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(EmployeeSerializer.Meta.fields)}"
+        )
+    return tuple(name for name in EmployeeSerializer.Meta.fields if name in requested)
+
+
+class EmployeeRowSerializer:
+    """
+    Read-only fast path for list responses.
+
+    Produces exactly what ``EmployeeSerializer(many=True).data`` produces, but
+    works on ``values()`` rows and maps each row through a function built
+    once per field set, instead of walking a DRF field tree per row.
+    ``EmployeeSerializer`` stays the serializer for writes and validation.
+    """
+
+    def __init__(self, fields=None):
+        self.fields = tuple(fields or EmployeeSerializer.Meta.fields)
+        self.sources, self.row_to_dict = _compile(self.fields)
+
+    def values(self, queryset, extra=()):
+        """
+        Narrow a queryset to the model columns these fields read, plus
+        ``extra`` columns needed elsewhere (e.g. a cursor's ordering).
+        """
+        return queryset.values(*dict.fromkeys([*self.sources, *extra]))
+
+    def to_representation(self, rows) -> list[dict]:
+        row_to_dict = self.row_to_dict
+        # Resolved once per call; it is a thread/task local lookup.
+        tz = timezone.get_current_timezone()
+        return [row_to_dict(row, tz) for row in rows]
+
+
+@lru_cache(maxsize=64)
+def _compile(fields):
+    """
+    Build ``row_to_dict(row, tz)`` for ``fields``: one ``itemgetter`` call
+    reads every column, then only the fields that need it are converted.
+    Returns the model columns read and the function.
+    """
+    declared = EmployeeSerializer().fields
+    sources = tuple(declared[name].source for name in fields)
+    plain = []  # (name, converter)
+    with_tz = []  # (name, converter), also given the current timezone
+    for name, source in zip(fields, sources):
+        converter = _converter(Employee._meta.get_field(source))
+        if converter is _datetime:
+            with_tz.append((name, converter))
+        elif converter is not None:
+            plain.append((name, converter))
+
+    if len(sources) > 1:
+        read = operator.itemgetter(*sources)
+    else:
+        # itemgetter returns a bare value, not a tuple, for a single key.
+        (source,) = sources
+
+        def read(row):
+            return (row[source],)
+
+    def row_to_dict(row, tz):
+        data = dict(zip(fields, read(row)))
+        for name, convert in plain:
+            data[name] = convert(data[name])
+        for name, convert in with_tz:
+            data[name] = convert(data[name], tz)
+        return data
+
+    return sources, row_to_dict
@@ -0,0 +1,100 @@
+"""
+Department and position autocomplete, answered from the in-memory
+``autocomplete_index``.
+
+``EmployeeService.publish`` hands every write to ``apply``, which updates
+the index once the write commits. Loading the index, and reloading it
+after writes from other processes, happens in a background thread
+started by a request, so requests never wait on the database.
+"""
+
+import threading
+from collections import defaultdict
+
+from django.db import close_old_connections, connections, router, transaction
+
+from ..autocomplete import FIELDS, autocomplete_index
+from ..models import Employee
+from ..repositories.employee_repo import EmployeeRepository
+from ..repositories.generation_repo import GenerationRepository
+from .changes import EmployeeChanges
+
+_refreshing = threading.Lock()
+
+
+class AutocompleteService:
+    @staticmethod
+    def complete(field: str, prefix: str, limit: int):
+        """
+        Up to ``limit`` ``(value, count)`` pairs of ``field`` starting with
+        ``prefix``, or None while the index is first loading. Starts a
+        background refresh when one is due.
+        """
+        if autocomplete_index.needs_check():
+            AutocompleteService.refresh_in_background()
+        return autocomplete_index.complete(field, prefix, limit)
+
+    @staticmethod
+    def apply(changes: EmployeeChanges, generation: int):
+        """
+        Update the index with a write once its transaction commits.
+        Called from ``EmployeeService.publish`` with the generation the
+        write bumped to.
+        """
+        deltas = {field: defaultdict(int) for field in FIELDS}
+        for row in changes.created:
+            for field in FIELDS:
+                deltas[field][row[field]] += 1
+        for before, after in changes.updated:
+            for field in FIELDS:
+                if before[field] != after[field]:
+                    deltas[field][before[field]] -= 1
+                    deltas[field][after[field]] += 1
+        for row in changes.deleted:
+            for field in FIELDS:
+                deltas[field][row[field]] -= 1
+        transaction.on_commit(
+            lambda: autocomplete_index.apply(deltas, generation),
+            using=router.db_for_write(Employee),
+        )
+
+    @staticmethod
+    def refresh_in_background() -> bool:
+        """
+        Start a refresh thread unless one is already running. Returns
+        whether one was started.
+        """
+        if not _refreshing.acquire(blocking=False):
+            return False
+
+        def task():
+            close_old_connections()
+            try:
+                AutocompleteService.refresh()
+            finally:
+                connections.close_all()
+                _refreshing.release()
+
+        threading.Thread(target=task, name="employee-autocomplete", daemon=True).start()
+        return True
+
+    @staticmethod
+    def refresh() -> bool:
+        """
+        Reload the index if the data generation has moved past it (or it
+        was never loaded). Returns whether it reloaded.
+        """
+        if (
+            autocomplete_index.loaded
+            and not autocomplete_index.stale
+            and GenerationRepository.current() == autocomplete_index.generation
+        ):
+            autocomplete_index.mark_checked()
+            return False
+        # One read transaction, so the counts are exactly those of the
+        # generation read alongside them.
+        with transaction.atomic(using=router.db_for_read(Employee)):
+            generation = GenerationRepository.current()
+            counts = {field: EmployeeRepository.count_by(field) for field in FIELDS}
+        autocomplete_index.load(generation, counts)
+        return True
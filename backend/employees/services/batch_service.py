@@ -0,0 +1,223 @@
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from ..models import Employee
+from ..repositories.employee_repo import EmployeeRepository
+from .changes import EmployeeChanges, snapshot
+from .fields import FIELD_MAPPING
+from .hierarchy_service import clean_manager_id
+from .import_service import UPDATE_FIELDS, WRITE_BATCH_SIZE
+
+MAX_BATCH_OPERATIONS = 1000
+
+CREATE, UPDATE, DELETE = "create", "update", "delete"
+
+
+class BatchRejected(ValueError):
+    """
+    Raised when any operation in a batch is invalid. Carries the
+    per-operation results; nothing has been written.
+    """
+
+    def __init__(self, results: list[dict]):
+        super().__init__("Batch rejected; no changes were made.")
+        self.results = results
+
+
+def validation_message(error: ValidationError) -> str:
+    if hasattr(error, "error_dict"):
+        return "; ".join(
+            # A field can carry the same validator twice (email does).
+            f"{field}: {' '.join(dict.fromkeys(messages))}"
+            for field, messages in error.message_dict.items()
+        )
+    return " ".join(error.messages)
+
+
+class EmployeeBatch:
+    """
+    Applies a list of create/update/delete operations with a fixed number
+    of queries, whatever the batch size:
+
+    - one ``IN`` query loads every employee referenced by id;
+    - one ``IN`` query finds current holders of every email the batch
+      assigns, and uniqueness is checked against that set in memory
+      (including duplicates within the batch);
+    - writes are one DELETE, ``bulk_update`` and ``bulk_create``.
+
+    Field validation runs the model's field validators in memory.
+    The batch is all-or-nothing: callers run ``apply`` in a transaction,
+    and if any operation is invalid nothing is written.
+    """
+
+    def __init__(self, operations):
+        if not isinstance(operations, list) or not operations:
+            raise ValueError("operations must be a non-empty list.")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(
+                f"A batch can contain at most {MAX_BATCH_OPERATIONS} operations."
+            )
+        self.operations = operations
+        self.results = [{"index": i} for i in range(len(operations))]
+        self.failed = 0
+
+    def apply(self) -> EmployeeChanges:
+        """
+        Validate and write the batch; returns what it changed.
+        Raises BatchRejected if any operation is invalid.
+        """
+        parsed = [self._parse(i, op) for i, op in enumerate(self.operations)]
+        ids = {op["id"] for op in parsed if op and op["op"] != CREATE}
+        existing = EmployeeRepository.get_employees_by_ids(ids)
+
+        to_create = []  # (index, Employee)
+        to_update = []  # (index, Employee, before)
+        to_delete = []  # (index, Employee)
+        seen_ids = set()
+        for i, op in enumerate(parsed):
+            if op is None:
+                continue
+            if op["op"] == CREATE:
+                employee = Employee()
+            else:
+                employee = existing.get(op["id"])
+                if employee is None:
+                    self._fail(i, f"Employee with id {op['id']} does not exist.")
+                    continue
+                # A second operation on the same employee would make the
+                # outcome depend on operation order.
+                if employee.pk in seen_ids:
+                    self._fail(
+                        i, f"Employee {employee.pk} appears in more than one operation."
+                    )
+                    continue
+                seen_ids.add(employee.pk)
+            if op["op"] == DELETE:
+                to_delete.append((i, employee))
+                continue
+            before = snapshot(employee) if op["op"] == UPDATE else None
+            for field, value in op["data"].items():
+                setattr(employee, field, value)
+            try:
+                # Managers are checked against the hierarchy, set-based, on
+                # publish rather than with a query per operation here.
+                employee.full_clean(
+                    exclude=["manager"],
+                    validate_unique=False,
+                    validate_constraints=False,
+                )
+            except ValidationError as e:
+                self._fail(i, validation_message(e))
+                continue
+            if op["op"] == CREATE:
+                to_create.append((i, employee))
+            else:
+                to_update.append((i, employee, before))
+
+        self._check_emails(to_create, to_update, to_delete)
+        if self.failed:
+            for result in self.results:
+                result.setdefault("status", "ok")
+            raise BatchRejected(self.results)
+
+        if to_delete:
+            EmployeeRepository.delete_employees_by_ids(
+                [employee.pk for _, employee in to_delete]
+            )
+        if to_update:
+            now = timezone.now()
+            for _, employee, _ in to_update:
+                employee.updated_at = now
+            EmployeeRepository.bulk_update_employees(
+                [employee for _, employee, _ in to_update],
+                UPDATE_FIELDS,
+                WRITE_BATCH_SIZE,
+            )
+        if to_create:
+            EmployeeRepository.bulk_create_employees(
+                [employee for _, employee in to_create], WRITE_BATCH_SIZE
+            )
+
+        for i, employee in to_delete:
+            self.results[i].update(status="deleted", id=employee.pk)
+        for i, employee, _ in to_update:
+            self.results[i].update(status="updated", id=employee.pk, employee=employee)
+        for i, employee in to_create:
+            self.results[i].update(status="created", id=employee.pk, employee=employee)
+
+        return EmployeeChanges(
+            created=[snapshot(employee) for _, employee in to_create],
+            updated=[(before, snapshot(employee)) for _, employee, before in to_update],
+            deleted=[snapshot(employee) for _, employee in to_delete],
+        )
+
+    def _parse(self, i: int, op) -> dict | None:
+        """
+        Check an operation's shape and map its data to model fields.
+        """
+        if not isinstance(op, dict):
+            return self._fail(i, "Operation must be an object.")
+        kind = op.get("op")
+        self.results[i]["op"] = kind
+        if kind not in (CREATE, UPDATE, DELETE):
+            return self._fail(i, "op must be one of: create, update, delete.")
+
+        parsed = {"op": kind}
+        if kind != CREATE:
+            employee_id = op.get("id")
+            if not isinstance(employee_id, int) or isinstance(employee_id, bool):
+                return self._fail(i, "id must be an integer.")
+            parsed["id"] = employee_id
+        if kind != DELETE:
+            data = op.get("data")
+            if not isinstance(data, dict):
+                return self._fail(i, "data must be an object.")
+            unknown = sorted(set(data) - set(FIELD_MAPPING))
+            if unknown:
+                return self._fail(i, f"Unknown fields: {', '.join(unknown)}")
+            parsed["data"] = {FIELD_MAPPING[key]: value for key, value in data.items()}
+            if "email" in parsed["data"] and parsed["data"]["email"] == "":
+                parsed["data"]["email"] = None
+            if "manager_id" in parsed["data"]:
+                try:
+                    parsed["data"]["manager_id"] = clean_manager_id(
+                        parsed["data"]["manager_id"]
+                    )
+                except ValueError as e:
+                    return self._fail(i, str(e))
+        return parsed
+
+    def _check_emails(self, to_create, to_update, to_delete):
+        """
+        Set-based uniqueness: an email may be claimed by one operation, and
+        only if no other employee holds it after the batch.
+        """
+        deleted_ids = {employee.pk for _, employee in to_delete}
+
+        claims = [(i, employee) for i, employee in to_create]
+        claims += [(i, employee) for i, employee, _ in to_update]
+        emails = {employee.email for _, employee in claims if employee.email}
+        holders = EmployeeRepository.get_employees_by_emails(emails)
+        claimed = {}
+        for i, employee in sorted(claims, key=lambda pair: pair[0]):
+            email = employee.email
+            if not email:
+                continue
+            if email in claimed:
+                self._fail(i, f"Email {email} is used by operation {claimed[email]}.")
+                continue
+            claimed[email] = i
+            holder = holders.get(email)
+            if holder is None or holder.pk == employee.pk:
+                continue
+            # The current holder keeps the email unless the batch deletes it.
+            # Renames are not treated as freeing an email: bulk_update writes
+            # rows in arbitrary order, so a swap could trip the constraint.
+            if holder.pk not in deleted_ids:
+                self._fail(i, "Employee with this email already exists.")
+
+    def _fail(self, i: int, message: str):
+        if self.results[i].get("status") != "invalid":
+            self.failed += 1
+        self.results[i].update(status="invalid", error=message)
+        return None
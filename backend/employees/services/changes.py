@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+# Employee columns captured in change snapshots: the ones derived state
+# (summaries, indexes, logs) is computed from.
+SNAPSHOT_FIELDS = ["id", "department", "position", "status", "salary", "manager_id"]
+
+
+def snapshot(employee) -> dict:
+    """
+    Capture the tracked columns of an Employee instance.
+    """
+    row = {name: getattr(employee, name) for name in SNAPSHOT_FIELDS}
+    # Instances built from request data may still hold the raw JSON value.
+    if row["salary"] is not None:
+        row["salary"] = Decimal(str(row["salary"])).quantize(Decimal("0.01"))
+    return row
+
+
+@dataclass
+class EmployeeChanges:
+    """
+    What a write did to the employee table, as snapshots of tracked columns.
+    Service write paths build one and hand it to ``EmployeeService.publish``
+    so every piece of derived state is updated from the same description.
+    """
+
+    created: list[dict] = field(default_factory=list)
+    updated: list[tuple[dict, dict]] = field(default_factory=list)  # (before, after)
+    deleted: list[dict] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    def extend(self, other: "EmployeeChanges"):
+        self.created.extend(other.created)
+        self.updated.extend(other.updated)
+        self.deleted.extend(other.deleted)
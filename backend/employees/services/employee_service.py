@@ -1,64 +1,133 @@
 from ..repositories.employee_repo import EmployeeRepository
+from ..repositories.generation_repo import GenerationRepository
+from ..repositories.search_repo import EmployeeSearchRepository
+from .import_service import (
+    COLUMNS,
+    EXPORT_FIELDS,
+    EmployeeImporter,
+    read_csv_rows,
+    read_ndjson_rows,
+    read_xlsx_rows,
+)
+from .autocomplete_service import AutocompleteService
+from .batch_service import EmployeeBatch, validation_message
+from .changes import EmployeeChanges, snapshot
+from .fields import FIELD_MAPPING
+from .hierarchy_service import HierarchyService, clean_manager_id
+from .history_service import HistoryService
+from .idempotency_service import IdempotencyService
+from .summary_service import SummaryService
+from .sync_service import SyncService
+from .write_queue import write_transaction
 from ..models import Employee
+from django.core.exceptions import ValidationError
 
 # from bson.decimal128 import Decimal128
 from decimal import Decimal
 from ..serializers import EmployeeSerializer
-import openpyxl
-from django.db import transaction
+from ..renderers import render_json
+from ..metrics import serialization
 from openpyxl import Workbook
-from django.http import HttpResponse
-import datetime
+from django.http import FileResponse, StreamingHttpResponse
+import csv
+import tempfile
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+SALARY_COLUMN = COLUMNS.index("salary")
 
 
 class EmployeeService:
     @staticmethod
+    @write_transaction
     def create_employee(data: dict) -> Employee:
         """
         Business logic for adding an employee.
         """
-        print("we in services", data)
-        mapping = {
-            "firstName": "first_name",
-            "lastName": "last_name",
-            "department": "department",
-            "position": "position",
-            "hireDate": "hire_date",
-            "status": "status",
-            "email": "email",
-            "phone": "phone",
-            "salary": "salary",
-        }
-        model_data = {mapping[k]: v for k, v in data.items() if k in mapping}
-        existing_employee = EmployeeRepository.get_employee_by_email(
-            model_data.get("email")
-        )
-        if existing_employee:
+        model_data = _model_fields(data)
+        employee = Employee(**model_data)
+        # The email's unique constraint is the duplicate check.
+        if not EmployeeRepository.insert_employee(employee):
             raise ValueError("Employee with this email already exists.")
-
-        employee = EmployeeRepository.create_employee(model_data)
+        EmployeeService.publish(EmployeeChanges(created=[snapshot(employee)]))
         # print("employee---- ", employee)
         return employee
         # serializer = EmployeeSerializer(employee)
         # return serializer.data
 
     @staticmethod
+    @write_transaction
+    def upsert_employee(data: dict, idempotency_key: str | None = None):
+        """
+        Create the employee with ``data["email"]``, or update that employee
+        if one exists. Returns ``(response, replayed)``, where ``response``
+        is ``{"result": "created" | "updated" | "unchanged", "data": ...}``.
+
+        New employees are written with a single INSERT that the email's
+        unique constraint turns into a no-op for existing ones; only then
+        is the existing row read and updated.
+
+        With an ``idempotency_key`` the response is stored alongside the
+        write, and a retry with the same key and payload gets it back with
+        ``replayed`` True and writes nothing. Raises ValueError for invalid
+        data and IdempotencyKeyReused for a key sent with another payload.
+        """
+        if idempotency_key is not None:
+            request_hash = IdempotencyService.fingerprint("employee-upsert", data)
+            stored = IdempotencyService.lookup(idempotency_key, request_hash)
+            if stored is not None:
+                return stored, True
+
+        model_data = _model_fields(data)
+        if not model_data.get("email"):
+            raise ValueError("email is required.")
+        employee = Employee(**model_data)
+        try:
+            # The manager is checked against the hierarchy on publish.
+            employee.full_clean(
+                exclude=["manager"], validate_unique=False, validate_constraints=False
+            )
+        except ValidationError as e:
+            raise ValueError(validation_message(e))
+
+        if EmployeeRepository.insert_employee(employee):
+            result = "created"
+            changes = EmployeeChanges(created=[snapshot(employee)])
+        else:
+            existing = EmployeeRepository.get_employee_by_email(employee.email)
+            before = snapshot(existing)
+            changed = False
+            for field in model_data:
+                # Compare the cleaned values, not the raw request data.
+                value = getattr(employee, field)
+                if getattr(existing, field) != value:
+                    setattr(existing, field, value)
+                    changed = True
+            if changed:
+                EmployeeRepository.save_employee(existing)
+                result = "updated"
+                changes = EmployeeChanges(updated=[(before, snapshot(existing))])
+            else:
+                result = "unchanged"
+                changes = EmployeeChanges()
+            employee = existing
+        EmployeeService.publish(changes)
+
+        response = {"result": result, "data": EmployeeSerializer(employee).data}
+        if idempotency_key is not None:
+            IdempotencyService.record(idempotency_key, request_hash, response)
+        return response, False
+
+    @staticmethod
+    @write_transaction
     def update_employee(id: int, data: dict) -> Employee:
         """
         Update employee
         """
-        mapping = {
-            "firstName": "first_name",
-            "lastName": "last_name",
-            "department": "department",
-            "position": "position",
-            "hireDate": "hire_date",
-            "status": "status",
-            "email": "email",
-            "phone": "phone",
-            "salary": "salary",
-        }
-        model_data = {mapping[k]: v for k, v in data.items() if k in mapping}
+        model_data = _model_fields(data)
         employee = EmployeeRepository.get_employee_by_id(id)
         if not employee:
             raise ValueError(f"Employee with id {id} does not exist.")
@@ -67,11 +136,13 @@ class EmployeeService:
             existing = EmployeeRepository.get_employee_by_email(model_data["email"])
             if existing:
                 raise ValueError("Another employee with this email already exists.")
+        before = snapshot(employee)
         # Update fields
         for key, value in model_data.items():
             setattr(employee, key, value)
 
         EmployeeRepository.save_employee(employee)
+        EmployeeService.publish(EmployeeChanges(updated=[(before, snapshot(employee))]))
         return employee
 
     @staticmethod
@@ -113,6 +184,35 @@ class EmployeeService:
         return employee_list
 
     @staticmethod
+    def get_generation() -> int:
+        """
+        Current employee data generation; bumped by every write below.
+        """
+        return GenerationRepository.current()
+
+    @staticmethod
+    def get_watermark() -> dict:
+        """
+        Data generation and newest updated_at, for conditional GET.
+        """
+        return EmployeeRepository.get_watermark()
+
+    @staticmethod
+    def get_employee(employee_id) -> Employee | None:
+        """
+        Business logic for fetching one employee.
+        """
+        return EmployeeRepository.get_employee_by_id(employee_id)
+
+    @staticmethod
+    def search_employees(term: str):
+        """
+        Business logic for full-text searching employees, best matches first.
+        """
+        return EmployeeSearchRepository.search(term.strip())
+
+    @staticmethod
+    @write_transaction
     def delete_employee(employee_id):
         """
         Business logic for deleting employee by id,
@@ -122,125 +222,246 @@ class EmployeeService:
         if not employee:
             raise ValueError("Employee not found")
 
-        return EmployeeRepository.delete_employee(employee)
+        deleted = snapshot(employee)
+        EmployeeRepository.delete_employee(employee)
+        EmployeeService.publish(EmployeeChanges(deleted=[deleted]))
 
     @staticmethod
-    @transaction.atomic
+    @write_transaction
+    def apply_batch(operations) -> list[dict]:
+        """
+        Apply a list of create/update/delete operations in one transaction.
+        Returns one result per operation; raises BatchRejected (and writes
+        nothing) if any operation is invalid.
+        """
+        batch = EmployeeBatch(operations)
+        EmployeeService.publish(batch.apply())
+        return batch.results
+
+    @staticmethod
+    @write_transaction
     def import_from_excel(file):
         """
         Import employees from Excel.
         Updates existing employees if email already exists.
-        """
-        wb = openpyxl.load_workbook(file)
-        sheet = wb.active
 
-        # Assumes row 1 is headers
-        created = 0
-        updated = 0
+        Rows are written in chunks with bulk queries; rows that fail
+        validation are reported per row and do not abort the import.
+        """
         print("Importing employees from Excel...")
+        return EmployeeService.import_rows(read_xlsx_rows(file))
 
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            (
-                first_name,
-                last_name,
-                email,
-                phone,
-                department,
-                position,
-                hire_date,
-                salary,
-                status,
-            ) = row
-
-            if hire_date and isinstance(hire_date, datetime.datetime):
-                hire_date = hire_date.date()
-
-            existing_employee = EmployeeRepository.get_employee_by_email(email)
-
-            if existing_employee:
-                EmployeeService.update_employee(
-                    existing_employee.id,
-                    {
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "phone": phone,
-                        "department": department,
-                        "position": position,
-                        "hire_date": hire_date,
-                        "salary": salary,
-                        "status": status,
-                    },
-                )
-                updated += 1
-            else:
-                EmployeeRepository.create_employee(
-                    {
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "email": email,
-                        "phone": phone,
-                        "department": department,
-                        "position": position,
-                        "hire_date": hire_date,
-                        "salary": salary,
-                        "status": status,
-                    }
-                )
-                created += 1
-
-        return {"created": created, "updated": updated}
+    @staticmethod
+    @write_transaction
+    def import_from_csv(file):
+        """
+        Import employees from CSV using the spreadsheet column layout.
+        """
+        return EmployeeService.import_rows(read_csv_rows(file))
+
+    @staticmethod
+    @write_transaction
+    def import_from_ndjson(file):
+        """
+        Import employees from newline-delimited JSON objects keyed by column.
+        """
+        return EmployeeService.import_rows(read_ndjson_rows(file))
+
+    @staticmethod
+    def import_rows(rows):
+        """
+        Run ``(row_number, values)`` pairs through the bulk importer.
+        """
+        importer = EmployeeImporter()
+        return importer.run(rows, on_chunk=EmployeeService.publish)
+
+    @staticmethod
+    def publish(changes: EmployeeChanges):
+        """
+        Bring derived state in line with a write. Called inside the write's
+        transaction so both commit (or roll back) together.
+        """
+        if not changes:
+            return
+        SummaryService.apply(changes)
+        SyncService.apply(changes)
+        HierarchyService.apply(changes)
+        HistoryService.apply(changes)
+        generation = GenerationRepository.bump()
+        AutocompleteService.apply(changes, generation)
+
+    @staticmethod
+    def get_summary() -> dict:
+        """
+        Business logic for the headcount and salary summary.
+        """
+        return SummaryService.get_summary()
 
     @staticmethod
     def export_to_excel():
         """
         Business logic for exporting database as excel file.
+
+        Rows are read in chunks and appended to a write-only workbook, which
+        streams them to disk instead of keeping a cell tree in memory. The
+        finished file is spooled through a temp file and streamed back, so
+        peak memory does not grow with headcount.
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Employees"
-
-        headers = [
-            "first_name",
-            "last_name",
-            "email",
-            "phone",
-            "department",
-            "position",
-            "hire_date",
-            "salary",
-            "status",
-        ]
-        ws.append(headers)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Employees")
+        ws.append(COLUMNS)
 
-        employees = EmployeeRepository.get_all_employees()
+        for row in EmployeeRepository.iter_employee_rows(EXPORT_FIELDS):
+            salary = row[SALARY_COLUMN]
+            if isinstance(salary, Decimal):
+                row = list(row)
+                row[SALARY_COLUMN] = float(salary)
+            ws.append(row)
 
-        for emp in employees:
-            # salary_value = (
-            #     float(emp.salary.to_decimal())
-            #     if isinstance(emp.salary, Decimal)
-            #     else emp.salary
-            # )
-            salary_value = (
-                float(emp.salary) if isinstance(emp.salary, Decimal) else emp.salary
-            )
-            ws.append(
-                [
-                    emp.first_name,
-                    emp.last_name,
-                    emp.email,
-                    emp.phone,
-                    emp.department,
-                    emp.position,
-                    emp.hire_date,
-                    salary_value,
-                    emp.status,
-                ]
-            )
+        spool = tempfile.TemporaryFile()
+        with serialization():
+            wb.save(spool)
+        spool.seek(0)
+        # FileResponse streams the spool in blocks and closes it when done.
+        return FileResponse(
+            spool,
+            as_attachment=True,
+            filename="employees.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
+        )
 
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    @staticmethod
+    def export_to_csv():
+        """
+        Business logic for exporting database as a streamed CSV file.
+        """
+
+        def lines():
+            writer = csv.writer(_Echo())
+            yield writer.writerow(COLUMNS)
+            for row in EmployeeRepository.iter_employee_rows(EXPORT_FIELDS):
+                yield writer.writerow(row)
+
+        return _csv_response(_batched(lines()))
+
+    @staticmethod
+    def export_to_ndjson():
+        """
+        Business logic for exporting database as streamed NDJSON, one object
+        per employee keyed by the spreadsheet column names.
+        """
+        lines = (
+            _ndjson_line(row)
+            for row in EmployeeRepository.iter_employee_rows(EXPORT_FIELDS)
         )
-        response["Content-Disposition"] = 'attachment; filename="employees.xlsx"'
+        return _ndjson_response(_batched(lines))
+
+    @staticmethod
+    async def aget_watermark() -> dict:
+        return await EmployeeRepository.aget_watermark()
+
+    @staticmethod
+    async def aget_employee(employee_id) -> Employee | None:
+        return await EmployeeRepository.aget_employee_by_id(employee_id)
+
+    @staticmethod
+    def aexport_to_csv():
+        """
+        ``export_to_csv`` for async views: rows come from the async ORM and
+        the response body is an async iterator, so a slow client holds no
+        thread while the export streams.
+        """
+
+        async def lines():
+            writer = csv.writer(_Echo())
+            yield writer.writerow(COLUMNS)
+            async for row in EmployeeRepository.aiter_employee_rows(EXPORT_FIELDS):
+                yield writer.writerow(row)
+
+        return _csv_response(_abatched(lines()))
+
+    @staticmethod
+    def aexport_to_ndjson():
+        """
+        ``export_to_ndjson`` for async views.
+        """
+
+        async def lines():
+            async for row in EmployeeRepository.aiter_employee_rows(EXPORT_FIELDS):
+                yield _ndjson_line(row)
+
+        return _ndjson_response(_abatched(lines()))
+
+
+def _model_fields(data: dict) -> dict:
+    """
+    Map the API fields in request ``data`` to model fields, ignoring
+    unknown keys. Raises ValueError for a malformed manager id.
+    """
+    model_data = {FIELD_MAPPING[k]: v for k, v in data.items() if k in FIELD_MAPPING}
+    if "manager_id" in model_data:
+        model_data["manager_id"] = clean_manager_id(model_data["manager_id"])
+    return model_data
+
+
+def _csv_response(body):
+    response = StreamingHttpResponse(body, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = 'attachment; filename="employees.csv"'
+    return response
+
+
+def _ndjson_response(body):
+    response = StreamingHttpResponse(body, content_type=NDJSON_CONTENT_TYPE)
+    response["Content-Disposition"] = 'attachment; filename="employees.ndjson"'
+    return response
+
+
+def _ndjson_line(row) -> bytes:
+    record = dict(zip(COLUMNS, row))
+    hire_date = record["hire_date"]
+    record["hire_date"] = hire_date.isoformat() if hire_date else None
+    salary = record["salary"]
+    record["salary"] = str(salary) if salary is not None else None
+    return render_json(record) + b"\n"
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def _batched(chunks, size: int = 64 * 1024):
+    """
+    Coalesce small byte strings into ~64KB blocks so the server does not
+    write one tiny chunk per row.
+    """
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
 
-        wb.save(response)
-        return response
+async def _abatched(chunks, size: int = 64 * 1024):
+    """
+    ``_batched`` for async iterators.
+    """
+    buffer = []
+    buffered = 0
+    async for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
@@ -0,0 +1,14 @@
+# API (camelCase) names of the writable employee fields, mapped to model
+# fields. Shared by every write path that takes request data.
+FIELD_MAPPING = {
+    "firstName": "first_name",
+    "lastName": "last_name",
+    "email": "email",
+    "phone": "phone",
+    "department": "department",
+    "position": "position",
+    "hireDate": "hire_date",
+    "salary": "salary",
+    "status": "status",
+    "managerId": "manager_id",
+}
@@ -0,0 +1,173 @@
+"""
+Reporting hierarchy: ``Employee.manager`` plus the ``EmployeeHierarchy``
+closure table, which holds a row for every (manager, report) pair at any
+distance. Subtree listings, headcounts and management chains are then
+single indexed reads however deep the tree is.
+
+``EmployeeService.publish`` hands every write to ``apply``, which keeps the
+closure table in step with ``manager_id`` inside the write's transaction:
+
+- new employees get their paths computed from their manager's, with one
+  read for all of them and one executemany;
+- an employee whose manager changes has its subtree's paths to the old
+  chain deleted and the cross product with the new chain inserted;
+- deleted employees' reports move up to the nearest surviving manager,
+  and the paths through them are shortened, set-based for the whole
+  delete.
+"""
+
+from ..repositories.hierarchy_repo import HierarchyRepository
+from .changes import EmployeeChanges
+
+
+def clean_manager_id(value) -> int | None:
+    """
+    Validate a ``managerId`` from request data. Raises ValueError.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError("managerId must be an employee id or null.")
+    return value
+
+
+class HierarchyService:
+    @staticmethod
+    def apply(changes: EmployeeChanges):
+        """
+        Fold a change set into the closure table: creates first, then
+        manager changes, then deletes. Raises ValueError for an unknown
+        manager (including one deleted by the same write) or a move that
+        would put an employee under themselves.
+        """
+        deleted_ids = [row["id"] for row in changes.deleted]
+        assigned = {row["manager_id"] for row in changes.created}
+        assigned.update(after["manager_id"] for _, after in changes.updated)
+        removed = assigned.intersection(deleted_ids)
+        if removed:
+            raise ValueError(f"Manager {min(removed)} does not exist.")
+
+        if changes.created:
+            HierarchyService._add(changes.created)
+        for before, after in changes.updated:
+            if before["manager_id"] != after["manager_id"]:
+                HierarchyService._move(after["id"], after["manager_id"])
+        if deleted_ids:
+            HierarchyService._remove(deleted_ids)
+
+    @staticmethod
+    def _add(created: list[dict]):
+        managers = {row["id"]: row["manager_id"] for row in created}
+        existing = set(managers.values()) - set(managers) - {None}
+        # {id: [(ancestor, depth), ...]} including (id, 0).
+        paths = HierarchyRepository.get_ancestor_paths(existing) if existing else {}
+        missing = existing - set(paths)
+        if missing:
+            raise ValueError(f"Manager {min(missing)} does not exist.")
+
+        # New employees can report to each other (an import may create a
+        # manager and their reports together): resolve those chains first.
+        for employee_id in managers:
+            chain = []
+            current = employee_id
+            while current not in paths:
+                if current in chain:
+                    raise ValueError(
+                        f"Employee {employee_id} would be their own manager."
+                    )
+                chain.append(current)
+                current = managers[current]
+                if current is None:
+                    break
+            above = [] if current is None else paths[current]
+            for node in reversed(chain):
+                above = [(node, 0)] + [
+                    (ancestor, depth + 1) for ancestor, depth in above
+                ]
+                paths[node] = above
+
+        HierarchyRepository.insert_paths(
+            [
+                (ancestor, employee_id, depth)
+                for employee_id in managers
+                for ancestor, depth in paths[employee_id]
+            ]
+        )
+
+    @staticmethod
+    def _move(employee_id: int, manager_id: int | None):
+        if manager_id == employee_id:
+            raise ValueError("An employee cannot manage themselves.")
+        if manager_id is not None:
+            found = HierarchyRepository.get_existing_paths(
+                [(manager_id, manager_id), (employee_id, manager_id)]
+            )
+            if (manager_id, manager_id) not in found:
+                raise ValueError(f"Manager {manager_id} does not exist.")
+            if (employee_id, manager_id) in found:
+                raise ValueError(
+                    f"Employee {employee_id} cannot report to employee "
+                    f"{manager_id}, who is in their own reporting line."
+                )
+        HierarchyRepository.detach_subtree(employee_id)
+        if manager_id is not None:
+            HierarchyRepository.attach_subtree(employee_id, manager_id)
+
+    @staticmethod
+    def _remove(deleted_ids: list[int]):
+        if HierarchyRepository.reassign_reports(deleted_ids):
+            HierarchyRepository.close_gaps(deleted_ids)
+        HierarchyRepository.delete_paths(deleted_ids)
+
+    @staticmethod
+    def get_managers_above(ids) -> dict[int, int | None]:
+        """
+        ``{employee: manager}`` for the employees in ``ids`` and everyone
+        above them, read from their closure rows in one query.
+        """
+        managers = {}
+        for paths in HierarchyRepository.get_ancestor_paths(ids).values():
+            chain = [ancestor for ancestor, _ in sorted(paths, key=lambda p: p[1])]
+            managers.update(zip(chain, chain[1:] + [None]))
+        return managers
+
+    @staticmethod
+    def get_report_counts(employee_id: int) -> dict | None:
+        """
+        Direct and total reports of an employee, or None if it does not
+        exist.
+        """
+        return HierarchyRepository.get_report_counts(employee_id)
+
+    @staticmethod
+    def get_reports(employee_id: int, max_depth: int | None = None):
+        """
+        Everyone below an employee, nearest levels first.
+        """
+        return HierarchyRepository.get_subtree(employee_id, max_depth)
+
+    @staticmethod
+    def get_chain(employee_id: int):
+        """
+        An employee followed by its managers, nearest first. Empty if the
+        employee does not exist.
+        """
+        return HierarchyRepository.get_chain(employee_id)
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Recompute the closure table from ``manager_id``. Returns its rows.
+        """
+        return HierarchyRepository.rebuild()
+
+    @staticmethod
+    def find_drift() -> dict:
+        """
+        Closure rows missing from and extra to what ``manager_id`` implies.
+        Both zero when the table is in step.
+        """
+        missing, extra = HierarchyRepository.count_drift()
+        return {"missing": missing, "extra": extra}
@@ -0,0 +1,271 @@
+"""
+Employee history: an append-only ``EmployeeHistory`` row for every
+create, delete and change of department, position, status or salary,
+and point-in-time queries over it.
+
+``EmployeeService.publish`` hands every write to ``apply``, which queues
+its rows in ``history_buffer`` once the write commits instead of adding
+an INSERT to it. The buffer is written in one executemany, through the
+write queue, when it reaches ``BATCH_SIZE`` rows or ``FLUSH_SECONDS``
+after its oldest row, from a timer thread so no request waits on it, and
+when the process exits. Queries first write whatever this process has
+queued; rows queued by other processes land within ``FLUSH_SECONDS``. A
+process that dies without exiting loses at most that much history.
+"""
+
+import atexit
+import datetime
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from ..models import Employee, EmployeeHistory
+from ..repositories.history_repo import HistoryRepository
+from .changes import EmployeeChanges
+from .write_queue import write_transaction
+
+TRACKED_FIELDS = ("department", "position", "status", "salary")
+_STATUSES = [choice for choice, _ in Employee.Status.choices]
+
+
+def parse_as_of(value: str | None) -> datetime.datetime:
+    """
+    Validate an ``asOf`` query parameter: a date (meaning the end of that
+    day) or an ISO 8601 datetime, in TIME_ZONE unless it has an offset.
+    Raises ValueError.
+    """
+    value = (value or "").strip()
+    try:
+        day = parse_date(value)
+        if day is not None:
+            at = datetime.datetime.combine(day, datetime.time.max)
+        else:
+            at = parse_datetime(value)
+    except ValueError:
+        at = None
+    if at is None:
+        raise ValueError("asOf must be a date (YYYY-MM-DD) or an ISO 8601 datetime.")
+    if timezone.is_naive(at):
+        at = timezone.make_aware(at)
+    return at
+
+
+class HistoryBuffer:
+    """
+    History rows committed in this process but not yet written, in commit
+    order. ``add`` arms a timer that calls ``on_due`` in its own thread
+    once the rows are due.
+    """
+
+    def __init__(self, on_due):
+        self.on_due = on_due
+        self._rows = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._timer_due = None
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, rows: list[tuple]):
+        config = getattr(settings, "EMPLOYEE_HISTORY", {})
+        with self._lock:
+            # A forked worker inherits the rows but not the timer; the
+            # parent writes them.
+            if self._pid != os.getpid():
+                self._rows, self._timer, self._pid = [], None, os.getpid()
+            self._rows.extend(rows)
+            if len(self._rows) >= config.get("BATCH_SIZE", 500):
+                self._arm(0)
+            else:
+                self._arm(config.get("FLUSH_SECONDS", 2))
+
+    def take(self) -> list[tuple]:
+        """
+        Remove and return every queued row.
+        """
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return rows
+
+    def restore(self, rows: list[tuple]):
+        """
+        Put back rows taken by a write that failed, ahead of newer ones.
+        """
+        with self._lock:
+            self._rows[:0] = rows
+        self.add([])
+
+    def _arm(self, delay):
+        # No timer for FLUSH_SECONDS=None: rows wait for a query, a full
+        # batch or exit.
+        if delay is None or (self._timer is not None and delay >= self._timer_due):
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self.on_due)
+        self._timer.name = "employee-history"
+        self._timer.daemon = True
+        self._timer_due = delay
+        self._timer.start()
+
+
+def _flush_in_background():
+    close_old_connections()
+    try:
+        HistoryService.flush()
+    finally:
+        connections.close_all()
+
+
+history_buffer = HistoryBuffer(on_due=_flush_in_background)
+
+
+class HistoryService:
+    @staticmethod
+    def apply(changes: EmployeeChanges):
+        """
+        Queue a history row per created and deleted employee and per update
+        that changed a tracked field, once the write commits. Called from
+        ``EmployeeService.publish``.
+        """
+        now = timezone.now()
+        rows = []
+        for row in changes.created:
+            rows.append(_entry(row, EmployeeHistory.Kind.CREATED, now))
+        for before, after in changes.updated:
+            if any(before[field] != after[field] for field in TRACKED_FIELDS):
+                rows.append(_entry(after, EmployeeHistory.Kind.UPDATED, now))
+        for row in changes.deleted:
+            rows.append(_entry(row, EmployeeHistory.Kind.DELETED, now))
+        if rows:
+            transaction.on_commit(
+                lambda: history_buffer.add(rows),
+                using=router.db_for_write(EmployeeHistory),
+            )
+
+    @staticmethod
+    def flush() -> int:
+        """
+        Write every queued row in one transaction. Returns how many; on
+        failure they go back in the queue and the error is raised.
+        """
+        rows = history_buffer.take()
+        if rows:
+            try:
+                HistoryService._insert(rows)
+            except BaseException:
+                history_buffer.restore(rows)
+                raise
+        return len(rows)
+
+    @staticmethod
+    @write_transaction
+    def _insert(rows: list[tuple]):
+        HistoryRepository.insert(rows)
+
+    @staticmethod
+    def record_missing() -> int:
+        """
+        Give employees without history (loaded around the service layer) a
+        "created" row with their current values. Returns how many.
+        """
+        return HistoryRepository.record_missing()
+
+    @staticmethod
+    def get_entries(employee_id: int) -> list[dict]:
+        """
+        An employee's history, oldest first; empty if it has none.
+        """
+        HistoryService.flush()
+        return [_state(row) for row in HistoryRepository.get_entries(employee_id)]
+
+    @staticmethod
+    def get_state_at(employee_id: int, at: datetime.datetime) -> dict | None:
+        """
+        An employee's department, position, status and salary as of ``at``,
+        or None if it did not exist then (or not since history began).
+        """
+        HistoryService.flush()
+        row = HistoryRepository.get_entry_at(employee_id, at)
+        if row is None or row["kind"] == EmployeeHistory.Kind.DELETED:
+            return None
+        return _state(row)
+
+    @staticmethod
+    def get_headcount_at(at: datetime.datetime) -> dict:
+        """
+        Headcount by department and status as of ``at``, in the shape of
+        the summary's headcounts.
+
+        Dates in the newer half of the recorded history are worked back to
+        from the current summary through the employees changed since;
+        older ones are replayed forward from the start. Each costs about
+        the rows on its side of the date (benchmarks/bench_history.py).
+        """
+        HistoryService.flush()
+        first, last = HistoryRepository.get_span()
+        if first is not None and at - first > last - at:
+            rows = HistoryRepository.get_headcount_back_from(at)
+        else:
+            rows = HistoryRepository.get_headcount_replayed(at)
+        departments = {}
+        totals = {"headcount": 0, "statusCounts": dict.fromkeys(_STATUSES, 0)}
+        for department, status, headcount in rows:
+            entry = departments.setdefault(
+                department,
+                {
+                    "department": department,
+                    "headcount": 0,
+                    "statusCounts": dict.fromkeys(_STATUSES, 0),
+                },
+            )
+            entry["headcount"] += headcount
+            entry["statusCounts"][status] = headcount
+            totals["headcount"] += headcount
+            totals["statusCounts"][status] += headcount
+        return {
+            "asOf": at,
+            "departments": [departments[name] for name in sorted(departments)],
+            "totals": totals,
+        }
+
+
+def _entry(row: dict, kind: int, recorded_at) -> tuple:
+    # In HISTORY_FIELDS order.
+    return (
+        row["id"],
+        recorded_at,
+        int(kind),
+        row["department"],
+        row["position"],
+        row["status"],
+        row["salary"],
+    )
+
+
+def _state(row: dict) -> dict:
+    salary = row["salary"]
+    return {
+        "id": row["employee_id"],
+        "recordedAt": row["recorded_at"],
+        "change": EmployeeHistory.Kind(row["kind"]).label.lower(),
+        "department": row["department"],
+        "position": row["position"],
+        "status": row["status"],
+        "salary": None if salary is None else "{:.2f}".format(salary),
+    }
+
+
+@atexit.register
+def _flush_at_exit():
+    if len(history_buffer):
+        HistoryService.flush()
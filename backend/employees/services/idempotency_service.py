@@ -0,0 +1,72 @@
+"""
+Idempotency keys for retried writes (the ``Idempotency-Key`` request
+header). The first request with a key stores its result in the same
+transaction as its write, so a retry, even one racing the original, finds
+either nothing (the write rolled back) or the committed result to replay.
+"""
+
+import datetime
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..repositories.idempotency_repo import IdempotencyRepository
+from .write_queue import write_transaction
+
+_config = getattr(settings, "EMPLOYEE_IDEMPOTENCY", {})
+
+KEY_RETENTION = datetime.timedelta(hours=_config.get("RETENTION_HOURS", 24))
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(Exception):
+    """
+    The key was already used for a request with a different payload.
+    """
+
+    def __init__(self):
+        super().__init__("Idempotency-Key was already used with a different request.")
+
+
+class IdempotencyService:
+    @staticmethod
+    def fingerprint(scope: str, data) -> str:
+        """
+        Hash of the operation and its payload, stored with the key so a
+        reused key with a different payload is rejected, not replayed.
+        """
+        payload = json.dumps(
+            [scope, data], sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def lookup(key: str, request_hash: str) -> dict | None:
+        """
+        The stored response for ``key``, or None if it is new or expired.
+        Call inside the write's transaction. Raises IdempotencyKeyReused.
+        """
+        stored = IdempotencyRepository.get(key)
+        if stored is None or stored.created_at < timezone.now() - KEY_RETENTION:
+            return None
+        if stored.request_hash != request_hash:
+            raise IdempotencyKeyReused()
+        return stored.response
+
+    @staticmethod
+    def record(key: str, request_hash: str, response: dict) -> None:
+        """
+        Store ``response`` for ``key``. Call inside the write's transaction.
+        """
+        IdempotencyRepository.save(key, request_hash, response, timezone.now())
+
+    @staticmethod
+    @write_transaction
+    def prune_keys() -> int:
+        """
+        Drop keys older than the retention period; a retry after that
+        writes again.
+        """
+        return IdempotencyRepository.prune(timezone.now() - KEY_RETENTION)
@@ -0,0 +1,471 @@
+import csv
+import datetime
+import io
+import json
+import os
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils import timezone
+
+from ..models import Employee
+from ..repositories.employee_repo import EmployeeRepository
+from .changes import EmployeeChanges, snapshot
+from .hierarchy_service import HierarchyService
+
+# Spreadsheet column layout shared by every import and export format.
+COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "department",
+    "position",
+    "hire_date",
+    "salary",
+    "status",
+    "manager_email",
+]
+
+# Columns a file may leave out, at the end of the layout; rows without them
+# keep their current values (files from before the column was added).
+OPTIONAL_COLUMNS = ["manager_email"]
+
+# What each column is exported from: managers are referred to by email.
+EXPORT_FIELDS = [
+    "manager__email" if column == "manager_email" else column for column in COLUMNS
+]
+
+# Columns written by bulk_update for rows matched on email.
+UPDATE_FIELDS = [
+    column for column in COLUMNS if column not in ("email", "manager_email")
+] + ["manager", "updated_at"]
+
+IMPORT_CHUNK_SIZE = 1000
+WRITE_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+_REQUIRED = ("first_name", "last_name", "department", "position")
+_STATUSES = {choice for choice, _ in Employee.Status.choices}
+
+
+class RowError(ValueError):
+    pass
+
+
+def clean_row(values) -> dict:
+    """
+    Validate one spreadsheet row (in ``COLUMNS`` order) and return model
+    field values. Raises RowError describing the first problem found.
+    """
+    if isinstance(values, RowError):
+        raise values
+    values = list(values)[: len(COLUMNS)]
+    given = len(values)
+    values += [None] * (len(COLUMNS) - len(values))
+    data = {}
+    for column, value in zip(COLUMNS, values):
+        if isinstance(value, str):
+            value = value.strip() or None
+        data[column] = value
+
+    for column in _REQUIRED:
+        if data[column] is None:
+            raise RowError(f"{column} is required.")
+        data[column] = str(data[column])
+
+    for column in ("first_name", "last_name", "department", "position", "phone"):
+        if data[column] is None:
+            continue
+        data[column] = str(data[column])
+        max_length = Employee._meta.get_field(column).max_length
+        if len(data[column]) > max_length:
+            raise RowError(f"{column} must be at most {max_length} characters.")
+
+    for column in ("email", "manager_email"):
+        if data[column] is None:
+            continue
+        data[column] = str(data[column])
+        try:
+            validate_email(data[column])
+        except ValidationError:
+            raise RowError(f"Invalid {column}: {data[column]}")
+    if given <= COLUMNS.index("manager_email"):
+        del data["manager_email"]
+
+    hire_date = data["hire_date"]
+    if isinstance(hire_date, datetime.datetime):
+        data["hire_date"] = hire_date.date()
+    elif isinstance(hire_date, str):
+        try:
+            data["hire_date"] = datetime.date.fromisoformat(hire_date[:10])
+        except ValueError:
+            raise RowError(f"Invalid hire_date: {hire_date}")
+    elif hire_date is not None and not isinstance(hire_date, datetime.date):
+        raise RowError(f"Invalid hire_date: {hire_date}")
+
+    salary = data["salary"]
+    if salary is not None:
+        try:
+            salary = Decimal(str(salary)).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise RowError(f"Invalid salary: {data['salary']}")
+        if salary < 0:
+            raise RowError("Salary cannot be negative.")
+        if len(salary.as_tuple().digits) > 10:
+            raise RowError("Salary is too large.")
+        data["salary"] = salary
+
+    status = data["status"] or Employee.Status.ACTIVE
+    if status not in _STATUSES:
+        raise RowError(f"Status must be one of: {', '.join(sorted(_STATUSES))}")
+    data["status"] = status
+    return data
+
+
+# Header aliases accepted by the CSV and NDJSON readers: the layout's own
+# snake_case names plus the camelCase names the API uses.
+HEADER_ALIASES = {column: column for column in COLUMNS}
+HEADER_ALIASES.update(
+    {
+        "firstName": "first_name",
+        "lastName": "last_name",
+        "hireDate": "hire_date",
+        "managerEmail": "manager_email",
+    }
+)
+
+
+def _open_text(file):
+    """Open a path or a binary upload as UTF-8 text (BOM tolerated)."""
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, encoding="utf-8-sig", newline="")
+    return io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+
+def read_csv_rows(file):
+    """
+    Stream ``(row_number, values)`` from a CSV file.
+
+    If the header row names columns (in any order, snake_case or
+    camelCase), rows are reordered to ``COLUMNS``, and a header with an
+    unknown name or without a required column raises ValueError. A header
+    naming no known column is skipped and the columns are taken
+    positionally, like the spreadsheet import.
+    """
+    with _open_text(file) as text:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        names = [HEADER_ALIASES.get(name) for name in header]
+        order = None
+        if any(names):
+            _check_header(header, names)
+            order = [names.index(column) for column in COLUMNS if column in names]
+        for row_number, values in enumerate(reader, start=2):
+            if not any(values):
+                continue
+            if order is not None:
+                values = [values[i] if i < len(values) else None for i in order]
+            yield row_number, values
+
+
+def _check_header(header: list[str], names: list[str | None]):
+    problems = []
+    unknown = [name for name, column in zip(header, names) if name and not column]
+    if unknown:
+        problems.append(f"Unknown CSV column(s): {', '.join(unknown)}.")
+    missing = [
+        column
+        for column in COLUMNS
+        if column not in names and column not in OPTIONAL_COLUMNS
+    ]
+    if missing:
+        problems.append(f"Missing CSV column(s): {', '.join(missing)}.")
+    if problems:
+        raise ValueError(" ".join(problems))
+
+
+def read_ndjson_rows(file):
+    """
+    Stream ``(row_number, values)`` from newline-delimited JSON objects
+    keyed by column name. Lines that are not JSON objects are yielded as
+    RowError so they are reported like any other bad row.
+    """
+    with _open_text(file) as text:
+        for row_number, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield row_number, RowError("Invalid JSON.")
+                continue
+            if not isinstance(record, dict):
+                yield row_number, RowError("Expected a JSON object.")
+                continue
+            fields = {
+                HEADER_ALIASES[key]: value
+                for key, value in record.items()
+                if key in HEADER_ALIASES
+            }
+            yield row_number, [
+                fields.get(column)
+                for column in COLUMNS
+                if column in fields or column not in OPTIONAL_COLUMNS
+            ]
+
+
+def read_xlsx_rows(file):
+    """
+    Stream ``(row_number, values)`` from the first sheet of a workbook,
+    skipping the header row and blank rows. Uses openpyxl's read-only mode,
+    which parses the sheet lazily instead of building every cell up front.
+    """
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = wb.active
+        for row_number, values in enumerate(
+            sheet.iter_rows(min_row=2, values_only=True), start=2
+        ):
+            if any(value is not None and value != "" for value in values):
+                yield row_number, values
+    finally:
+        wb.close()
+
+
+def reader_for_filename(filename: str):
+    """
+    Pick a row reader from a file extension (.csv, .ndjson/.jsonl, else xlsx).
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return read_csv_rows
+    if extension in (".ndjson", ".jsonl"):
+        return read_ndjson_rows
+    return read_xlsx_rows
+
+
+class EmployeeImporter:
+    """
+    Set-based import pipeline.
+
+    Rows are validated and processed in fixed-size chunks: each chunk looks
+    up every email it contains with one ``IN`` query, then writes new rows
+    with ``bulk_create`` and matched rows with ``bulk_update``. Bad rows are
+    collected as per-row errors instead of aborting the import.
+
+    The importer does not open transactions itself; callers choose the scope
+    (one for the whole file, or one per chunk).
+    """
+
+    def __init__(self, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.errors = []
+
+    def chunks(self, rows):
+        """
+        Group ``(row_number, values)`` pairs into lists of ``chunk_size``.
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, rows, on_chunk=None) -> dict:
+        """
+        Import every row. ``on_chunk(changes)`` is called after each chunk
+        is written, with the EmployeeChanges for that chunk.
+        """
+        for chunk in self.chunks(rows):
+            changes = self.import_chunk(chunk)
+            if on_chunk is not None:
+                on_chunk(changes)
+        return self.result()
+
+    def import_chunk(self, chunk) -> EmployeeChanges:
+        """
+        Validate and write one chunk; returns what it changed.
+
+        An email on several rows of the chunk is one employee: the last
+        row wins and the employee is counted once, as created, updated or
+        unchanged.
+        """
+        self.processed += len(chunk)
+        cleaned = []
+        for row_number, values in chunk:
+            try:
+                cleaned.append((row_number, clean_row(values)))
+            except RowError as e:
+                self.add_error(row_number, str(e))
+
+        emails = {data["email"] for _, data in cleaned if data["email"]}
+        # Managers are looked up in the same query as the rows' own emails.
+        emails.update(
+            data["manager_email"] for _, data in cleaned if data.get("manager_email")
+        )
+        existing = EmployeeRepository.get_employees_by_emails(emails)
+        # Current managers above the existing managers named here, so rows
+        # that would close a reporting loop fail alone instead of the
+        # hierarchy update failing the whole write.
+        named = {
+            existing[data["manager_email"]].pk
+            for _, data in cleaned
+            if data.get("manager_email") in existing
+        }
+        managers = HierarchyService.get_managers_above(named) if named else {}
+        # Manager changes made by earlier rows of this chunk; new employees
+        # are keyed by email until they have an id.
+        assigned = {}
+
+        to_create = []
+        pending = {}  # email -> unsaved Employee from earlier in this chunk
+        to_update = {}  # pk -> Employee
+        before = {}  # pk -> snapshot taken before the first change
+        # id(Employee) -> (Employee, manager) for managers created by this
+        # chunk, whose ids are only known once it is inserted.
+        unsaved_managers = {}
+        outcomes = {}  # id(Employee) -> "created", "updated" or "unchanged"
+        now = timezone.now()
+        for row_number, data in cleaned:
+            email = data["email"]
+            manager = None
+            if "manager_email" in data:
+                manager_email = data.pop("manager_email")
+                if manager_email is None:
+                    data["manager_id"] = None
+                elif manager_email == email:
+                    self.add_error(row_number, "An employee cannot manage themselves.")
+                    continue
+                elif manager_email in existing:
+                    data["manager_id"] = existing[manager_email].pk
+                elif manager_email in pending:
+                    manager = pending[manager_email]
+                else:
+                    self.add_error(
+                        row_number, f"Unknown manager_email: {manager_email}"
+                    )
+                    continue
+                node = existing[email].pk if email in existing else email
+                above = manager_email and (
+                    existing[manager_email].pk
+                    if manager_email in existing
+                    else manager_email
+                )
+                if _reports_to(above, node, assigned, managers):
+                    self.add_error(
+                        row_number,
+                        f"{manager_email} reports to {email}; it cannot also "
+                        "manage them.",
+                    )
+                    continue
+                assigned[node] = above
+
+            employee = existing.get(email) if email else None
+            if employee is None and email in pending:
+                # Same new email twice in one chunk: the later row wins.
+                employee = pending[email]
+                for field, value in data.items():
+                    setattr(employee, field, value)
+            elif employee is None:
+                employee = Employee(**data)
+                to_create.append(employee)
+                if email:
+                    pending[email] = employee
+                outcomes[id(employee)] = "created"
+            else:
+                # A manager new in this chunk is always a change.
+                changed = manager is not None
+                if changed:
+                    before.setdefault(employee.pk, snapshot(employee))
+                for field, value in data.items():
+                    if getattr(employee, field) != value:
+                        before.setdefault(employee.pk, snapshot(employee))
+                        setattr(employee, field, value)
+                        changed = True
+                if changed:
+                    employee.updated_at = now
+                    # Re-queued at its latest row, so the hierarchy applies
+                    # manager changes in the order they were checked above.
+                    to_update.pop(employee.pk, None)
+                    to_update[employee.pk] = employee
+                    outcomes[id(employee)] = "updated"
+                else:
+                    outcomes.setdefault(id(employee), "unchanged")
+
+            if "manager_id" in data:
+                unsaved_managers.pop(id(employee), None)
+            elif manager is not None:
+                unsaved_managers[id(employee)] = (employee, manager)
+
+        counts = Counter(outcomes.values())
+        self.created += counts["created"]
+        self.updated += counts["updated"]
+        self.unchanged += counts["unchanged"]
+
+        if to_create:
+            EmployeeRepository.bulk_create_employees(to_create, WRITE_BATCH_SIZE)
+        relinked = []
+        for employee, manager in unsaved_managers.values():
+            employee.manager_id = manager.pk
+            if employee.pk not in to_update:
+                relinked.append(employee)
+        if relinked:
+            # Created with no manager above; point them at theirs.
+            EmployeeRepository.bulk_update_employees(
+                relinked, ["manager"], WRITE_BATCH_SIZE
+            )
+        if to_update:
+            EmployeeRepository.bulk_update_employees(
+                list(to_update.values()), UPDATE_FIELDS, WRITE_BATCH_SIZE
+            )
+
+        return EmployeeChanges(
+            created=[snapshot(employee) for employee in to_create],
+            updated=[
+                (before[pk], snapshot(employee)) for pk, employee in to_update.items()
+            ],
+        )
+
+    def add_error(self, row_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def result(self) -> dict:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def _reports_to(node, target, assigned: dict, managers: dict) -> bool:
+    """
+    Whether walking up from ``node`` reaches ``target``, following this
+    chunk's manager changes (``assigned``) before the stored ones.
+    """
+    seen = set()
+    while node is not None and node not in seen:
+        if node == target:
+            return True
+        seen.add(node)
+        node = assigned[node] if node in assigned else managers.get(node)
+    return False
@@ -0,0 +1,168 @@
+import datetime
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from ..models import ImportJob
+from .employee_service import EmployeeService
+from .import_service import EmployeeImporter, reader_for_filename, read_xlsx_rows
+from .write_queue import write_transaction
+
+_config = getattr(settings, "EMPLOYEE_JOBS", {})
+
+STALE_AFTER = datetime.timedelta(minutes=_config.get("STALE_MINUTES", 30))
+STALE_MESSAGE = "Import stopped: its worker exited before the job finished."
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool that runs background jobs, created on first use.
+    One worker by default: SQLite has a single writer, so parallel imports
+    would only queue on the write lock.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_config.get("WORKERS", 1),
+                thread_name_prefix="employee-jobs",
+            )
+        return _executor
+
+
+def run_in_background(fn, *args):
+    """
+    Submit ``fn(*args)`` to the job pool. The worker thread gets its own DB
+    connections, which are closed once the call finishes.
+    """
+
+    def task():
+        close_old_connections()
+        try:
+            return fn(*args)
+        finally:
+            connections.close_all()
+
+    return get_executor().submit(task)
+
+
+class ImportJobService:
+    @staticmethod
+    def start_import(uploaded_file, reader=None) -> ImportJob:
+        """
+        Copy an upload to a temp file, record a pending job, and import it in
+        the background. Returns the job immediately.
+
+        ``reader`` turns a file path into ``(row_number, values)`` pairs; by
+        default it is picked from the file extension (xlsx, csv or ndjson).
+        """
+        reader = reader or reader_for_filename(uploaded_file.name)
+        suffix = os.path.splitext(uploaded_file.name or "")[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+            for chunk in uploaded_file.chunks():
+                spool.write(chunk)
+            path = spool.name
+
+        return ImportJobService._create_job(uploaded_file.name or "", path, reader)
+
+    @staticmethod
+    @write_transaction
+    def _create_job(filename: str, path: str, reader) -> ImportJob:
+        job = ImportJob.objects.create(filename=filename)
+        # Only hand the job to the pool once its row is committed.
+        transaction.on_commit(
+            lambda: run_in_background(ImportJobService.run_import, job.pk, path, reader)
+        )
+        return job
+
+    @staticmethod
+    def get_job(job_id) -> ImportJob | None:
+        try:
+            return ImportJob.objects.get(pk=job_id)
+        except ImportJob.DoesNotExist:
+            return None
+
+    @staticmethod
+    def run_import(job_id, path: str, reader=read_xlsx_rows):
+        """
+        Import a spooled file, committing one transaction per chunk so other
+        writers can interleave, and recording progress after each chunk.
+        The file is removed however the import ends.
+        """
+        importer = EmployeeImporter()
+        try:
+            ImportJobService._mark_running(job_id)
+            for chunk in importer.chunks(reader(path)):
+                ImportJobService._import_chunk(job_id, importer, chunk)
+        except Exception as e:
+            ImportJobService._record_progress(
+                job_id,
+                importer,
+                status=ImportJob.Status.FAILED,
+                message=str(e),
+                finished_at=timezone.now(),
+            )
+            raise
+        else:
+            ImportJobService._record_progress(
+                job_id,
+                importer,
+                status=ImportJob.Status.SUCCEEDED,
+                finished_at=timezone.now(),
+            )
+        finally:
+            os.unlink(path)
+
+    @staticmethod
+    @write_transaction
+    def fail_stale_jobs() -> int:
+        """
+        Mark running jobs that have recorded no progress for STALE_AFTER as
+        failed: the process running them has died, so they would otherwise
+        stay "running" forever. Returns the count.
+        """
+        now = timezone.now()
+        return ImportJob.objects.filter(
+            status=ImportJob.Status.RUNNING, updated_at__lt=now - STALE_AFTER
+        ).update(
+            status=ImportJob.Status.FAILED,
+            message=STALE_MESSAGE,
+            finished_at=now,
+            updated_at=now,
+        )
+
+    @staticmethod
+    @write_transaction
+    def _mark_running(job_id):
+        now = timezone.now()
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJob.Status.RUNNING, started_at=now, updated_at=now
+        )
+
+    @staticmethod
+    @write_transaction
+    def _import_chunk(job_id, importer: EmployeeImporter, chunk):
+        EmployeeService.publish(importer.import_chunk(chunk))
+        ImportJobService._record_progress(job_id, importer)
+
+    @staticmethod
+    @write_transaction
+    def _record_progress(job_id, importer: EmployeeImporter, **extra):
+        ImportJob.objects.filter(pk=job_id).update(
+            rows_processed=importer.processed,
+            rows_created=importer.created,
+            rows_updated=importer.updated,
+            rows_unchanged=importer.unchanged,
+            rows_failed=importer.failed,
+            errors=importer.errors,
+            updated_at=timezone.now(),
+            **extra,
+        )
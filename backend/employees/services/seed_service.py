@@ -0,0 +1,314 @@
+"""
+Synthetic employees for load testing (``manage.py seed_employees``).
+"""
+
+import datetime
+import random
+from decimal import Decimal
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from ..models import Employee
+from ..repositories.employee_repo import EmployeeRepository
+from ..repositories.generation_repo import GenerationRepository
+from ..repositories.search_repo import EmployeeSearchRepository
+from .changes import EmployeeChanges, snapshot
+from .employee_service import EmployeeService
+from .hierarchy_service import HierarchyService
+from .history_service import HistoryService
+from .summary_service import SummaryService
+from .write_queue import write_transaction
+
+DEFAULT_DEPARTMENTS = {
+    "Engineering": 30,
+    "Sales": 20,
+    "Support": 15,
+    "Operations": 10,
+    "Marketing": 8,
+    "Finance": 7,
+    "Human Resources": 5,
+    "Legal": 5,
+}
+DEFAULT_POSITIONS = {
+    "Associate": 30,
+    "Specialist": 25,
+    "Analyst": 15,
+    "Engineer": 15,
+    "Manager": 10,
+    "Director": 5,
+}
+DEFAULT_STATUSES = {"active": 85, "inactive": 10, "on_leave": 5}
+
+FIRST_NAMES = [
+    "Ava",
+    "Liam",
+    "Noah",
+    "Emma",
+    "Mia",
+    "Lucas",
+    "Zoë",
+    "Omar",
+    "Priya",
+    "Kenji",
+    "Sofia",
+    "Mateo",
+    "Amara",
+    "Ivan",
+    "Chloé",
+    "Yusuf",
+    "Hana",
+    "Diego",
+    "Ingrid",
+    "Kwame",
+    "Leila",
+    "Tomás",
+    "Mei",
+    "Arjun",
+]
+LAST_NAMES = [
+    "Smith",
+    "Johnson",
+    "García",
+    "Nguyen",
+    "Patel",
+    "Kim",
+    "Müller",
+    "Rossi",
+    "Okafor",
+    "Silva",
+    "Cohen",
+    "Novak",
+    "Haddad",
+    "Larsen",
+    "Tanaka",
+    "O'Brien",
+    "Kowalski",
+    "Dubois",
+    "Ivanova",
+    "Mensah",
+]
+
+# Field order of generated rows.
+SEED_COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "department",
+    "position",
+    "hire_date",
+    "salary",
+    "status",
+]
+
+_DEPARTMENT, _POSITION, _STATUS, _SALARY = (
+    SEED_COLUMNS.index(name) for name in ("department", "position", "status", "salary")
+)
+
+MAX_SALARY = 99_999_999.99  # DecimalField(max_digits=10, decimal_places=2)
+
+
+def parse_weights(spec: str) -> dict[str, float]:
+    """
+    "Engineering=40,Sales=20,Legal" -> {"Engineering": 40.0, "Sales": 20.0,
+    "Legal": 1.0}. Raises ValueError on a malformed or negative weight.
+    """
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        value = float(weight) if weight.strip() else 1.0
+        if value < 0:
+            raise ValueError(f"negative weight for {name!r}")
+        weights[name] = value
+    if not weights or not any(weights.values()):
+        raise ValueError("at least one positive weight is required")
+    return weights
+
+
+@dataclass
+class EmployeeGenerator:
+    """
+    Deterministic synthetic employees. ``rows(start, count)`` returns the
+    same rows for the same settings whichever process calls it, so chunks
+    can be generated in parallel. Row ``n`` gets the email
+    ``<email_prefix><n>@<email_domain>``.
+
+    Rows are tuples in SEED_COLUMNS order with database-ready values: ISO
+    hire dates and salaries as two-decimal strings. Salaries are
+    log-normal around ``salary_median``; ``salary_spread`` is the sigma.
+    """
+
+    departments: dict
+    positions: dict
+    statuses: dict
+    hired_from: datetime.date
+    hired_to: datetime.date
+    salary_median: float = 85_000
+    salary_spread: float = 0.35
+    email_prefix: str = "seed"
+    email_domain: str = "example.com"
+    seed: int = 0
+
+    def rows(self, start: int, count: int) -> list[tuple]:
+        rng = random.Random(f"{self.seed}:{start}")
+        first_names = rng.choices(FIRST_NAMES, k=count)
+        last_names = rng.choices(LAST_NAMES, k=count)
+        departments = rng.choices(
+            list(self.departments), list(self.departments.values()), k=count
+        )
+        positions = rng.choices(
+            list(self.positions), list(self.positions.values()), k=count
+        )
+        statuses = rng.choices(
+            list(self.statuses), list(self.statuses.values()), k=count
+        )
+        # random() arithmetic instead of randint/randrange: several times
+        # faster, and the tiny bias does not matter for test data.
+        random_ = rng.random
+        days = (self.hired_to - self.hired_from).days + 1
+        hired_from = self.hired_from.toordinal()
+        hire_dates = [
+            datetime.date.fromordinal(hired_from + int(random_() * days)).isoformat()
+            for _ in range(count)
+        ]
+        lognormal = rng.lognormvariate
+        median = self.salary_median
+        spread = self.salary_spread
+        salaries = [
+            f"{min(median * lognormal(0, spread), MAX_SALARY):.2f}"
+            for _ in range(count)
+        ]
+        return [
+            (
+                first_names[i],
+                last_names[i],
+                f"{self.email_prefix}{start + i}@{self.email_domain}",
+                f"+1 (555) {100 + int(random_() * 900)}-{1000 + int(random_() * 9000)}",
+                departments[i],
+                positions[i],
+                hire_dates[i],
+                salaries[i],
+                statuses[i],
+            )
+            for i in range(count)
+        ]
+
+    def chunk(self, spec: tuple[int, int]) -> list[tuple]:
+        """
+        ``rows(*spec)``, for ``Pool.imap``.
+        """
+        return self.rows(*spec)
+
+
+class SeedService:
+    @staticmethod
+    @write_transaction
+    def insert_rows(rows: list[tuple], publish: bool = True) -> int:
+        """
+        Write one chunk of generated rows with a single executemany and
+        publish them, in one transaction. Returns the rows written.
+
+        With ``publish=False`` derived state is left alone, for a
+        ``bulk_load`` that rebuilds it once at the end.
+        """
+        if not publish:
+            EmployeeRepository.insert_rows(SEED_COLUMNS, rows)
+            return len(rows)
+        last_id = EmployeeRepository.get_max_id()
+        EmployeeRepository.insert_rows(SEED_COLUMNS, rows)
+        # The writer holds the database lock, so the new ids are exactly
+        # those above last_id, in insertion order.
+        ids = EmployeeRepository.get_ids_after(last_id)
+        created = [
+            {
+                "id": employee_id,
+                "department": row[_DEPARTMENT],
+                "position": row[_POSITION],
+                "status": row[_STATUS],
+                "salary": Decimal(row[_SALARY]),
+                "manager_id": None,
+            }
+            for employee_id, row in zip(ids, rows)
+        ]
+        EmployeeService.publish(EmployeeChanges(created=created))
+        return len(created)
+
+    @staticmethod
+    @write_transaction
+    def bulk_create_rows(rows: list[tuple], publish: bool = True) -> int:
+        """
+        ``insert_rows`` through Employee model instances and bulk_create.
+        """
+        employees = [Employee(**dict(zip(SEED_COLUMNS, row))) for row in rows]
+        EmployeeRepository.bulk_create_employees(employees, batch_size=len(employees))
+        if publish:
+            EmployeeService.publish(
+                EmployeeChanges(created=[snapshot(employee) for employee in employees])
+            )
+        return len(employees)
+
+    @staticmethod
+    def next_email_number(prefix: str, domain: str) -> int:
+        """
+        One past the number in the newest ``<prefix><n>@<domain>`` email,
+        so repeated seeding keeps emails unique.
+        """
+        email = EmployeeRepository.get_latest_email_like(prefix, f"@{domain}")
+        if email is None:
+            return 0
+        number = email[len(prefix) : -len(domain) - 1]
+        return int(number) + 1 if number.isdigit() else 0
+
+    @staticmethod
+    @contextmanager
+    def bulk_load():
+        """
+        Drop the employee table's secondary indexes and the full-text index
+        for a bulk load, then rebuild them once from the table. Building an
+        index from a full table is several times cheaper than updating it
+        row by row. Rows written inside are expected unpublished
+        (``publish=False``); derived state is rebuilt with the indexes.
+        Filtered reads are slow, searches fail and the summary lags during
+        the load; if it is interrupted, ``restore_indexes`` and
+        ``rebuild_derived`` repair the table.
+        """
+        EmployeeRepository.drop_indexes()
+        if EmployeeSearchRepository.is_supported():
+            EmployeeSearchRepository.uninstall()
+        try:
+            yield
+        finally:
+            SeedService.restore_indexes()
+            SeedService.rebuild_derived()
+
+    @staticmethod
+    def restore_indexes() -> list[str]:
+        """
+        Recreate whatever ``bulk_load`` dropped. Returns what was rebuilt.
+        """
+        restored = EmployeeRepository.create_missing_indexes()
+        if EmployeeSearchRepository.is_supported():
+            EmployeeSearchRepository.install()
+            EmployeeSearchRepository.rebuild()
+            restored.append("full-text index")
+        return restored
+
+    @staticmethod
+    @write_transaction
+    def rebuild_derived() -> list[str]:
+        """
+        Bring what ``EmployeeService.publish`` maintains in line with the
+        table, one set-based statement each, for rows written unpublished:
+        the summary and closure tables are recomputed, employees without
+        history get their "created" row, and the data generation moves on
+        so caches and the autocomplete index reload. Returns what was
+        rebuilt.
+        """
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        GenerationRepository.bump()
+        return ["summary", "hierarchy", "history"]
@@ -0,0 +1,96 @@
+"""
+Full-directory snapshot: every employee as one pre-rendered, gzipped JSON
+document, served as-is by ``GET /api/employees/snapshot/``.
+
+A snapshot is dirty once the data generation moves past the one it was
+built from; ``EmployeeService.publish`` bumps the generation on every
+write, so no write path needs to know about snapshots. Rebuilds are lazy:
+a request that finds the snapshot dirty (or missing) starts one in a
+background thread and is answered from the existing file meanwhile.
+"""
+
+import threading
+
+from django.db import close_old_connections, connections
+
+from ..renderers import render_json
+from ..repositories.employee_repo import EmployeeRepository
+from ..repositories.generation_repo import GenerationRepository
+from ..serializers import EmployeeRowSerializer
+from ..snapshot import snapshot_store
+
+_building = threading.Lock()
+
+
+class SnapshotService:
+    @staticmethod
+    def open_snapshot():
+        """
+        Returns ``(generation, file, stale)`` for the newest snapshot, or
+        None if none has been built yet. Starts a background rebuild when
+        the snapshot is stale or missing.
+        """
+        current = GenerationRepository.current()
+        latest = snapshot_store.open_latest()
+        stale = latest is None or latest[0] < current
+        if stale:
+            SnapshotService.rebuild_in_background()
+        if latest is None:
+            return None
+        generation, file = latest
+        return generation, file, stale
+
+    @staticmethod
+    def rebuild_in_background() -> bool:
+        """
+        Start a rebuild thread unless this process is already building.
+        Returns whether one was started.
+        """
+        if not _building.acquire(blocking=False):
+            return False
+
+        def task():
+            close_old_connections()
+            try:
+                SnapshotService.rebuild()
+            finally:
+                connections.close_all()
+                _building.release()
+
+        threading.Thread(target=task, name="employee-snapshot", daemon=True).start()
+        return True
+
+    @staticmethod
+    def rebuild() -> int | None:
+        """
+        Render every employee into a new snapshot unless the newest one is
+        current or another process holds the build lock. Returns the
+        generation built, or None if nothing was built.
+
+        The generation is read before the rows, so a write that lands
+        mid-build leaves the new file already stale rather than labelled
+        newer than its contents.
+        """
+        with snapshot_store.build_lock() as locked:
+            if not locked:
+                return None
+            generation = GenerationRepository.current()
+            latest = snapshot_store.latest()
+            if latest is not None and latest[0] >= generation:
+                return None
+            serializer = EmployeeRowSerializer()
+            count = 0
+            with snapshot_store.writer(generation) as stream:
+                stream.write(b'{"generation":%d,"results":[' % generation)
+                for chunk in EmployeeRepository.iter_employee_chunks(
+                    serializer.sources
+                ):
+                    if count:
+                        stream.write(b",")
+                    # Each chunk renders as "[...]"; keep the items only.
+                    stream.write(
+                        render_json(serializer.to_representation(chunk))[1:-1]
+                    )
+                    count += len(chunk)
+                stream.write(b'],"count":%d}' % count)
+            return generation
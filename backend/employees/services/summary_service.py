@@ -0,0 +1,168 @@
+from decimal import Decimal
+
+from ..models import Employee
+from ..repositories.summary_repo import SummaryRepository
+from .changes import EmployeeChanges
+
+_CENTS = Decimal("0.01")
+_STATUSES = [choice for choice, _ in Employee.Status.choices]
+
+
+def _empty_delta():
+    return {
+        "headcount": 0,
+        "salary_count": 0,
+        "salary_total": Decimal("0"),
+        "added_min": None,
+        "added_max": None,
+        "removed_min": None,
+        "removed_max": None,
+    }
+
+
+def _add(deltas, row, sign):
+    key = (row["department"], row["status"])
+    delta = deltas.get(key)
+    if delta is None:
+        delta = deltas[key] = _empty_delta()
+    delta["headcount"] += sign
+    salary = row["salary"]
+    if salary is None:
+        return
+    if not isinstance(salary, Decimal):
+        salary = Decimal(salary)
+    delta["salary_count"] += sign
+    delta["salary_total"] += sign * salary
+    low, high = ("added_min", "added_max") if sign > 0 else ("removed_min", "removed_max")
+    delta[low] = salary if delta[low] is None else min(delta[low], salary)
+    delta[high] = salary if delta[high] is None else max(delta[high], salary)
+
+
+def _group_changed(before, after):
+    return any(before[key] != after[key] for key in ("department", "status", "salary"))
+
+
+class SummaryService:
+    @staticmethod
+    def apply(changes: EmployeeChanges):
+        """
+        Fold a change set into the summary table: each changed row is removed
+        from its old (department, status) group and added to its new one, and
+        the net delta per group is written in one UPDATE.
+        """
+        deltas = {}
+        for row in changes.created:
+            _add(deltas, row, 1)
+        for before, after in changes.updated:
+            if _group_changed(before, after):
+                _add(deltas, before, -1)
+                _add(deltas, after, 1)
+        for row in changes.deleted:
+            _add(deltas, row, -1)
+        SummaryRepository.apply_deltas(deltas)
+
+    @staticmethod
+    def get_summary() -> dict:
+        """
+        Headcount by department and status plus salary total/min/max/mean per
+        department, read from the summary table in O(departments).
+        """
+        departments = {}
+        for row in SummaryRepository.get_rows():
+            department = departments.setdefault(
+                row["department"],
+                {
+                    "department": row["department"],
+                    "headcount": 0,
+                    "statusCounts": {status: 0 for status in _STATUSES},
+                    "salaryCount": 0,
+                    "salaryTotal": Decimal("0"),
+                    "salaryMin": None,
+                    "salaryMax": None,
+                },
+            )
+            department["headcount"] += row["headcount"]
+            department["statusCounts"][row["status"]] = row["headcount"]
+            department["salaryCount"] += row["salary_count"]
+            department["salaryTotal"] += row["salary_total"]
+            for key, column, pick in (
+                ("salaryMin", "salary_min", min),
+                ("salaryMax", "salary_max", max),
+            ):
+                if row[column] is not None:
+                    current = department[key]
+                    department[key] = (
+                        row[column] if current is None else pick(current, row[column])
+                    )
+
+        totals = {
+            "headcount": 0,
+            "statusCounts": {status: 0 for status in _STATUSES},
+        }
+        results = []
+        for name in sorted(departments):
+            department = departments[name]
+            count = department["salaryCount"]
+            mean = (department["salaryTotal"] / count).quantize(_CENTS) if count else None
+            totals["headcount"] += department["headcount"]
+            for status, value in department["statusCounts"].items():
+                totals["statusCounts"][status] += value
+            results.append(
+                {
+                    **department,
+                    "salaryTotal": _money(department["salaryTotal"]),
+                    "salaryMin": _money(department["salaryMin"]),
+                    "salaryMax": _money(department["salaryMax"]),
+                    "salaryMean": _money(mean),
+                }
+            )
+        return {"departments": results, "totals": totals}
+
+    @staticmethod
+    def rebuild() -> int:
+        return SummaryRepository.rebuild()
+
+    @staticmethod
+    def find_drift() -> list[dict]:
+        """
+        Compare the maintained summary with a fresh GROUP BY and return the
+        groups that differ (empty when the table is correct).
+        """
+        fields = ["headcount", "salary_count", "salary_total", "salary_min", "salary_max"]
+        stored = {
+            (row["department"], row["status"]): row
+            for row in SummaryRepository.get_rows()
+        }
+        fresh = {
+            (row["department"], row["status"]): row
+            for row in SummaryRepository.compute_from_employees()
+        }
+        drift = []
+        for key in sorted(set(stored) | set(fresh)):
+            have = stored.get(key)
+            want = fresh.get(key)
+            mismatched = [
+                name
+                for name in fields
+                if _normalize(have[name] if have else None)
+                != _normalize(want[name] if want else None)
+            ]
+            if mismatched:
+                drift.append(
+                    {
+                        "department": key[0],
+                        "status": key[1],
+                        "fields": mismatched,
+                        "stored": have,
+                        "expected": want,
+                    }
+                )
+        return drift
+
+
+def _normalize(value):
+    return None if value is None else Decimal(value).quantize(_CENTS)
+
+
+def _money(value):
+    return None if value is None else "{:f}".format(Decimal(value).quantize(_CENTS))
@@ -0,0 +1,102 @@
+import contextvars
+import functools
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+class WriteQueue:
+    """
+    Runs write transactions one at a time on a dedicated writer thread.
+
+    SQLite allows a single writer per file. Rather than letting request
+    threads race for the lock, each write is queued and the caller blocks
+    until the writer thread has committed (or rolled back) it, so
+    concurrent mutations queue up in arrival order instead of failing.
+    Writers in other processes are serialised by SQLite itself: the
+    writer's transactions start with BEGIN IMMEDIATE and wait out the busy
+    timeout (see backend/db).
+
+    Queued calls run in a copy of the caller's context, so context
+    variables such as the request's metrics follow them. Nested calls from
+    the writer thread run inline in the current transaction, as do calls
+    from a thread already inside a transaction on ``using``: its
+    connection holds the write lock, so the writer thread could only wait
+    for it. With ``enabled=False`` calls run in the caller's thread, still
+    inside a transaction.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, enabled: bool = True):
+        self.using = using
+        self.enabled = enabled
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` in a write transaction and return its
+        result; exceptions are re-raised in the caller.
+        """
+        if (
+            not self.enabled
+            or threading.current_thread() is self._thread
+            or connections[self.using].in_atomic_block
+        ):
+            return self._atomic(fn, args, kwargs)
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((future, contextvars.copy_context(), fn, args, kwargs))
+        return future.result()
+
+    def _ensure_thread(self):
+        with self._lock:
+            # A forked worker inherits the object but not the thread.
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(
+                    target=self._work, name="employee-writer", daemon=True
+                )
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def _work(self):
+        connection = connections[self.using]
+        while True:
+            future, context, fn, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            # No request cycle on this thread: apply CONN_MAX_AGE and drop
+            # broken connections here.
+            connection.close_if_unusable_or_obsolete()
+            try:
+                result = context.run(self._atomic, fn, args, kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _atomic(self, fn, args, kwargs):
+        with transaction.atomic(using=self.using):
+            return fn(*args, **kwargs)
+
+
+_config = getattr(settings, "EMPLOYEE_WRITE_QUEUE", {})
+write_queue = WriteQueue(enabled=_config.get("ENABLED", True))
+
+
+def write_transaction(fn):
+    """
+    Decorator: run the function through the write queue.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return write_queue.run(fn, *args, **kwargs)
+
+    return wrapper
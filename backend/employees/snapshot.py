@@ -0,0 +1,111 @@
+"""
+On-disk store for the pre-rendered, gzipped full-directory snapshot
+(``GET /api/employees/snapshot/``).
+
+Each snapshot file is named after the data generation it was built from
+(see ``GenerationRepository``), so a write makes the newest file stale
+without touching it. Files are written to a temp name and renamed into
+place, so readers never see a partial file. Every worker process on the
+host shares the directory; an advisory lock lets only one of them build
+at a time.
+"""
+
+import fcntl
+import gzip
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+_NAME_RE = re.compile(r"^employees-(\d+)\.json\.gz$")
+
+
+class SnapshotStore:
+    def __init__(self, path, compresslevel: int = 6):
+        self.path = Path(path)
+        self.compresslevel = compresslevel
+
+    def latest(self) -> tuple[int, Path] | None:
+        """
+        (generation, path) of the newest snapshot, or None.
+        """
+        best = None
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return None
+        for name in names:
+            match = _NAME_RE.match(name)
+            if match and (best is None or int(match[1]) > best[0]):
+                best = (int(match[1]), self.path / name)
+        return best
+
+    def open_latest(self):
+        """
+        (generation, open binary file) of the newest snapshot, or None.
+        Retries if a newer build removes the file between listing and
+        opening it.
+        """
+        for _ in range(3):
+            latest = self.latest()
+            if latest is None:
+                return None
+            generation, path = latest
+            try:
+                return generation, open(path, "rb")
+            except FileNotFoundError:
+                continue
+        return None
+
+    @contextmanager
+    def build_lock(self):
+        """
+        Yields True if this process got the cross-process build lock (held
+        until the block exits), False if another process is building.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / "build.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def writer(self, generation: int):
+        """
+        Yields a gzip stream for the snapshot of ``generation``. On a clean
+        exit the file is moved into place and older snapshots are removed;
+        on an error it is discarded.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                fileobj=raw, mode="wb", compresslevel=self.compresslevel, mtime=0
+            ) as stream:
+                yield stream
+            os.replace(temp_path, self.path / f"employees-{generation}.json.gz")
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        for name in os.listdir(self.path):
+            match = _NAME_RE.match(name)
+            if match and int(match[1]) < generation:
+                # Readers that already opened it keep their handle.
+                (self.path / name).unlink(missing_ok=True)
+
+
+_config = getattr(settings, "EMPLOYEE_SNAPSHOT", {})
+
+snapshot_store = SnapshotStore(
+    _config.get("PATH", Path(settings.BASE_DIR) / "snapshots"),
+    compresslevel=_config.get("COMPRESSLEVEL", 6),
+)
@@ -0,0 +1,437 @@
+"""
+Shared fixtures for the employees tests: seeded employees, and the
+service operations whose SQL query counts the tests pin down, with their
+expected counts. benchmarks.bench_service times the same operations on
+large tables.
+
+Nothing here is imported at module level from Django, so benchmark
+scripts can import it before they set Django up.
+"""
+
+import datetime
+import io
+import itertools
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+DEPARTMENTS = [
+    "Engineering",
+    "Sales",
+    "Marketing",
+    "Finance",
+    "Human Resources",
+    "Operations",
+    "Support",
+    "Legal",
+]
+POSITIONS = ["Analyst", "Engineer", "Manager", "Director", "Associate", "Specialist"]
+
+
+def seed_employees(count, batch_size=5000, start=0):
+    """
+    Insert ``count`` employees, ``employee<n>@example.com``, through the
+    seed service in chunks of ``batch_size``. ``start`` offsets the
+    generated emails, so a table can be grown in steps. Rows are not
+    published: rebuild the summary, hierarchy and history afterwards.
+    """
+    from employees.services.seed_service import EmployeeGenerator, SeedService
+
+    generator = EmployeeGenerator(
+        departments=dict.fromkeys(DEPARTMENTS, 1),
+        positions=dict.fromkeys(POSITIONS, 1),
+        statuses={"active": 3, "inactive": 1, "on_leave": 1},
+        hired_from=datetime.date(2005, 1, 1),
+        hired_to=datetime.date(2024, 2, 29),
+        email_prefix="employee",
+    )
+    end = start + count
+    for offset in range(start, end, batch_size):
+        SeedService.insert_rows(
+            generator.rows(offset, min(batch_size, end - offset)), publish=False
+        )
+
+
+PAGE_SIZE = 25
+SEARCH_TERM = "engineer"
+IMPORT_UPDATES = 500
+IMPORT_CREATES = 500
+SALARY_ORDERING = ("-salary", "-id")
+UPSERT_TARGET = "upsert-target@example.com"
+REPLAY_KEY = "bench-upsert-replay"
+IMPORT_HEADER = (
+    "first_name,last_name,email,phone,department,position,hire_date,salary,status"
+)
+
+# Exact SQL statements per run, counted on every connection and thread.
+# Writes include the BEGIN IMMEDIATE that opens their transaction.
+EXPECTED_QUERIES = {
+    "list_page_first": 2,  # COUNT(*), page
+    "list_page_deep": 2,
+    "list_cursor_first": 1,  # page + 1 row, no COUNT
+    "list_cursor_deep": 1,
+    "list_cursor_salary_deep": 1,  # ?ordering=-salary, seek on its index
+    "search": 3,  # FTS COUNT, ranked rowids, page rows
+    # BEGIN, INSERT ... ON CONFLICT DO NOTHING, summary upsert + UPDATE,
+    # hierarchy INSERT, generation bump
+    "create": 6,
+    # BEGIN, key lookup, INSERT, summary upsert + UPDATE, hierarchy INSERT,
+    # generation bump, key INSERT
+    "upsert_create": 8,
+    # BEGIN, key lookup, INSERT (conflict, no-op), SELECT, UPDATE, summary
+    # upsert + UPDATE, generation bump, key INSERT
+    "upsert_update": 9,
+    "upsert_replay": 2,  # BEGIN, key lookup
+    # BEGIN, SELECT, UPDATE, summary upsert + UPDATE, generation bump
+    "update": 6,
+    # BEGIN, SELECT, DELETE, summary upsert + UPDATE, tombstone INSERT,
+    # reports UPDATE, hierarchy DELETE, generation bump
+    "delete": 9,
+    # For 1000 rows: BEGIN, 2 email lookups, 7 INSERT and 7 UPDATE
+    # batches (SQLite's 999-parameter limit), summary upsert + UPDATE,
+    # hierarchy INSERT, generation bump
+    "import_csv": 21,
+    "export_csv": 1,  # one chunked SELECT
+    "export_ndjson": 1,
+    "export_xlsx": 1,
+}
+
+
+@dataclass
+class Operation:
+    name: str
+    run: Callable
+    heavy: bool = False
+
+    @property
+    def queries(self) -> int:
+        return EXPECTED_QUERIES[self.name]
+
+
+OPERATIONS = {}
+
+
+def operation(name, heavy=False):
+    """
+    Register ``fn(suite)`` as a timed operation. Heavy operations (whole
+    table or file sized) run fewer times.
+    """
+
+    def decorator(fn):
+        OPERATIONS[name] = Operation(name, fn, heavy)
+        return fn
+
+    return decorator
+
+
+def count_queries(fn):
+    """
+    Call ``fn()`` and return (result, SQL statements it issued), counting
+    every connection and the write queue's writer thread.
+    """
+    from django.db import connections
+
+    from employees import metrics
+
+    for connection in connections.all(initialized_only=True):
+        metrics.install(connection)
+    request_metrics = metrics.RequestMetrics()
+    token = metrics.current.set(request_metrics)
+    try:
+        result = fn()
+    finally:
+        metrics.current.reset(token)
+    return result, request_metrics.queries
+
+
+class Suite:
+    """
+    Fixtures for the operations on the current table: a request factory,
+    ids to update and delete, deep page and cursor positions, and the
+    employees the import file updates.
+    """
+
+    def __init__(self):
+        from rest_framework.test import APIRequestFactory
+
+        self.factory = APIRequestFactory()
+        self.runs = itertools.count()
+        self.update_ids = []
+        self.delete_ids = []
+        self.deep_page = 1
+        self.deep_cursor = None
+
+    def prepare(self, deletes: int):
+        """
+        Pick fixtures for the table as it is now. Call after each growth
+        step, before running the operations.
+        """
+        from employees.models import Employee
+        from employees.pagination import EmployeeCursorPagination
+        from employees.services.employee_service import EmployeeService
+
+        # Deletes take the newest rows, updates the oldest, so they never
+        # collide with each other or the import targets created below.
+        self.delete_ids = list(
+            Employee.objects.order_by("-id").values_list("id", flat=True)[:deletes]
+        )
+        self.update_ids = list(
+            Employee.objects.order_by("id").values_list("id", flat=True)[:1000]
+        )
+        total = Employee.objects.count()
+        self.deep_page = max(1, (total // PAGE_SIZE) // 2)
+
+        self.deep_cursor = self.middle_cursor(EmployeeCursorPagination(), total)
+        self.salary_cursor = self.middle_cursor(
+            EmployeeCursorPagination(SALARY_ORDERING), total
+        )
+
+        if not Employee.objects.filter(email=UPSERT_TARGET).exists():
+            EmployeeService.upsert_employee(
+                _upsert_data(UPSERT_TARGET, 60000), idempotency_key=REPLAY_KEY
+            )
+
+        # The import file updates these and creates as many new rows. All
+        # of them are in one summary group, so every import run touches the
+        # same groups and issues the same statements.
+        if not Employee.objects.filter(email="import-target-0@example.com").exists():
+            EmployeeService.import_from_csv(
+                self.csv_file(
+                    _import_line(f"import-target-{k}@example.com", 60000)
+                    for k in range(IMPORT_UPDATES)
+                )
+            )
+
+    @staticmethod
+    def middle_cursor(paginator, total):
+        """
+        Cursor to the page after the middle row of the paginator's ordering.
+        """
+        from employees.models import Employee
+        from employees.pagination import order_expressions
+
+        paginator.base_url = "http://testserver/api/employees/"
+        middle = Employee.objects.order_by(
+            *order_expressions(paginator.ordering)
+        ).values(*paginator.required_columns)[total // 2]
+        next_link = paginator.encode_cursor(middle, reverse=False)
+        return parse_qs(urlsplit(next_link).query)["cursor"][0]
+
+    def request(self, **params):
+        from rest_framework.request import Request
+
+        return Request(self.factory.get("/api/employees/", params))
+
+    @staticmethod
+    def csv_file(lines):
+        upload = io.BytesIO("\n".join([IMPORT_HEADER, *lines]).encode("utf-8"))
+        upload.name = "bench.csv"
+        return upload
+
+
+def _upsert_data(email, salary):
+    return {
+        "firstName": "Bench",
+        "lastName": "Upsert",
+        "email": email,
+        "department": "Engineering",
+        "position": "Engineer",
+        "salary": salary,
+    }
+
+
+def _import_line(email, salary):
+    return f"Bench,Import,{email},,Engineering,Engineer,2020-01-01,{salary},active"
+
+
+def _page(paginator, queryset, request):
+    from employees.serializers import EmployeeRowSerializer
+
+    serializer = EmployeeRowSerializer()
+    rows = paginator.paginate_queryset(serializer.values(queryset), request)
+    return paginator.get_paginated_response(serializer.to_representation(rows)).data
+
+
+def _drain(response):
+    try:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    finally:
+        response.close()
+
+
+@operation("list_page_first")
+def list_page_first(suite):
+    from employees.models import Employee
+    from employees.pagination import EmployeePagination
+
+    return _page(
+        EmployeePagination(),
+        Employee.objects.all(),
+        suite.request(page=1, page_size=PAGE_SIZE),
+    )
+
+
+@operation("list_page_deep")
+def list_page_deep(suite):
+    from employees.models import Employee
+    from employees.pagination import EmployeePagination
+
+    return _page(
+        EmployeePagination(),
+        Employee.objects.all(),
+        suite.request(page=suite.deep_page, page_size=PAGE_SIZE),
+    )
+
+
+@operation("list_cursor_first")
+def list_cursor_first(suite):
+    from employees.models import Employee
+    from employees.pagination import EmployeeCursorPagination
+
+    return _page(
+        EmployeeCursorPagination(),
+        Employee.objects.all(),
+        suite.request(pagination="cursor", page_size=PAGE_SIZE),
+    )
+
+
+@operation("list_cursor_deep")
+def list_cursor_deep(suite):
+    from employees.models import Employee
+    from employees.pagination import EmployeeCursorPagination
+
+    return _page(
+        EmployeeCursorPagination(),
+        Employee.objects.all(),
+        suite.request(cursor=suite.deep_cursor, page_size=PAGE_SIZE),
+    )
+
+
+@operation("list_cursor_salary_deep")
+def list_cursor_salary_deep(suite):
+    from employees.models import Employee
+    from employees.pagination import EmployeeCursorPagination
+
+    return _page(
+        EmployeeCursorPagination(SALARY_ORDERING),
+        Employee.objects.all(),
+        suite.request(
+            ordering="-salary", cursor=suite.salary_cursor, page_size=PAGE_SIZE
+        ),
+    )
+
+
+@operation("search")
+def search(suite):
+    from employees.pagination import EmployeePagination
+    from employees.services.employee_service import EmployeeService
+
+    return _page(
+        EmployeePagination(),
+        EmployeeService.search_employees(SEARCH_TERM),
+        suite.request(search=SEARCH_TERM, page_size=PAGE_SIZE),
+    )
+
+
+@operation("create")
+def create(suite):
+    from employees.services.employee_service import EmployeeService
+
+    run = next(suite.runs)
+    return EmployeeService.create_employee(
+        {
+            "firstName": "Bench",
+            "lastName": "Create",
+            "email": f"bench-create-{run}@example.com",
+            "department": "Engineering",
+            "position": "Engineer",
+            "salary": 70000,
+        }
+    )
+
+
+@operation("update")
+def update(suite):
+    from employees.services.employee_service import EmployeeService
+
+    run = next(suite.runs)
+    # Seeded salaries stop at 250k, so this always changes the row.
+    return EmployeeService.update_employee(
+        suite.update_ids[run % len(suite.update_ids)],
+        {"salary": Decimal(300000 + run)},
+    )
+
+
+@operation("upsert_create")
+def upsert_create(suite):
+    from employees.services.employee_service import EmployeeService
+
+    run = next(suite.runs)
+    return EmployeeService.upsert_employee(
+        _upsert_data(f"bench-upsert-{run}@example.com", 70000),
+        idempotency_key=f"bench-upsert-create-{run}",
+    )
+
+
+@operation("upsert_update")
+def upsert_update(suite):
+    from employees.services.employee_service import EmployeeService
+
+    run = next(suite.runs)
+    return EmployeeService.upsert_employee(
+        _upsert_data(UPSERT_TARGET, 300000 + run),
+        idempotency_key=f"bench-upsert-update-{run}",
+    )
+
+
+@operation("upsert_replay")
+def upsert_replay(suite):
+    from employees.services.employee_service import EmployeeService
+
+    return EmployeeService.upsert_employee(
+        _upsert_data(UPSERT_TARGET, 60000), idempotency_key=REPLAY_KEY
+    )
+
+
+@operation("delete")
+def delete(suite):
+    from employees.services.employee_service import EmployeeService
+
+    return EmployeeService.delete_employee(suite.delete_ids.pop())
+
+
+@operation("import_csv", heavy=True)
+def import_csv(suite):
+    from employees.services.employee_service import EmployeeService
+
+    run = next(suite.runs)
+    lines = [
+        _import_line(f"import-target-{k}@example.com", 60001 + run)
+        for k in range(IMPORT_UPDATES)
+    ] + [
+        _import_line(f"import-new-{run}-{k}@example.com", 60000)
+        for k in range(IMPORT_CREATES)
+    ]
+    return EmployeeService.import_from_csv(suite.csv_file(lines))
+
+
+@operation("export_csv", heavy=True)
+def export_csv(suite):
+    from employees.services.employee_service import EmployeeService
+
+    return _drain(EmployeeService.export_to_csv())
+
+
+@operation("export_ndjson", heavy=True)
+def export_ndjson(suite):
+    from employees.services.employee_service import EmployeeService
+
+    return _drain(EmployeeService.export_to_ndjson())
+
+
+@operation("export_xlsx", heavy=True)
+def export_xlsx(suite):
+    from employees.services.employee_service import EmployeeService
+
+    return _drain(EmployeeService.export_to_excel())
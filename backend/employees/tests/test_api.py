@@ -0,0 +1,351 @@
+import base64
+import datetime
+import json
+from collections import Counter
+from decimal import Decimal
+from urllib import parse
+
+from django.db import connections
+from django.db.models import F
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ..autocomplete import autocomplete_index
+from ..cache import list_cache
+from ..models import Employee, EmployeeSummary, EmployeeTombstone
+from ..pagination import order_expressions, parse_ordering
+from ..ratelimit import bucket_store
+from ..renderers import render_json
+from ..serializers import EmployeeRowSerializer, EmployeeSerializer
+from ..services.autocomplete_service import AutocompleteService
+from ..services.employee_service import EmployeeService
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+from ..services.sync_service import SyncService
+from .fixtures import seed_employees
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class EmployeeApiTests(TransactionTestCase):
+    """
+    Behaviour of the read endpoints' fast paths, through the test client.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(30)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        list_cache.clear()
+
+    def get(self, path, data=None, **headers):
+        # Throttling is not under test: every request gets a full bucket.
+        bucket_store.clear()
+        return self.client.get(path, data, headers=headers)
+
+    def walk(self, params, between_pages=None):
+        """
+        Ids of every cursor page from the first, following ``next`` links.
+        """
+        ids = []
+        response = self.get(reverse("get-all-employees"), params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            ids.extend(row["id"] for row in page["results"])
+            if page["next"] is None:
+                return ids
+            if between_pages is not None:
+                between_pages()
+            response = self.get(page["next"])
+
+    def ids(self, *ordering):
+        return list(
+            Employee.objects.order_by(*(ordering or ["id"])).values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_list_conditional_get(self):
+        url = reverse("get-all-employees")
+        response = self.get(url)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, 304)
+
+        # Bad parameters are rejected even while the ETag still matches.
+        for params, code in (
+            ({"ordering": "bogus"}, 400),
+            ({"fields": "bogus"}, 400),
+            ({"search": "ava", "ordering": "-salary"}, 400),
+            ({"cursor": "garbage"}, 404),
+        ):
+            with self.subTest(params=params):
+                response = self.get(url, params, If_None_Match=etag)
+                self.assertEqual(response.status_code, code)
+
+        # The ETag follows the data generation, not the summary table.
+        EmployeeSummary.objects.update(headcount=F("headcount") + 1)
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, 304)
+        EmployeeService.delete_employee(Employee.objects.order_by("id")[0].id)
+        response = self.get(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 29)
+        since = datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%a, %d %b %Y %H:%M:%S GMT"
+        )
+        self.assertEqual(self.get(url, If_Modified_Since=since).status_code, 200)
+
+    def test_detail_conditional_get(self):
+        employee = Employee.objects.order_by("id")[0]
+        Employee.objects.filter(id=employee.id).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        url = reverse("employee-detail", args=[employee.id])
+        response = self.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, 304)
+        self.assertEqual(
+            self.get(url, If_Modified_Since=last_modified).status_code, 304
+        )
+
+        EmployeeService.update_employee(employee.id, {"position": "Lead"})
+        self.assertEqual(self.get(url, If_None_Match=etag).status_code, 200)
+        response = self.get(url, If_Modified_Since=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["position"], "Lead")
+
+    def test_list_cache_misses_after_write(self):
+        def cache_header():
+            return self.get(url, {"page": 1})["X-Cache"]
+
+        url = reverse("get-all-employees")
+        list_cache.clear()
+        generation = EmployeeService.get_generation()
+        self.assertEqual(cache_header(), "MISS")
+        self.assertEqual(cache_header(), "HIT")
+
+        EmployeeService.update_employee(
+            Employee.objects.order_by("id")[0].id, {"position": "Lead"}
+        )
+        self.assertGreater(EmployeeService.get_generation(), generation)
+        self.assertEqual(cache_header(), "MISS")
+        self.assertEqual(cache_header(), "HIT")
+
+        stats = list_cache.stats()
+        body = self.client.get(reverse("metrics")).content.decode()
+        for key, name in (
+            ("hits", "hits_total"),
+            ("misses", "misses_total"),
+            ("evictions", "evictions_total"),
+            ("entries", "entries"),
+            ("bytes", "bytes"),
+        ):
+            self.assertIn(f"\nemployees_list_cache_{name} {stats[key]}\n", body)
+
+    def test_ordering_is_limited_to_indexes_and_binds_cursors(self):
+        url = reverse("get-all-employees")
+        for ordering in ("email", "salary,firstName", "status"):
+            with self.subTest(ordering=ordering):
+                self.assertEqual(self.get(url, {"ordering": ordering}).status_code, 400)
+
+        # Missing salaries sort lowest: last when descending.
+        Employee.objects.filter(id__in=self.ids()[::7]).update(salary=None)
+        params = {"ordering": "-salary", "pagination": "cursor", "page_size": 4}
+        self.assertEqual(
+            self.walk(params), self.ids(*order_expressions(parse_ordering("-salary")))
+        )
+
+        cursor = self.get(url, params).json()["next"].rsplit("cursor=", 1)[1]
+        for ordering in (None, "salary", "hireDate"):
+            with self.subTest(cursor_ordering=ordering):
+                params = {"cursor": cursor, "pagination": "cursor"}
+                if ordering:
+                    params["ordering"] = ordering
+                self.assertEqual(self.get(url, params).status_code, 404)
+        params = {"cursor": cursor, "ordering": "-salary", "page_size": 4}
+        self.assertEqual(self.get(url, params).status_code, 200)
+
+        # A cursor must say which ordering it was issued for, even the default.
+        params = {"pagination": "cursor", "page_size": 4}
+        cursor = self.get(url, params).json()["next"].rsplit("cursor=", 1)[1]
+        self.assertEqual(self.get(url, {**params, "cursor": cursor}).status_code, 200)
+        data = json.loads(base64.urlsafe_b64decode(parse.unquote(cursor)))
+        del data["o"]
+        unbound = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        self.assertEqual(self.get(url, {**params, "cursor": unbound}).status_code, 404)
+
+    def test_cursor_pages_survive_inserts(self):
+        expected = self.ids("-created_at", "-id")
+        created = iter(range(100))
+
+        def insert():
+            EmployeeService.create_employee(
+                {
+                    "firstName": "New",
+                    "lastName": "Hire",
+                    "email": f"hire{next(created)}@example.com",
+                    "department": "Sales",
+                    "position": "Rep",
+                }
+            )
+
+        ids = self.walk({"pagination": "cursor", "page_size": 7}, insert)
+        self.assertEqual(ids, expected)
+
+        url = reverse("get-all-employees")
+        for cursor in ("garbage", "e30=", "eyJ2IjpbMV19"):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.get(url, {"cursor": cursor}).status_code, 404)
+
+    def test_row_serializer_matches_model_serializer(self):
+        for name, salary in (
+            ("Line\u2028Break\u2029", Decimal("1234.50")),
+            ("Zoë \"Quoted\" </script>", Decimal("0.10")),
+            ("No Salary", None),
+        ):
+            Employee.objects.create(
+                first_name=name,
+                last_name="Render",
+                department="Engineering",
+                position="Engineer",
+                salary=salary,
+            )
+        employees = Employee.objects.order_by("id")
+        for fields in (None, ("id", "firstName", "salary", "createdAt")):
+            with self.subTest(fields=fields):
+                serializer = EmployeeRowSerializer(fields)
+                rows = serializer.to_representation(serializer.values(employees))
+                expected = EmployeeSerializer(employees, many=True).data
+                if fields:
+                    expected = [{key: row[key] for key in fields} for row in expected]
+                self.assertEqual(render_json(rows), JSONRenderer().render(expected))
+
+    def test_sync_token_returns_changes_and_deletes(self):
+        def sync(since=None):
+            params = {"limit": 100}
+            if since:
+                params["since"] = since
+            return self.get(reverse("employee-changes"), params)
+
+        # An emptied log must not make the next tombstone look like a gap.
+        EmployeeService.delete_employee(self.ids()[0])
+        EmployeeTombstone.objects.all().delete()
+        ids = self.ids()
+        full = sync().json()
+        self.assertEqual(len(full["results"]), 29)
+        self.assertEqual((full["deleted"], full["hasMore"]), ([], False))
+
+        EmployeeService.update_employee(ids[5], {"position": "Lead"})
+        EmployeeService.delete_employee(ids[1])
+        EmployeeService.delete_employee(ids[2])
+        created = EmployeeService.create_employee(
+            {
+                "firstName": "New",
+                "lastName": "Hire",
+                "email": "hire@example.com",
+                "department": "Sales",
+                "position": "Rep",
+            }
+        ).id
+        delta = sync(full["token"]).json()
+        self.assertEqual([row["id"] for row in delta["results"]], [ids[5], created])
+        self.assertEqual(delta["results"][0]["position"], "Lead")
+        self.assertEqual(delta["deleted"], [ids[1], ids[2]])
+        caught_up = sync(delta["token"]).json()
+        self.assertEqual((caught_up["results"], caught_up["deleted"]), ([], []))
+
+        # Once tombstones after a token are pruned, it must start over.
+        EmployeeService.delete_employee(ids[3])
+        EmployeeService.delete_employee(ids[4])
+        EmployeeTombstone.objects.update(
+            deleted_at=timezone.now() - datetime.timedelta(days=365)
+        )
+        SyncService.prune_tombstones()
+        self.assertEqual(sync(delta["token"]).status_code, 410)
+        self.assertEqual(sync("not-a-token").status_code, 400)
+
+    def test_fields_narrows_results_and_rejects_unknown_names(self):
+        url = reverse("get-all-employees")
+        rows = self.get(url, {"fields": "salary, id,firstName"}).json()["results"]
+        self.assertEqual(list(rows[0]), ["id", "firstName", "salary"])
+        self.assertEqual(
+            list(self.get(url, {"fields": ""}).json()["results"][0]),
+            list(EmployeeSerializer.Meta.fields),
+        )
+        # Cursor pages read the ordering columns without returning them.
+        params = {"fields": "id,department", "pagination": "cursor", "page_size": 8}
+        ids = self.walk(params)
+        self.assertEqual(ids, self.ids("-created_at", "-id"))
+        first = self.get(url, params).json()["results"][0]
+        self.assertEqual(list(first), ["id", "department"])
+
+        response = self.get(url, {"fields": "id,bogus,passwordHash"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "Unknown field(s): bogus, passwordHash.", response.json()["error"]
+        )
+
+    def test_autocomplete_follows_writes(self):
+        def complete(q):
+            response = self.client.get(
+                reverse("employee-autocomplete", args=["departments"]), {"q": q}
+            )
+            return {row["value"]: row["count"] for row in response.json()["results"]}
+
+        def counts(prefix):
+            values = Employee.objects.filter(department__istartswith=prefix)
+            return Counter(values.values_list("department", flat=True))
+
+        # Two of them move away below.
+        Employee.objects.filter(id__in=self.ids()[:3]).update(department="Engineering")
+        SummaryService.rebuild()
+        # The index is process-wide: reload it from this test's rows.
+        autocomplete_index.stale = True
+        AutocompleteService.refresh()
+        self.assertEqual(complete("eng"), counts("eng"))
+
+        EmployeeService.create_employee(
+            {
+                "firstName": "New",
+                "lastName": "Hire",
+                "email": "hire@example.com",
+                "department": "Engine Room",
+                "position": "Stoker",
+            }
+        )
+        moved = Employee.objects.filter(department="Engineering").first().id
+        EmployeeService.update_employee(moved, {"department": "Sales"})
+        EmployeeService.delete_employee(
+            Employee.objects.filter(department="Engineering").first().id
+        )
+
+        self.assertFalse(autocomplete_index.stale)
+        self.assertEqual(complete("ENG"), counts("eng"))
+        self.assertEqual(complete("engine r"), {"Engine Room": 1})
+        self.assertEqual(complete("engz"), {})
+
+    def test_search_reads_from_the_replica(self):
+        Employee.objects.filter(id__in=self.ids()[:2]).update(first_name="Priya")
+        expected = set(
+            Employee.objects.filter(first_name="Priya").values_list("id", flat=True)
+        )
+        with CaptureQueriesContext(connections["default"]) as writes:
+            with CaptureQueriesContext(connections["replica"]) as reads:
+                response = self.get(
+                    reverse("get-all-employees"), {"search": "priya"}
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row["id"] for row in response.json()["results"]}, expected)
+        self.assertEqual(response.json()["count"], len(expected))
+        fts = [q["sql"] for q in reads.captured_queries if "_fts" in q["sql"]]
+        self.assertEqual(len(fts), 2)
+        self.assertFalse([q for q in writes.captured_queries if "_fts" in q["sql"]])
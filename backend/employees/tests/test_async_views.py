@@ -0,0 +1,133 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..cache import list_cache
+from ..models import Employee
+from ..ratelimit import bucket_store
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+from ..throttles import GetEmployeesThrottle
+from .fixtures import seed_employees
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class AsyncViewTests(TransactionTestCase):
+    """
+    The async read endpoints answer like the sync ones.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(12)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        list_cache.clear()
+        self.async_client = AsyncClient()
+
+    async def get(self, name, *args, data=None, **headers):
+        # Throttling is only under test where a test drains a bucket.
+        bucket_store.clear()
+        return await self.async_client.get(
+            reverse(name, args=args), data, headers=headers
+        )
+
+    async def test_list_matches_the_sync_view(self):
+        for params in (
+            {},
+            {"page": 2, "fields": "id,email"},
+            {"pagination": "cursor", "ordering": "-salary", "page_size": 5},
+            {"search": "employee3"},
+        ):
+            with self.subTest(params=params):
+                list_cache.clear()
+                response = await self.get("get-all-employees-async", data=params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["X-Cache"], "MISS")
+                self.assertTrue(json.loads(response.content)["results"])
+                expected = await self.get("get-all-employees", data=params)
+                # Page links point back at the endpoint that served them.
+                self.assertEqual(
+                    response.content.replace(b"/async/", b"/"), expected.content
+                )
+                self.assertEqual(response["ETag"], expected["ETag"])
+                cached = await self.get("get-all-employees-async", data=params)
+                self.assertEqual(cached["X-Cache"], "HIT")
+                self.assertEqual(cached.content, response.content)
+
+    async def test_list_conditional_get_and_errors(self):
+        response = await self.get("get-all-employees-async")
+        etag = response["ETag"]
+        not_modified = await self.get("get-all-employees-async", If_None_Match=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+        bad = await self.get(
+            "get-all-employees-async", data={"ordering": "bogus"}, If_None_Match=etag
+        )
+        self.assertEqual(bad.status_code, 400)
+        self.assertIn("Unknown ordering field: bogus", bad.json()["error"])
+        missing = await self.get(
+            "get-all-employees-async", data={"cursor": "garbage"}, If_None_Match=etag
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(missing.json(), {"detail": "Invalid cursor"})
+
+    async def test_detail(self):
+        employee = await Employee.objects.order_by("id").afirst()
+        response = await self.get("get-employee-async", employee.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["email"], employee.email)
+        not_modified = await self.get(
+            "get-employee-async", employee.id, If_None_Match=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+        missing = await self.get("get-employee-async", 10**9)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(missing.json(), {"error": "Employee not found"})
+
+    async def test_throttled_requests_get_429(self):
+        bucket_store.clear()
+        capacity, _ = GetEmployeesThrottle.parse_rate(GetEmployeesThrottle.rate)
+        url = reverse("get-all-employees-async")
+        for _ in range(capacity):
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        self.assertIn("Request was throttled.", response.json()["detail"])
+
+        post = await self.async_client.post(url)
+        self.assertEqual(post.status_code, 405)
+        self.assertEqual(post["Allow"], "GET, HEAD")
+
+    async def test_exports_match_the_sync_views(self):
+        for name in ("export-employees-csv", "export-employees-ndjson"):
+            with self.subTest(export=name):
+                response = await self.get(f"{name}-async")
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.is_async)
+                body = await content(response)
+                expected = await self.get(name)
+                self.assertEqual(body, await content(expected))
+                self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+        lines = body.decode("utf-8").splitlines()
+        self.assertEqual(
+            {json.loads(line)["email"] for line in lines},
+            {f"employee{i}@example.com" for i in range(12)},
+        )
+
+
+async def content(response) -> bytes:
+    if response.is_async:
+        return b"".join([chunk async for chunk in response.streaming_content])
+    return b"".join(await sync_to_async(list)(response.streaming_content))
@@ -0,0 +1,174 @@
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Employee
+from ..ratelimit import bucket_store
+from ..services.batch_service import MAX_BATCH_OPERATIONS
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+from .fixtures import seed_employees
+
+
+def create(email, **data):
+    return {
+        "op": "create",
+        "data": {
+            "firstName": "New",
+            "lastName": "Hire",
+            "email": email,
+            "department": "Sales",
+            "position": "Rep",
+            **data,
+        },
+    }
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class BatchApiTests(TransactionTestCase):
+    """
+    POST /api/employees/batch/: validation, email uniqueness and the
+    all-or-nothing contract.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(5)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        self.ids = list(Employee.objects.order_by("id").values_list("id", flat=True))
+
+    def batch(self, operations):
+        bucket_store.clear()
+        return self.client.post(
+            reverse("batch-employees"),
+            {"operations": operations},
+            content_type="application/json",
+        )
+
+    def rows(self):
+        return list(
+            Employee.objects.order_by("id").values_list("id", "email", "position")
+        )
+
+    def assertRejected(self, response, statuses):
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertEqual(body["error"], "Batch rejected; no changes were made.")
+        self.assertEqual([result["status"] for result in body["results"]], statuses)
+        return body["results"]
+
+    def test_applies_every_operation(self):
+        response = self.batch(
+            [
+                create("new@example.com"),
+                {"op": "update", "id": self.ids[0], "data": {"position": "Lead"}},
+                {"op": "delete", "id": self.ids[1]},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["status"] for result in results], ["created", "updated", "deleted"]
+        )
+        self.assertEqual(results[0]["data"]["email"], "new@example.com")
+        self.assertEqual(results[1]["data"]["position"], "Lead")
+        self.assertEqual(Employee.objects.get(id=self.ids[0]).position, "Lead")
+        self.assertFalse(Employee.objects.filter(id=self.ids[1]).exists())
+        self.assertTrue(Employee.objects.filter(email="new@example.com").exists())
+
+    def test_one_invalid_operation_rejects_the_batch(self):
+        before = self.rows()
+        results = self.assertRejected(
+            self.batch(
+                [
+                    create("new@example.com"),
+                    {"op": "update", "id": self.ids[0], "data": {"position": "Lead"}},
+                    {"op": "update", "id": self.ids[2], "data": {"email": "nope"}},
+                    {"op": "delete", "id": self.ids[1]},
+                    {"op": "delete", "id": 10**9},
+                    {"op": "rename", "id": self.ids[3]},
+                ]
+            ),
+            ["ok", "ok", "invalid", "ok", "invalid", "invalid"],
+        )
+        self.assertEqual(results[2]["error"], "email: Enter a valid email address.")
+        self.assertEqual(
+            results[4]["error"], f"Employee with id {10**9} does not exist."
+        )
+        self.assertEqual(
+            results[5]["error"], "op must be one of: create, update, delete."
+        )
+        self.assertEqual(self.rows(), before)
+
+    def test_rejects_duplicate_emails(self):
+        taken = Employee.objects.get(id=self.ids[0]).email
+        results = self.assertRejected(
+            self.batch(
+                [
+                    create("twice@example.com"),
+                    create("twice@example.com"),
+                    {"op": "update", "id": self.ids[1], "data": {"email": taken}},
+                ]
+            ),
+            ["ok", "invalid", "invalid"],
+        )
+        self.assertEqual(
+            results[1]["error"], "Email twice@example.com is used by operation 0."
+        )
+        self.assertEqual(
+            results[2]["error"], "Employee with this email already exists."
+        )
+        self.assertFalse(Employee.objects.filter(email="twice@example.com").exists())
+
+    def test_email_freed_by_a_delete_can_be_reused(self):
+        freed = Employee.objects.get(id=self.ids[0]).email
+        response = self.batch([create(freed), {"op": "delete", "id": self.ids[0]}])
+        self.assertEqual(response.status_code, 200)
+        created = response.json()["results"][0]["id"]
+        self.assertEqual(Employee.objects.get(email=freed).id, created)
+
+    def test_rejects_two_operations_on_one_employee(self):
+        before = self.rows()
+        results = self.assertRejected(
+            self.batch(
+                [
+                    {"op": "update", "id": self.ids[0], "data": {"position": "Lead"}},
+                    {"op": "delete", "id": self.ids[0]},
+                ]
+            ),
+            ["ok", "invalid"],
+        )
+        self.assertEqual(
+            results[1]["error"],
+            f"Employee {self.ids[0]} appears in more than one operation.",
+        )
+        self.assertEqual(self.rows(), before)
+
+    def test_operation_cap(self):
+        operations = [
+            create(f"bulk{i}@example.com") for i in range(MAX_BATCH_OPERATIONS)
+        ]
+        response = self.batch(operations + [create("over@example.com")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            f"A batch can contain at most {MAX_BATCH_OPERATIONS} operations.",
+        )
+        self.assertEqual(Employee.objects.count(), 5)
+
+        response = self.batch(operations)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Employee.objects.count(), 5 + MAX_BATCH_OPERATIONS)
+
+    def test_rejects_an_empty_or_missing_list(self):
+        for operations in ([], None):
+            response = self.batch(operations)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.json(), {"error": "operations must be a non-empty list."}
+            )
@@ -0,0 +1,291 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import openpyxl
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Employee
+from ..ratelimit import bucket_store
+from ..services.employee_service import EmployeeService
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.import_service import COLUMNS
+from ..services.summary_service import SummaryService
+from .fixtures import IMPORT_HEADER, seed_employees
+
+UNCHANGED = {"created": 0, "updated": 0, "unchanged": 12, "failed": 0, "errors": []}
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class ImportExportTests(TransactionTestCase):
+    """
+    Exports read back by the matching importer, and row error reporting.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(12)
+        first, second, third = Employee.objects.order_by("id")[:3]
+        Employee.objects.filter(pk__in=[second.pk, third.pk]).update(manager=first)
+        Employee.objects.filter(pk=third.pk).update(salary=None, phone=None)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+
+    def get(self, name):
+        bucket_store.clear()
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def employees(self):
+        return Employee.objects.select_related("manager").order_by("id")
+
+    def post(self, name, filename, content: bytes, status=200) -> dict:
+        bucket_store.clear()
+        response = self.client.post(
+            reverse(name), {"file": SimpleUploadedFile(filename, content)}
+        )
+        self.assertEqual(response.status_code, status)
+        return response.json()
+
+    def post_csv(self, *lines, status=200) -> dict:
+        content = "\n".join(lines).encode()
+        return self.post("import-employees-csv", "employees.csv", content, status)
+
+    def test_excel_export_round_trip(self):
+        body = self.get("export-employees")
+        workbook = openpyxl.load_workbook(io.BytesIO(body))
+        self.assertEqual(workbook.sheetnames, ["Employees"])
+        rows = list(workbook["Employees"].iter_rows(values_only=True))
+
+        self.assertEqual(list(rows[0]), COLUMNS)
+        self.assertEqual(
+            rows[1:],
+            [
+                (
+                    employee.first_name,
+                    employee.last_name,
+                    employee.email,
+                    employee.phone,
+                    employee.department,
+                    employee.position,
+                    datetime.datetime.combine(employee.hire_date, datetime.time()),
+                    None if employee.salary is None else float(employee.salary),
+                    employee.status,
+                    manager_email(employee),
+                )
+                for employee in self.employees()
+            ],
+        )
+        # Importing the export back changes nothing; an edited cell is an
+        # update.
+        self.assertEqual(EmployeeService.import_from_excel(io.BytesIO(body)), UNCHANGED)
+        sheet = workbook["Employees"]
+        sheet.cell(row=2, column=COLUMNS.index("department") + 1, value="Research")
+        edited = io.BytesIO()
+        workbook.save(edited)
+        edited.seek(0)
+        result = EmployeeService.import_from_excel(edited)
+        self.assertEqual((result["updated"], result["unchanged"]), (1, 11))
+        self.assertEqual(Employee.objects.get(email=rows[1][2]).department, "Research")
+
+    def test_ndjson_export_round_trip(self):
+        body = self.get("export-employees-ndjson")
+        self.assertTrue(body.endswith(b"\n"))
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            [
+                {
+                    "first_name": employee.first_name,
+                    "last_name": employee.last_name,
+                    "email": employee.email,
+                    "phone": employee.phone,
+                    "department": employee.department,
+                    "position": employee.position,
+                    "hire_date": employee.hire_date.isoformat(),
+                    "salary": None if employee.salary is None else str(employee.salary),
+                    "status": employee.status,
+                    "manager_email": manager_email(employee),
+                }
+                for employee in self.employees()
+            ],
+        )
+        self.assertEqual(
+            self.post("import-employees-ndjson", "employees.ndjson", body), UNCHANGED
+        )
+
+    def test_ndjson_import_reports_bad_lines_by_line_number(self):
+        manager = Employee.objects.order_by("id")[0]
+        lines = [
+            {
+                "firstName": "Nia",
+                "lastName": "Okoro",
+                "email": "nia@example.com",
+                "department": "Legal",
+                "position": "Counsel",
+                "hireDate": "2021-03-01",
+                "salary": 91000.5,
+                "managerEmail": manager.email,
+            },
+            "",
+            '{"firstName": "Broken",',
+            ["not", "an", "object"],
+            {"firstName": "No", "lastName": "Email", "email": "nope"},
+            {
+                "first_name": "Ola",
+                "last_name": "Berg",
+                "email": "ola@example.com",
+                "department": "Sales",
+                "position": "Rep",
+                "status": "retired",
+            },
+        ]
+        content = "\n".join(
+            line if isinstance(line, str) else json.dumps(line) for line in lines
+        )
+        result = self.post("import-employees-ndjson", "new.ndjson", content.encode())
+        self.assertEqual(
+            result,
+            {
+                "created": 1,
+                "updated": 0,
+                "unchanged": 0,
+                "failed": 4,
+                "errors": [
+                    {"row": 3, "error": "Invalid JSON."},
+                    {"row": 4, "error": "Expected a JSON object."},
+                    {"row": 5, "error": "department is required."},
+                    {
+                        "row": 6,
+                        "error": "Status must be one of: active, inactive, on_leave",
+                    },
+                ],
+            },
+        )
+        created = Employee.objects.get(email="nia@example.com")
+        self.assertEqual(
+            (created.hire_date, created.salary, created.manager_id),
+            (datetime.date(2021, 3, 1), Decimal("91000.50"), manager.id),
+        )
+        self.assertEqual(SummaryService.find_drift(), [])
+
+    def test_csv_header_names_must_all_be_known(self):
+        row = "Nia,Okoro,nia@example.com,,Legal,Counsel,2021-03-01,91000,active"
+        typo = IMPORT_HEADER.replace("department", "departmnet")
+        self.assertEqual(
+            self.post_csv(typo, row, status=400),
+            {
+                "error": "Unknown CSV column(s): departmnet. "
+                "Missing CSV column(s): department."
+            },
+        )
+        self.assertEqual(
+            self.post_csv("firstName,lastName,email,notes", row, status=400),
+            {
+                "error": "Unknown CSV column(s): notes. Missing CSV column(s): "
+                "phone, department, position, hire_date, salary, status."
+            },
+        )
+        self.assertFalse(Employee.objects.filter(email="nia@example.com").exists())
+
+        # Known names in any order are reordered; a header naming no known
+        # column is read by position.
+        reordered = "email,department,position,status,salary,hireDate,phone,"
+        reordered += "lastName,firstName"
+        result = self.post_csv(
+            reordered, "ola@example.com,Sales,Rep,,50000,2020-01-01,,Berg,Ola"
+        )
+        self.assertEqual(result["created"], 1)
+        result = self.post_csv("Vorname,Nachname,E-Mail", row)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(
+            Employee.objects.get(email="nia@example.com").department, "Legal"
+        )
+
+    def test_csv_row_errors_are_reported_by_row(self):
+        existing = Employee.objects.order_by("id")[0]
+        result = self.post_csv(
+            IMPORT_HEADER + ",manager_email",
+            "Nia,,nia@example.com,,Legal,Counsel,,,,",
+            "Nia,Okoro,nia@,,Legal,Counsel,,,,",
+            "",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,2021-02-30,,,",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,-1,,",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,fired,",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,,boss@example.com",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,,nia@example.com",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,abc,,",
+        )
+        # Field errors are found before manager errors, so sort by row.
+        self.assertEqual(
+            sorted(result["errors"], key=lambda error: error["row"]),
+            [
+                {"row": 2, "error": "last_name is required."},
+                {"row": 3, "error": "Invalid email: nia@"},
+                {"row": 5, "error": "Invalid hire_date: 2021-02-30"},
+                {"row": 6, "error": "Salary cannot be negative."},
+                {
+                    "row": 7,
+                    "error": "Status must be one of: active, inactive, on_leave",
+                },
+                {"row": 8, "error": "Unknown manager_email: boss@example.com"},
+                {"row": 9, "error": "An employee cannot manage themselves."},
+                {"row": 10, "error": "Invalid salary: abc"},
+            ],
+        )
+        self.assertEqual(
+            (result["created"], result["updated"], result["failed"]), (0, 0, 8)
+        )
+
+        # Bad rows do not stop the good ones.
+        result = self.post_csv(
+            IMPORT_HEADER,
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,,",
+            f"{existing.first_name},,{existing.email},,,,,,",
+        )
+        self.assertEqual(
+            result,
+            {
+                "created": 1,
+                "updated": 0,
+                "unchanged": 0,
+                "failed": 1,
+                "errors": [{"row": 3, "error": "last_name is required."}],
+            },
+        )
+
+    def test_repeated_emails_in_a_chunk_count_once(self):
+        existing = Employee.objects.order_by("id")[0]
+        result = self.post_csv(
+            IMPORT_HEADER,
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,",
+            "Nia,Okoro,nia@example.com,,Legal,Counsel,,,on_leave",
+            "Nia,Okoro,nia@example.com,,Finance,Counsel,,,on_leave",
+            f"{existing.first_name},{existing.last_name},{existing.email},,"
+            f"{existing.department},{existing.position},,,{existing.status}",
+            f"{existing.first_name},{existing.last_name},{existing.email},,"
+            f"Research,{existing.position},,,{existing.status}",
+            f"{existing.first_name},{existing.last_name},{existing.email},,"
+            f"Research,Lead,,,{existing.status}",
+        )
+        self.assertEqual(
+            result,
+            {"created": 1, "updated": 1, "unchanged": 0, "failed": 0, "errors": []},
+        )
+        created = Employee.objects.get(email="nia@example.com")
+        self.assertEqual((created.department, created.status), ("Finance", "on_leave"))
+        existing.refresh_from_db()
+        self.assertEqual((existing.department, existing.position), ("Research", "Lead"))
+        self.assertEqual(SummaryService.find_drift(), [])
+
+
+def manager_email(employee):
+    return employee.manager.email if employee.manager else None
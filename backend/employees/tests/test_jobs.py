@@ -0,0 +1,159 @@
+import datetime
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Employee, ImportJob
+from ..ratelimit import bucket_store
+from ..services.history_service import history_buffer
+from ..services.import_service import IMPORT_CHUNK_SIZE
+from ..services.job_service import STALE_AFTER, STALE_MESSAGE, ImportJobService
+from .fixtures import IMPORT_HEADER
+
+
+def row(i):
+    return [
+        "Job",
+        f"Row{i}",
+        f"job{i}@example.com",
+        "",
+        "Sales",
+        "Rep",
+        "2020-01-01",
+        "50000",
+        "active",
+    ]
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class ImportJobTests(TransactionTestCase):
+    """
+    Background imports: status progression, per-chunk progress, failures
+    and the stale-job sweep.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        self.job = ImportJob.objects.create(filename="employees.csv")
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as spool:
+            self.path = spool.name
+        self.addCleanup(lambda: os.path.exists(self.path) and os.unlink(self.path))
+
+    def state(self):
+        job = ImportJob.objects.get(pk=self.job.pk)
+        return job.status, job.rows_processed
+
+    def rows(self, count, fail_at=None):
+        """
+        Stand-in reader: ``count`` rows (the sixth with a bad email),
+        noting the job's state at each chunk boundary, i.e. after the
+        previous chunk was committed.
+        """
+        self.seen = []
+
+        def reader(path):
+            for i in range(count):
+                if i and i % IMPORT_CHUNK_SIZE == 0:
+                    self.seen.append(self.state())
+                if i == fail_at:
+                    raise ValueError("Unreadable file.")
+                values = row(i)
+                if i == 5:
+                    values[2] = "bad"
+                yield i + 2, values
+
+        return reader
+
+    def test_progress_until_success(self):
+        self.assertEqual(self.state(), (ImportJob.Status.PENDING, 0))
+        ImportJobService.run_import(self.job.pk, self.path, self.rows(2500))
+
+        self.assertEqual(
+            self.seen,
+            [(ImportJob.Status.RUNNING, 1000), (ImportJob.Status.RUNNING, 2000)],
+        )
+        job = ImportJob.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, ImportJob.Status.SUCCEEDED)
+        self.assertEqual(
+            (job.rows_processed, job.rows_created, job.rows_failed), (2500, 2499, 1)
+        )
+        self.assertEqual(job.errors, [{"row": 7, "error": "Invalid email: bad"}])
+        self.assertLessEqual(job.started_at, job.finished_at)
+        self.assertEqual(job.message, "")
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_failure_keeps_committed_chunks_and_records_the_error(self):
+        with self.assertRaisesMessage(ValueError, "Unreadable file."):
+            ImportJobService.run_import(self.job.pk, self.path, self.rows(2500, 1500))
+
+        job = ImportJob.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertEqual(job.message, "Unreadable file.")
+        self.assertEqual(job.rows_processed, 1000)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Employee.objects.count(), 999)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_file_is_removed_if_the_job_cannot_start(self):
+        with mock.patch.object(
+            ImportJobService, "_mark_running", side_effect=OperationalError("locked")
+        ):
+            with self.assertRaises(OperationalError):
+                ImportJobService.run_import(self.job.pk, self.path, self.rows(10))
+        self.assertEqual(ImportJob.objects.get(pk=self.job.pk).message, "locked")
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_stale_running_jobs_are_failed(self):
+        long_ago = timezone.now() - STALE_AFTER - datetime.timedelta(minutes=1)
+        stale = ImportJob.objects.create(
+            status=ImportJob.Status.RUNNING, updated_at=long_ago
+        )
+        busy = ImportJob.objects.create(
+            status=ImportJob.Status.RUNNING, updated_at=timezone.now()
+        )
+        done = ImportJob.objects.create(
+            status=ImportJob.Status.SUCCEEDED, updated_at=long_ago
+        )
+
+        out = StringIO()
+        call_command("fail_stale_import_jobs", stdout=out)
+        self.assertIn("Failed 1 import jobs", out.getvalue())
+        statuses = dict(ImportJob.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[stale.pk], ImportJob.Status.FAILED)
+        self.assertEqual(statuses[busy.pk], ImportJob.Status.RUNNING)
+        self.assertEqual(statuses[done.pk], ImportJob.Status.SUCCEEDED)
+        self.assertEqual(ImportJob.objects.get(pk=stale.pk).message, STALE_MESSAGE)
+
+    def test_endpoint_runs_the_job_in_the_background(self):
+        body = "\n".join([IMPORT_HEADER] + [",".join(row(i)) for i in range(3)])
+        bucket_store.clear()
+        response = self.client.post(
+            reverse("start-import-job"),
+            {"file": SimpleUploadedFile("employees.csv", body.encode("utf-8"))},
+        )
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()["statusUrl"]
+
+        deadline = time.monotonic() + 10
+        while True:
+            bucket_store.clear()
+            job = self.client.get(status_url).json()
+            if job["status"] not in ("pending", "running"):
+                break
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.02)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual((job["rowsProcessed"], job["rowsCreated"]), (3, 3))
+        self.assertEqual(Employee.objects.count(), 3)
@@ -0,0 +1,108 @@
+import re
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..metrics import registry
+from ..models import Employee
+from ..ratelimit import bucket_store
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+from .fixtures import seed_employees
+
+SERVER_TIMING = re.compile(
+    r'^app;dur=\d+\.\d, db;dur=\d+\.\d;desc="(\d+) queries", serialize;dur=\d+\.\d$'
+)
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class MetricsMiddlewareTests(TransactionTestCase):
+    """
+    Server-Timing headers and the per-route histograms behind /metrics.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(10)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+    def get(self, url, data=None):
+        bucket_store.clear()
+        return self.client.get(url, data)
+
+    def series(self, name, route, status, method="GET"):
+        """The metric's ``{method, route, status}`` sample, or None."""
+        labels = f'method="{method}",route="{route}",status="{status}"'
+        match = re.search(
+            rf"^{name}{{{re.escape(labels)}}} (\S+)$", registry.render(), re.M
+        )
+        return None if match is None else float(match.group(1))
+
+    def test_server_timing_header(self):
+        response = self.get(reverse("get-all-employees"))
+        match = SERVER_TIMING.match(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertGreater(int(match.group(1)), 0)
+
+        # Errors are timed too.
+        response = self.get(reverse("employee-detail", args=[10**9]))
+        self.assertEqual(response.status_code, 404)
+        self.assertRegex(response["Server-Timing"], SERVER_TIMING)
+
+    def test_histograms_are_recorded_per_route_and_status(self):
+        employee = Employee.objects.order_by("id")[0]
+        for _ in range(2):
+            self.get(reverse("get-all-employees"))
+        self.get(reverse("employee-detail", args=[employee.id]))
+        self.get(reverse("employee-detail", args=[10**9]))
+        self.get("/no/such/page/")
+
+        detail = "/api/employees/<int:id>/"
+        for route, status, count in (
+            ("/api/employees/", 200, 2),
+            (detail, 200, 1),
+            (detail, 404, 1),
+            ("<unmatched>", 404, 1),
+        ):
+            with self.subTest(route=route, status=status):
+                for name in (
+                    "employees_http_request_duration_seconds",
+                    "employees_http_request_db_queries",
+                    "employees_http_response_size_bytes",
+                ):
+                    self.assertEqual(
+                        self.series(f"{name}_count", route, status), count
+                    )
+        self.assertIsNone(
+            self.series("employees_http_request_duration_seconds_count", detail, 500)
+        )
+
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn(
+            "employees_http_response_size_bytes_bucket"
+            '{method="GET",route="/api/employees/",status="200",le="+Inf"} 2\n',
+            body,
+        )
+
+    def test_streamed_size_is_recorded_after_the_last_chunk(self):
+        size = "employees_http_response_size_bytes_sum"
+        route = "/api/employees/export/csv/"
+        response = self.get(reverse("export-employees-csv"))
+        self.assertTrue(response.streaming)
+        self.assertRegex(response["Server-Timing"], SERVER_TIMING)
+        self.assertIsNone(self.series(size, route, 200))
+
+        chunks = iter(response.streaming_content)
+        body = next(chunks)
+        self.assertIsNone(self.series(size, route, 200))
+        body += b"".join(chunks)
+        self.assertEqual(self.series(size, route, 200), len(body))
+        self.assertEqual(len(body.splitlines()), 11)
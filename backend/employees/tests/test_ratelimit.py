@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from ..ratelimit import TokenBucketStore
+
+
+class TokenBucketStoreTests(SimpleTestCase):
+    """
+    Bucket arithmetic, on a private store file with an injected clock.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = TokenBucketStore(os.path.join(directory.name, "buckets.sqlite3"))
+        self.addCleanup(lambda: self.store._connection().close())
+
+    def keys(self):
+        rows = self.store._connection().execute("SELECT key FROM buckets")
+        return {key for key, in rows}
+
+    def test_bursts_up_to_capacity_then_denies(self):
+        taken = [self.store.take("a", 3, 1 / 60, now=100.0) for _ in range(5)]
+        self.assertEqual(taken, [True, True, True, False, False])
+        # Buckets are independent.
+        self.assertTrue(self.store.take("b", 3, 1 / 60, now=100.0))
+
+    def test_refills_over_time_up_to_capacity(self):
+        for _ in range(2):
+            self.store.take("a", 2, 0.1, now=0.0)
+        self.assertFalse(self.store.take("a", 2, 0.1, now=9.9))
+        self.assertTrue(self.store.take("a", 2, 0.1, now=10.0))
+        self.assertFalse(self.store.take("a", 2, 0.1, now=10.0))
+
+        # A long idle spell refills the bucket to capacity, no further.
+        taken = [self.store.take("a", 2, 0.1, now=1000.0) for _ in range(3)]
+        self.assertEqual(taken, [True, True, False])
+
+    def test_wait_is_the_time_to_the_next_token(self):
+        self.assertEqual(self.store.wait("a", 0.5, now=0.0), 0.0)
+        self.store.take("a", 1, 0.5, now=0.0)
+        self.assertEqual(self.store.wait("a", 0.5, now=0.0), 2.0)
+        self.assertEqual(self.store.wait("a", 0.5, now=1.5), 0.5)
+        # A denied request does not push the next token back.
+        self.assertFalse(self.store.take("a", 1, 0.5, now=1.5))
+        self.assertEqual(self.store.wait("a", 0.5, now=1.5), 0.5)
+        self.assertEqual(self.store.wait("a", 0.5, now=5.0), 0.0)
+
+    def test_prune_removes_only_full_buckets(self):
+        self.store.PRUNE_EVERY = 4
+        self.store.take("refilled", 2, 1.0, now=0.0)  # full again at 1.0
+        self.store.take("draining", 2, 1.0, now=5.0)
+        self.store.take("draining", 2, 1.0, now=5.0)  # full again at 7.0
+        self.assertEqual(self.keys(), {"refilled", "draining"})
+
+        self.store.take("new", 2, 1.0, now=6.0)  # fourth call prunes
+        self.assertEqual(self.keys(), {"draining", "new"})
+        # The kept bucket still remembers it was drained.
+        self.assertFalse(self.store.take("draining", 2, 1.0, now=5.5))
+
+    def test_clear(self):
+        self.store.take("a", 1, 1.0, now=0.0)
+        self.store.clear()
+        self.assertEqual(self.keys(), set())
+        self.assertTrue(self.store.take("a", 1, 1.0, now=0.0))
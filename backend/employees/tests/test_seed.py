@@ -0,0 +1,142 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase, override_settings
+
+from ..models import Employee, EmployeeHistory, EmployeeSummary
+from ..repositories.employee_repo import EmployeeRepository
+from ..repositories.search_repo import EmployeeSearchRepository
+from ..services.employee_service import EmployeeService
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class SeedEmployeesCommandTests(TransactionTestCase):
+    """
+    manage.py seed_employees: bulk loads with derived state rebuilt at the
+    end, smaller loads published chunk by chunk, and --repair.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+
+    def seed(self, *args, **options):
+        out = StringIO()
+        call_command("seed_employees", *args, stdout=out, **options)
+        return out.getvalue()
+
+    def assert_in_step(self, count):
+        HistoryService.flush()
+        self.assertEqual(Employee.objects.count(), count)
+        self.assertEqual(SummaryService.find_drift(), [])
+        self.assertEqual(HierarchyService.find_drift(), {"missing": 0, "extra": 0})
+        self.assertEqual(
+            EmployeeHistory.objects.filter(kind=EmployeeHistory.Kind.CREATED).count(),
+            count,
+        )
+
+    def test_bulk_load_then_published_chunks(self):
+        generation = EmployeeService.get_generation()
+        out = self.seed(50, chunk_size=20, seed=3)
+        self.assertIn("Rebuilding indexes and derived tables...", out)
+        self.assertIn("Seeded 50 employees", out)
+        self.assertEqual(
+            set(Employee.objects.values_list("email", flat=True)),
+            {f"seed{i}@example.com" for i in range(50)},
+        )
+        self.assertEqual(EmployeeRepository.create_missing_indexes(), [])
+        self.assertEqual(
+            EmployeeSearchRepository.search("seed7@example.com")[0].email,
+            "seed7@example.com",
+        )
+        self.assertGreater(EmployeeService.get_generation(), generation)
+        self.assert_in_step(50)
+
+        # Smaller than the table: indexes stay, every chunk is published.
+        out = self.seed(10, chunk_size=4, seed=3)
+        self.assertNotIn("Rebuilding", out)
+        self.assertEqual(
+            set(Employee.objects.values_list("email", flat=True)),
+            {f"seed{i}@example.com" for i in range(60)},
+        )
+        self.assert_in_step(60)
+
+    def test_options(self):
+        self.seed(
+            30,
+            departments="Legal",
+            positions="Engineer=3,Manager=1",
+            statuses="on_leave",
+            salary_median=50_000,
+            email_prefix="load",
+            email_domain="test.example",
+            start=100,
+            orm=True,
+        )
+        self.assertEqual(
+            set(Employee.objects.values_list("department", "status")),
+            {("Legal", "on_leave")},
+        )
+        self.assertEqual(
+            set(Employee.objects.values_list("position", flat=True)),
+            {"Engineer", "Manager"},
+        )
+        self.assertEqual(
+            min(Employee.objects.values_list("email", flat=True)),
+            "load100@test.example",
+        )
+        self.assert_in_step(30)
+
+    def test_same_seed_same_rows(self):
+        def rows():
+            return list(
+                Employee.objects.order_by("email").values_list(
+                    "first_name", "email", "department", "salary", "hire_date"
+                )
+            )
+
+        self.seed(25, chunk_size=10, seed=9)
+        first = rows()
+        Employee.objects.all().delete()
+        self.seed(25, chunk_size=10, seed=9, start=0)
+        self.assertEqual(rows(), first)
+
+    def test_repair_after_an_interrupted_load(self):
+        self.seed(20)
+        EmployeeRepository.drop_indexes()
+        EmployeeSearchRepository.uninstall()
+        EmployeeSummary.objects.all().delete()
+        EmployeeHistory.objects.all().delete()
+
+        out = self.seed(repair=True)
+        self.assertIn("full-text index, summary, hierarchy, history", out)
+        self.assertEqual(EmployeeRepository.create_missing_indexes(), [])
+        self.assertEqual(len(EmployeeSearchRepository.search("seed1")), 11)
+        self.assert_in_step(20)
+
+    def test_bad_arguments(self):
+        for args, options, message in (
+            ((), {}, "count is required unless --repair is given."),
+            ((0,), {}, "count, --chunk-size and --workers must be positive."),
+            ((5,), {"statuses": "retired"}, "Unknown status(es): retired"),
+            ((5,), {"departments": "Legal=-1"}, "negative weight for 'Legal'"),
+            (
+                (5,),
+                {
+                    "hired_from": datetime.date(2020, 1, 1),
+                    "hired_to": datetime.date(2019, 1, 1),
+                },
+                "--hired-to is before --hired-from.",
+            ),
+        ):
+            with self.subTest(options=options):
+                with self.assertRaisesMessage(CommandError, message):
+                    self.seed(*args, **options)
+        self.assertFalse(Employee.objects.exists())
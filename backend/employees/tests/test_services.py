@@ -0,0 +1,155 @@
+import io
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..ratelimit import bucket_store
+from ..services.employee_service import EmployeeService
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import HistoryService, history_buffer
+from ..services.summary_service import SummaryService
+from .fixtures import IMPORT_HEADER, OPERATIONS, Suite, count_queries, seed_employees
+
+
+# History is written when queried, never from a timer thread mid-test.
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class QueryCountTests(TransactionTestCase):
+    """
+    Exact SQL query counts for the service operations in ``fixtures``
+    (timed on large tables by benchmarks.bench_service). An N+1 fails here.
+
+    TransactionTestCase: reads go to the replica alias and writes to the
+    writer thread, and both need the fixtures committed.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        # Rows queued by an earlier test belong to its flushed tables.
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        seed_employees(300)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+        HistoryService.record_missing()
+        self.suite = Suite()
+        self.suite.prepare(deletes=5)
+
+    def test_query_counts(self):
+        for op in OPERATIONS.values():
+            with self.subTest(operation=op.name):
+                # The first run warms per-process caches (FTS support check).
+                count_queries(lambda: op.run(self.suite))
+                _, queries = count_queries(lambda: op.run(self.suite))
+                self.assertEqual(queries, op.queries)
+
+    def test_summary_matches_table_after_writes(self):
+        for name in (
+            "create",
+            "update",
+            "upsert_create",
+            "upsert_update",
+            "delete",
+            "import_csv",
+        ):
+            OPERATIONS[name].run(self.suite)
+        self.assertEqual(SummaryService.find_drift(), [])
+
+    def test_hierarchy_matches_managers_after_writes(self):
+        def create(name, manager=None):
+            return EmployeeService.create_employee(
+                {
+                    "firstName": name,
+                    "lastName": "Chart",
+                    "email": f"{name}@example.com",
+                    "department": "Engineering",
+                    "position": "Engineer",
+                    "managerId": manager,
+                }
+            ).id
+
+        top = create("top")
+        middle = create("middle", top)
+        lead = create("lead", middle)
+        report = create("report", lead)
+        with self.assertRaises(ValueError):
+            EmployeeService.update_employee(middle, {"managerId": report})
+        EmployeeService.update_employee(lead, {"managerId": top})
+        EmployeeService.update_employee(lead, {"managerId": middle})
+        EmployeeService.delete_employee(middle)
+        for name in ("update", "delete", "import_csv"):
+            OPERATIONS[name].run(self.suite)
+
+        self.assertEqual(HierarchyService.find_drift(), {"missing": 0, "extra": 0})
+        chain = HierarchyService.get_chain(report).values_list("id", flat=True)
+        self.assertEqual(list(chain), [report, lead, top])
+        self.assertEqual(
+            HierarchyService.get_report_counts(top), {"direct": 1, "total": 2}
+        )
+
+    def test_import_reports_manager_loops_per_row(self):
+        def upload(*lines):
+            header = IMPORT_HEADER + ",manager_email"
+            csv_file = io.BytesIO("\n".join([header, *lines]).encode("utf-8"))
+            csv_file.name = "chart.csv"
+            bucket_store.clear()
+            return self.client.post(reverse("import-employees-csv"), {"file": csv_file})
+
+        def line(name, manager=""):
+            return (
+                f"{name},Chart,{name}@example.com,,Engineering,Engineer,"
+                f"2020-01-01,50000,active,{manager}"
+            )
+
+        upload(line("top"), line("lead", "top@example.com"))
+        response = upload(
+            line("top", "lead@example.com"),
+            line("report", "lead@example.com"),
+            line("lead", "report@example.com"),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 4])
+        self.assertEqual(HierarchyService.find_drift(), {"missing": 0, "extra": 0})
+
+    def test_history_rebuilds_past_headcount_and_state(self):
+        def headcounts(summary):
+            return [
+                (row["department"], row["headcount"], row["statusCounts"])
+                for row in summary["departments"]
+            ]
+
+        before = timezone.now()
+        start = EmployeeService.get_summary()
+        employee = OPERATIONS["create"].run(self.suite)
+        created = timezone.now()
+        EmployeeService.update_employee(
+            employee.id, {"department": "Sales", "status": "on_leave"}
+        )
+        updated = timezone.now()
+        for name in ("update", "upsert_update", "delete", "import_csv"):
+            OPERATIONS[name].run(self.suite)
+        EmployeeService.delete_employee(employee.id)
+
+        self.assertEqual(
+            headcounts(HistoryService.get_headcount_at(before)), headcounts(start)
+        )
+        self.assertEqual(
+            headcounts(HistoryService.get_headcount_at(timezone.now())),
+            headcounts(EmployeeService.get_summary()),
+        )
+        self.assertIsNone(HistoryService.get_state_at(employee.id, before))
+        self.assertEqual(
+            HistoryService.get_state_at(employee.id, created)["department"],
+            "Engineering",
+        )
+        self.assertEqual(
+            HistoryService.get_state_at(employee.id, updated)["status"], "on_leave"
+        )
+        self.assertIsNone(HistoryService.get_state_at(employee.id, timezone.now()))
+        self.assertEqual(
+            [entry["change"] for entry in HistoryService.get_entries(employee.id)],
+            ["created", "updated", "deleted"],
+        )
@@ -0,0 +1,133 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..models import Employee
+from ..ratelimit import bucket_store
+from ..services import snapshot_service
+from ..services.employee_service import EmployeeService
+from ..services.hierarchy_service import HierarchyService
+from ..services.history_service import history_buffer
+from ..services.summary_service import SummaryService
+from ..snapshot import snapshot_store
+from .fixtures import seed_employees
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class SnapshotApiTests(TransactionTestCase):
+    """
+    GET /api/employees/snapshot/: lazy background builds, conditional GET,
+    staleness after writes and the gzip fallback.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        original = snapshot_store.path
+        snapshot_store.path = Path(directory.name)
+        self.addCleanup(setattr, snapshot_store, "path", original)
+        seed_employees(20)
+        SummaryService.rebuild()
+        HierarchyService.rebuild()
+
+    def get(self, **headers):
+        bucket_store.clear()
+        return self.client.get(reverse("employee-snapshot"), headers=headers)
+
+    def wait_for_build(self):
+        # The request that starts a build holds this until it finishes.
+        with snapshot_service._building:
+            pass
+
+    def first_snapshot(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 503)
+        self.wait_for_build()
+        return self.get(Accept_Encoding="gzip, deflate")
+
+    def test_first_request_starts_a_build(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(
+            response.json(), {"error": "Snapshot is being built; retry shortly."}
+        )
+        self.wait_for_build()
+
+        response = self.get(Accept_Encoding="gzip, deflate")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["X-Snapshot-Stale"], "false")
+        generation = int(response["X-Snapshot-Generation"])
+        self.assertEqual(response["ETag"], f'"snapshot-{generation:x}"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        document = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(document["generation"], generation)
+        self.assertEqual(document["count"], 20)
+        self.assertEqual(
+            [row["id"] for row in document["results"]],
+            sorted(Employee.objects.values_list("id", flat=True)),
+        )
+
+    def test_conditional_get(self):
+        etag = self.first_snapshot()["ETag"]
+        response = self.get(Accept_Encoding="gzip", If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_writes_mark_the_snapshot_stale_until_rebuilt(self):
+        response = self.first_snapshot()
+        etag = response["ETag"]
+        response.close()
+
+        EmployeeService.create_employee(
+            {
+                "firstName": "New",
+                "lastName": "Hire",
+                "email": "hire@example.com",
+                "department": "Sales",
+                "position": "Rep",
+            }
+        )
+        # The old file is served (and still matches) while a rebuild runs.
+        stale = self.get(Accept_Encoding="gzip", If_None_Match=etag)
+        self.assertEqual(stale.status_code, 304)
+        self.wait_for_build()
+
+        response = self.get(Accept_Encoding="gzip", If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Snapshot-Stale"], "false")
+        self.assertNotEqual(response["ETag"], etag)
+        document = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(document["count"], 21)
+
+    def test_stale_snapshot_is_flagged(self):
+        self.first_snapshot().close()
+        EmployeeService.delete_employee(Employee.objects.order_by("id")[0].id)
+
+        response = self.get(Accept_Encoding="gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Snapshot-Stale"], "true")
+        document = json.loads(gzip.decompress(b"".join(response.streaming_content)))
+        self.assertEqual(document["count"], 20)
+        self.wait_for_build()
+
+    def test_clients_without_gzip_get_plain_json(self):
+        compressed = self.first_snapshot()
+        expected = gzip.decompress(b"".join(compressed.streaming_content))
+
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(b"".join(response.streaming_content), expected)
@@ -0,0 +1,124 @@
+import datetime
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Employee, IdempotencyKey
+from ..ratelimit import bucket_store
+from ..services.history_service import history_buffer
+from ..services.idempotency_service import KEY_RETENTION
+
+PAYLOAD = {
+    "firstName": "Upsert",
+    "lastName": "Target",
+    "email": "upsert@example.com",
+    "department": "Sales",
+    "position": "Rep",
+}
+
+
+@override_settings(EMPLOYEE_HISTORY={"BATCH_SIZE": 10**6, "FLUSH_SECONDS": None})
+class UpsertApiTests(TransactionTestCase):
+    """
+    POST /api/employees/upsert/: outcomes and Idempotency-Key replays.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        history_buffer.take()
+        self.addCleanup(history_buffer.take)
+
+    def upsert(self, data, key=None):
+        bucket_store.clear()
+        headers = {"Idempotency-Key": key} if key is not None else {}
+        return self.client.post(
+            reverse("upsert-employee"),
+            data,
+            content_type="application/json",
+            headers=headers,
+        )
+
+    def employee(self):
+        return Employee.objects.get(email=PAYLOAD["email"])
+
+    def test_created_updated_and_unchanged(self):
+        response = self.upsert(PAYLOAD)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["result"], "created")
+        created = self.employee()
+
+        response = self.upsert({**PAYLOAD, "position": "Lead"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], "updated")
+        self.assertEqual(response.json()["data"]["position"], "Lead")
+        updated = self.employee()
+        self.assertEqual(updated.id, created.id)
+        self.assertGreater(updated.updated_at, created.updated_at)
+
+        response = self.upsert({**PAYLOAD, "position": "Lead"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], "unchanged")
+        self.assertEqual(self.employee().updated_at, updated.updated_at)
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_invalid_data(self):
+        response = self.upsert({**PAYLOAD, "email": ""})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "email is required."})
+        response = self.upsert({**PAYLOAD, "email": "nope"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"error": "email: Enter a valid email address."}
+        )
+        self.assertFalse(Employee.objects.exists())
+
+    def test_same_key_and_payload_replays_without_writing(self):
+        first = self.upsert(PAYLOAD, key="retry-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", first.headers)
+        written = self.employee().updated_at
+
+        # Even though the employee changed since, the retry gets the
+        # original response and does not write it back.
+        Employee.objects.filter(id=first.json()["data"]["id"]).update(position="Lead")
+        retry = self.upsert(PAYLOAD, key="retry-1")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(self.employee().position, "Lead")
+        self.assertEqual(self.employee().updated_at, written)
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_same_key_with_another_payload_is_rejected(self):
+        self.upsert(PAYLOAD, key="retry-2")
+        response = self.upsert({**PAYLOAD, "position": "Lead"}, key="retry-2")
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            response.json(),
+            {"error": "Idempotency-Key was already used with a different request."},
+        )
+        self.assertEqual(self.employee().position, "Rep")
+
+    def test_expired_key_writes_again(self):
+        self.upsert(PAYLOAD, key="retry-3")
+        Employee.objects.update(position="Lead")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - KEY_RETENTION - datetime.timedelta(minutes=1)
+        )
+        response = self.upsert(PAYLOAD, key="retry-3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], "updated")
+        self.assertNotIn("Idempotent-Replayed", response.headers)
+        self.assertEqual(self.employee().position, "Rep")
+
+        # The key now holds the new response.
+        replay = self.upsert(PAYLOAD, key="retry-3")
+        self.assertEqual(replay.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.json(), response.json())
+
+    def test_rejects_an_overlong_key(self):
+        response = self.upsert(PAYLOAD, key="k" * 256)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Employee.objects.exists())
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from django.db import connections, transaction
+from django.test import TransactionTestCase
+
+from ..models import Employee
+from ..services.employee_service import EmployeeService
+from ..services.history_service import history_buffer
+from ..services.write_queue import WriteQueue
+
+
+class WriteQueueTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.queue = WriteQueue()
+        self.addCleanup(history_buffer.take)
+
+    def test_concurrent_callers_run_one_at_a_time(self):
+        lock = threading.Lock()
+        running = []
+        seen = []
+
+        def write(n):
+            with lock:
+                running.append(n)
+                seen.append((len(running), threading.current_thread().name))
+            time.sleep(0.01)
+            with lock:
+                running.remove(n)
+            return n * 2
+
+        results = {}
+
+        def call(n):
+            results[n] = self.queue.run(write, n)
+
+        threads = [threading.Thread(target=call, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {n: n * 2 for n in range(8)})
+        self.assertEqual(seen, [(1, "employee-writer")] * 8)
+
+    def test_exceptions_reach_the_caller_and_roll_back(self):
+        def fail():
+            Employee.objects.create(first_name="Rolled", last_name="Back")
+            raise ValueError("nope")
+
+        with self.assertRaisesMessage(ValueError, "nope"):
+            self.queue.run(fail)
+        self.assertFalse(Employee.objects.filter(first_name="Rolled").exists())
+        self.assertEqual(self.queue.run(lambda: "still running"), "still running")
+
+    def test_nested_calls_run_inline(self):
+        def inner():
+            return (
+                threading.current_thread().name,
+                connections["default"].in_atomic_block,
+            )
+
+        def outer():
+            return threading.current_thread().name, self.queue.run(inner)
+
+        name, (inner_name, in_atomic) = self.queue.run(outer)
+        self.assertEqual((name, inner_name), ("employee-writer", "employee-writer"))
+        self.assertTrue(in_atomic)
+
+    def test_calls_inside_a_transaction_run_inline(self):
+        # The caller's connection holds the write lock, so the writer thread
+        # could only wait out the busy timeout for it.
+        started = time.monotonic()
+        with transaction.atomic():
+            name = self.queue.run(lambda: threading.current_thread().name)
+            employee = EmployeeService.create_employee(
+                {
+                    "firstName": "Inline",
+                    "lastName": "Write",
+                    "email": "inline@example.com",
+                    "department": "Sales",
+                    "position": "Rep",
+                }
+            )
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(name, threading.current_thread().name)
+        self.assertTrue(Employee.objects.filter(id=employee.id).exists())
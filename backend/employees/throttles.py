@@ -1,25 +1,98 @@
-from rest_framework.throttling import UserRateThrottle
+from rest_framework.throttling import BaseThrottle
 
+from .ratelimit import bucket_store
 
-class GetEmployeesThrottle(UserRateThrottle):
+_DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per-client token bucket: ``rate = "20/min"`` allows bursts of 20 and
+    refills 20 tokens per minute. Clients are identified by user id when
+    authenticated, else by IP address, separately for each ``scope``.
+
+    State lives in the shared ``bucket_store``, so limits hold across
+    every worker process, and each check costs one constant-size UPSERT.
+    """
+
+    rate = None
+    scope = None
+    store = bucket_store
+
+    def __init__(self):
+        self.capacity, period = self.parse_rate(self.rate)
+        self.refill_rate = self.capacity / period
+        self.key = None
+
+    @staticmethod
+    def parse_rate(rate: str) -> tuple[int, int]:
+        """
+        "<count>/<period>" -> (count, seconds); period is s, min, hour, day...
+        """
+        count, period = rate.split("/")
+        return int(count), _DURATIONS[period[0]]
+
+    def get_cache_key(self, request, view) -> str:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"{self.scope}:user:{user.pk}"
+        return self.get_ip_key(request)
+
+    def get_ip_key(self, request) -> str:
+        """
+        Bucket key from the client address alone. Async views use this:
+        resolving ``request.user`` would hit the session store synchronously.
+        """
+        return f"{self.scope}:ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view) -> bool:
+        self.key = self.get_cache_key(request, view)
+        return self.take()
+
+    def take(self) -> bool:
+        return self.store.take(self.key, self.capacity, self.refill_rate)
+
+    def wait(self):
+        if self.key is None:
+            return None
+        return self.store.wait(self.key, self.refill_rate)
+
+
+class GetEmployeesThrottle(TokenBucketThrottle):
+    scope = "employees.read"
     rate = "20/min"
 
 
-class CreateEmployeeThrottle(UserRateThrottle):
+class CreateEmployeeThrottle(TokenBucketThrottle):
+    scope = "employees.create"
     rate = "10/min"
 
 
-class UpdateEmployeeThrottle(UserRateThrottle):
+class UpdateEmployeeThrottle(TokenBucketThrottle):
+    scope = "employees.update"
     rate = "10/min"
 
 
-class DeleteEmployeeThrottle(UserRateThrottle):
+class DeleteEmployeeThrottle(TokenBucketThrottle):
+    scope = "employees.delete"
     rate = "10/min"
 
 
-class ImportEmployeesThrottle(UserRateThrottle):
+class BatchEmployeesThrottle(TokenBucketThrottle):
+    scope = "employees.batch"
+    rate = "10/min"
+
+
+class ImportEmployeesThrottle(TokenBucketThrottle):
+    scope = "employees.import"
     rate = "5/min"
 
 
-class ExportEmployeesThrottle(UserRateThrottle):
+class ExportEmployeesThrottle(TokenBucketThrottle):
+    scope = "employees.export"
     rate = "5/min"
+
+
+class ImportJobStatusThrottle(TokenBucketThrottle):
+    scope = "employees.import_status"
+    rate = "60/min"
@@ -8,27 +8,111 @@
 
 
 from django.urls import path
+from . import async_views
 from .views import (
     create_employee,
-    delete_employee,
+    upsert_employee,
+    employee_detail,
     get_all_employees,
     update_employee,
     import_employees,
     export_employees,
+    import_employees_csv,
+    import_employees_ndjson,
+    export_employees_csv,
+    export_employees_ndjson,
+    start_import_job,
+    get_import_job,
+    get_employee_summary,
+    get_employee_changes,
+    get_employee_snapshot,
+    get_employee_reports,
+    get_employee_report_counts,
+    get_employee_chain,
+    get_employee_headcount,
+    get_employee_history,
+    autocomplete,
+    batch_employees,
 )
 
 urlpatterns = [
     path("", get_all_employees, name="get-all-employees"),  # GET /api/employees/
+    path(
+        "summary/", get_employee_summary, name="employee-summary"
+    ),  # GET /api/employees/summary/
+    path(
+        "headcount/", get_employee_headcount, name="employee-headcount"
+    ),  # GET /api/employees/headcount/?asOf=2025-06-30
+    path(
+        "changes/", get_employee_changes, name="employee-changes"
+    ),  # GET /api/employees/changes/?since=<token>
+    path(
+        "snapshot/", get_employee_snapshot, name="employee-snapshot"
+    ),  # GET /api/employees/snapshot/
+    path(
+        "autocomplete/<str:field>/", autocomplete, name="employee-autocomplete"
+    ),  # GET /api/employees/autocomplete/departments/?q=eng
     path(
         "create/", create_employee, name="create-employee"
     ),  # POST /api/employees/create
     path(
-        "<int:id>/", delete_employee, name="delete-employee"
-    ),  # DELETE /api/employees/<id>/
+        "upsert/", upsert_employee, name="upsert-employee"
+    ),  # POST /api/employees/upsert/
+    path(
+        "<int:id>/", employee_detail, name="employee-detail"
+    ),  # GET or DELETE /api/employees/<id>/
+    path(
+        "<int:id>/reports/", get_employee_reports, name="employee-reports"
+    ),  # GET /api/employees/<id>/reports/?depth=1
+    path(
+        "<int:id>/reports/count/",
+        get_employee_report_counts,
+        name="employee-report-counts",
+    ),  # GET /api/employees/<id>/reports/count/
+    path(
+        "<int:id>/chain/", get_employee_chain, name="employee-chain"
+    ),  # GET /api/employees/<id>/chain/
+    path(
+        "<int:id>/history/", get_employee_history, name="employee-history"
+    ),  # GET /api/employees/<id>/history/?asOf=2025-06-30
+    path(
+        "batch/", batch_employees, name="batch-employees"
+    ),  # POST /api/employees/batch/
     # Update an employee
     path(
         "<int:id>/edit/", update_employee, name="update-employee"
     ),  # PUT /api/employees/<id>/edit/
     path("import/", import_employees, name="import-employees"),
+    path(
+        "import/jobs/", start_import_job, name="start-import-job"
+    ),  # POST /api/employees/import/jobs/
+    path(
+        "import/jobs/<uuid:job_id>/", get_import_job, name="import-job-status"
+    ),  # GET /api/employees/import/jobs/<job_id>/
     path("export/", export_employees, name="export-employees"),
+    path("import/csv/", import_employees_csv, name="import-employees-csv"),
+    path(
+        "import/ndjson/", import_employees_ndjson, name="import-employees-ndjson"
+    ),
+    path("export/csv/", export_employees_csv, name="export-employees-csv"),
+    path(
+        "export/ndjson/", export_employees_ndjson, name="export-employees-ndjson"
+    ),
+    # Async (ASGI) versions of the read endpoints
+    path(
+        "async/", async_views.get_all_employees, name="get-all-employees-async"
+    ),  # GET /api/employees/async/
+    path(
+        "async/<int:id>/", async_views.get_employee, name="get-employee-async"
+    ),  # GET /api/employees/async/<id>/
+    path(
+        "async/export/csv/",
+        async_views.export_employees_csv,
+        name="export-employees-csv-async",
+    ),  # GET /api/employees/async/export/csv/
+    path(
+        "async/export/ndjson/",
+        async_views.export_employees_ndjson,
+        name="export-employees-ndjson-async",
+    ),  # GET /api/employees/async/export/ndjson/
 ]
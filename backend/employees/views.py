@@ -1,21 +1,53 @@
+import gzip
+import re
+
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes, throttle_classes
 from rest_framework.parsers import MultiPartParser
 from .services.employee_service import EmployeeService
-from .serializers import EmployeeSerializer
-from django.http import HttpResponse
+from .services.autocomplete_service import AutocompleteService
+from .services.hierarchy_service import HierarchyService
+from .services.history_service import HistoryService, parse_as_of
+from .services.batch_service import BatchRejected
+from .services.job_service import ImportJobService
+from .services.idempotency_service import MAX_KEY_LENGTH, IdempotencyKeyReused
+from .services.snapshot_service import SnapshotService
+from .services.sync_service import (
+    MAX_PAGE_SIZE as SYNC_MAX_PAGE_SIZE,
+    PAGE_SIZE as SYNC_PAGE_SIZE,
+    SyncService,
+    SyncTokenExpired,
+)
+from .serializers import (
+    EmployeeRowSerializer,
+    EmployeeSerializer,
+    ImportJobSerializer,
+    parse_fields,
+)
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from .throttles import (
     GetEmployeesThrottle,
     CreateEmployeeThrottle,
     UpdateEmployeeThrottle,
     DeleteEmployeeThrottle,
+    BatchEmployeesThrottle,
     ImportEmployeesThrottle,
     ExportEmployeesThrottle,
+    ImportJobStatusThrottle,
 )
+from .cache import list_cache
+from .conditional import Validators
+from .renderers import render_json
+from .metrics import registry, render_cache, serialization
+from .listing import EmployeeListQuery
 from .pagination import EmployeePagination
-from .models import Employee
 
 
 @api_view(["GET"])
@@ -23,17 +55,114 @@ from .models import Employee
 def get_all_employees(request):
     # print("getting all employees----")
     try:
-        # employees = EmployeeService.get_employees()  # QuerySet
-        employees = Employee.objects.all()
-        paginator = EmployeePagination()
-        page = paginator.paginate_queryset(employees, request)
+        query = EmployeeListQuery(request)
+        # Polling clients send the last ETag back; answer 304 before any
+        # page query or serialization.
+        response = query.cached_response(EmployeeService.get_watermark())
+        if response is None:
+            page = query.paginator.paginate_queryset(query.rows(), request)
+            response = query.page_response(page)
+        return response
+
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def _gunzip(file, size: int = 64 * 1024):
+    with file, gzip.GzipFile(fileobj=file) as stream:
+        while chunk := stream.read(size):
+            yield chunk
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_snapshot(request):
+    """
+    Every employee in one pre-rendered, gzipped JSON document. Served from
+    disk with no rendering; a stale snapshot is served while a fresh one
+    builds in the background (X-Snapshot-Stale: true).
+    """
+    snapshot = SnapshotService.open_snapshot()
+    if snapshot is None:
+        return Response(
+            {"error": "Snapshot is being built; retry shortly."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+    generation, file, stale = snapshot
+    validators = Validators(f'"snapshot-{generation:x}"')
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        file.close()
+        return not_modified
+
+    if _ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        response = FileResponse(file, content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        # Rare: decompress on the fly for clients without gzip support.
+        response = StreamingHttpResponse(
+            _gunzip(file), content_type="application/json"
+        )
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response["X-Snapshot-Generation"] = str(generation)
+    response["X-Snapshot-Stale"] = "true" if stale else "false"
+    return validators.apply(response)
+
 
-        serializer = EmployeeSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee(request, id):
+    """
+    One employee, with ETag / Last-Modified from its updated_at.
+    """
+    employee = EmployeeService.get_employee(id)
+    if employee is None:
+        return Response({"error": "Employee not found"}, status=404)
+    validators = Validators.for_employee(employee.id, employee.updated_at)
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    return validators.apply(Response(EmployeeSerializer(employee).data))
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_changes(request):
+    """
+    Delta sync: employees changed and ids deleted since ?since=<token>.
+    Omit ``since`` for a full sync. Follow ``token`` while ``hasMore``.
+    """
+    try:
+        limit = int(request.query_params.get("limit", SYNC_PAGE_SIZE))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+    limit = min(max(limit, 1), SYNC_MAX_PAGE_SIZE)
 
+    serializer = EmployeeRowSerializer()
+    try:
+        changes = SyncService.get_changes(
+            request.query_params.get("since"), serializer.sources, limit
+        )
+    except SyncTokenExpired as e:
+        return Response({"error": str(e)}, status=status.HTTP_410_GONE)
     except ValueError as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    with serialization():
+        body = render_json(
+            {
+                "results": serializer.to_representation(changes["rows"]),
+                "deleted": changes["deleted"],
+                "token": changes["token"],
+                "hasMore": changes["has_more"],
+            }
+        )
+    return HttpResponse(body, content_type="application/json")
+
 
 @api_view(["POST"])
 @throttle_classes([CreateEmployeeThrottle, AnonRateThrottle])
@@ -47,6 +176,40 @@ def create_employee(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["POST"])
+@throttle_classes([CreateEmployeeThrottle, AnonRateThrottle])
+def upsert_employee(request):
+    """
+    Create or update the employee with the given email. A retry sent with
+    the same Idempotency-Key header replays the first response.
+    """
+    key = request.headers.get("Idempotency-Key")
+    if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+        return Response(
+            {"error": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        result, replayed = EmployeeService.upsert_employee(request.data, key)
+    except IdempotencyKeyReused as e:
+        return Response(
+            {"error": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    response = Response(
+        result,
+        status=(
+            status.HTTP_201_CREATED
+            if result["result"] == "created"
+            else status.HTTP_200_OK
+        ),
+    )
+    if replayed:
+        response["Idempotent-Replayed"] = "true"
+    return response
+
+
 @api_view(["PATCH"])
 @throttle_classes([UpdateEmployeeThrottle, AnonRateThrottle])
 def update_employee(request, id):
@@ -88,6 +251,44 @@ def delete_employee(request, id):
         return Response({"error": "Internal server error"}, status=500)
 
 
+@csrf_exempt
+def employee_detail(request, id):
+    """
+    GET or DELETE /api/employees/<id>/. Each method keeps its own throttles.
+    """
+    if request.method == "DELETE":
+        return delete_employee(request, id)
+    return get_employee(request, id)
+
+
+@api_view(["POST"])
+@throttle_classes([BatchEmployeesThrottle, AnonRateThrottle])
+def batch_employees(request):
+    """
+    Apply {"operations": [...]} of creates, updates and deletes in one
+    transaction. All or nothing: if any operation is invalid, returns 400
+    with per-operation results and writes nothing.
+    """
+    operations = (
+        request.data.get("operations") if isinstance(request.data, dict) else None
+    )
+    try:
+        results = EmployeeService.apply_batch(operations)
+    except BatchRejected as e:
+        return Response(
+            {"error": str(e), "results": e.results},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    for result in results:
+        employee = result.pop("employee", None)
+        if employee is not None:
+            result["data"] = EmployeeSerializer(employee).data
+    return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 @api_view(["POST"])
 @parser_classes([MultiPartParser])
 @throttle_classes([ImportEmployeesThrottle, AnonRateThrottle])
@@ -99,6 +300,69 @@ def import_employees(request):
         return Response(result, status=200)
     except KeyError:
         return Response({"error": "File not provided"}, status=400)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(["POST"])
+@parser_classes([MultiPartParser])
+@throttle_classes([ImportEmployeesThrottle, AnonRateThrottle])
+def import_employees_csv(request):
+    try:
+        csv_file = request.FILES["file"]
+    except KeyError:
+        return Response({"error": "File not provided"}, status=400)
+    try:
+        result = EmployeeService.import_from_csv(csv_file)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=200)
+
+
+@api_view(["POST"])
+@parser_classes([MultiPartParser])
+@throttle_classes([ImportEmployeesThrottle, AnonRateThrottle])
+def import_employees_ndjson(request):
+    try:
+        ndjson_file = request.FILES["file"]
+    except KeyError:
+        return Response({"error": "File not provided"}, status=400)
+    try:
+        result = EmployeeService.import_from_ndjson(ndjson_file)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=200)
+
+
+@api_view(["POST"])
+@parser_classes([MultiPartParser])
+@throttle_classes([ImportEmployeesThrottle, AnonRateThrottle])
+def start_import_job(request):
+    """
+    Queue an xlsx, csv or ndjson import (picked by file extension) and
+    return its job id right away (202).
+    Poll the job's status URL for progress.
+    """
+    try:
+        excel_file = request.FILES["file"]
+    except KeyError:
+        return Response({"error": "File not provided"}, status=400)
+
+    job = ImportJobService.start_import(excel_file)
+    data = ImportJobSerializer(job).data
+    data["statusUrl"] = request.build_absolute_uri(
+        reverse("import-job-status", args=[job.pk])
+    )
+    return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@throttle_classes([ImportJobStatusThrottle, AnonRateThrottle])
+def get_import_job(request, job_id):
+    job = ImportJobService.get_job(job_id)
+    if job is None:
+        return Response({"error": "Import job not found"}, status=404)
+    return Response(ImportJobSerializer(job).data)
 
 
 @api_view(["GET"])
@@ -106,3 +370,191 @@ def import_employees(request):
 def export_employees(request):
     response: HttpResponse = EmployeeService.export_to_excel()
     return response
+
+
+@api_view(["GET"])
+@throttle_classes([ExportEmployeesThrottle, AnonRateThrottle])
+def export_employees_csv(request):
+    return EmployeeService.export_to_csv()
+
+
+@api_view(["GET"])
+@throttle_classes([ExportEmployeesThrottle, AnonRateThrottle])
+def export_employees_ndjson(request):
+    return EmployeeService.export_to_ndjson()
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_summary(request):
+    return Response(EmployeeService.get_summary())
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_reports(request, id):
+    """
+    Everyone below an employee in the reporting hierarchy, level by level,
+    page-number paginated. ?depth=1 lists direct reports only.
+    """
+    try:
+        fields = parse_fields(request.query_params.get("fields"))
+        depth = request.query_params.get("depth")
+        if depth is not None:
+            if not depth.isdigit() or int(depth) < 1:
+                raise ValueError("depth must be a positive integer.")
+            depth = int(depth)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    counts = HierarchyService.get_report_counts(id)
+    if counts is None:
+        return Response({"error": "Employee not found"}, status=404)
+    # The whole subtree and the direct reports are already counted, so
+    # those pages skip the COUNT(*) over the join.
+    count = {None: counts["total"], 1: counts["direct"]}.get(depth)
+
+    serializer = EmployeeRowSerializer(fields)
+    paginator = EmployeePagination()
+    reports = serializer.values(HierarchyService.get_reports(id, depth))
+    if count is None:
+        page = paginator.paginate_queryset(reports, request)
+    else:
+        page = paginator.paginate_counted(reports, count, request)
+    with serialization():
+        data = paginator.get_paginated_response(
+            serializer.to_representation(page)
+        ).data
+        body = render_json(data)
+    return HttpResponse(body, content_type="application/json")
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_report_counts(request, id):
+    """
+    Direct and total report counts for an employee, from one aggregate over
+    its closure rows.
+    """
+    counts = HierarchyService.get_report_counts(id)
+    if counts is None:
+        return Response({"error": "Employee not found"}, status=404)
+    return Response(
+        {
+            "id": id,
+            "directReports": counts["direct"],
+            "totalReports": counts["total"],
+        }
+    )
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_chain(request, id):
+    """
+    An employee's management chain, nearest manager first.
+    """
+    try:
+        fields = parse_fields(request.query_params.get("fields"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = EmployeeRowSerializer(fields)
+    rows = list(serializer.values(HierarchyService.get_chain(id)))
+    if not rows:
+        return Response({"error": "Employee not found"}, status=404)
+    # The first row is the employee itself.
+    with serialization():
+        body = render_json({"results": serializer.to_representation(rows[1:])})
+    return HttpResponse(body, content_type="application/json")
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_headcount(request):
+    """
+    Headcount by department and status as of ?asOf= (a date or datetime;
+    now if omitted), rebuilt from the employee history.
+    """
+    as_of = request.query_params.get("asOf")
+    try:
+        at = timezone.now() if as_of is None else parse_as_of(as_of)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(HistoryService.get_headcount_at(at))
+
+
+@api_view(["GET"])
+@throttle_classes([GetEmployeesThrottle, AnonRateThrottle])
+def get_employee_history(request, id):
+    """
+    An employee's recorded states, oldest first, or with ?asOf= only the
+    state it was in at that time.
+    """
+    as_of = request.query_params.get("asOf")
+    if as_of is None:
+        entries = HistoryService.get_entries(id)
+        if not entries:
+            return Response({"error": "Employee not found"}, status=404)
+        return Response({"results": entries})
+    try:
+        at = parse_as_of(as_of)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    state = HistoryService.get_state_at(id, at)
+    if state is None:
+        return Response(
+            {"error": f"Employee {id} did not exist at {at.isoformat()}"},
+            status=404,
+        )
+    return Response({"asOf": at, **state})
+
+
+AUTOCOMPLETE_FIELDS = {"departments": "department", "positions": "position"}
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+@require_GET
+def autocomplete(request, field):
+    """
+    Department or position names starting with ?q=, with employee counts,
+    from the in-memory index. A plain Django view without throttling: it is
+    called on every keystroke and never touches the database.
+    """
+    if field not in AUTOCOMPLETE_FIELDS:
+        return _json({"error": "Unknown field"}, status_code=404)
+    try:
+        limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        return _json({"error": "limit must be an integer"}, status_code=400)
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    results = AutocompleteService.complete(
+        AUTOCOMPLETE_FIELDS[field], request.GET.get("q", "").strip(), limit
+    )
+    if results is None:
+        response = _json(
+            {"error": "Autocomplete index is loading; retry shortly."},
+            status_code=503,
+        )
+        response["Retry-After"] = "1"
+        return response
+    return _json(
+        {"results": [{"value": value, "count": count} for value, count in results]}
+    )
+
+
+def _json(data, status_code=200):
+    return HttpResponse(
+        render_json(data), status=status_code, content_type="application/json"
+    )
+
+
+@require_GET
+def metrics(request):
+    """
+    Per-route request metrics and list cache counters for this process, in
+    the Prometheus text format. Not throttled, so scrapes are never refused.
+    """
+    body = registry.render() + render_cache("employees_list_cache", list_cache.stats())
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")